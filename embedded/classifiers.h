@@ -2,6 +2,7 @@
 #define CLASSIFIERS_H
 
 #include "feature_extraction.h"
+#include "fixed_point.h"
 
 namespace NeuroGait {
 
@@ -9,12 +10,16 @@ namespace NeuroGait {
     namespace WalkingModel {
         // Returns: 0=Sitting, 1=Walking, 2=Ascent, 3=Descent
         int predict_walking_mode(float* input_data);
+        // Fixed-point build: Q15 context features (NeuroFeaturesQ15)
+        int predict_walking_mode_q15(const int32_t* input_data);
     }
 
     // --- Gait Phase Model (Action Layer) ---
     namespace GaitPhaseModel {
         // Returns: 0=Stance, 1=Swing, 2=None
         int predict_gait_phase(float* input_data);
+        // Fixed-point build: Q15 phase features (NeuroFeaturesQ15)
+        int predict_gait_phase_q15(const int32_t* input_data);
     }
 }
 
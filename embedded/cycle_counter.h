@@ -0,0 +1,32 @@
+#ifndef CYCLE_COUNTER_H
+#define CYCLE_COUNTER_H
+
+#include <stdint.h>
+#include <time.h>
+
+#if defined(__x86_64__) || defined(__i386__)
+#include <x86intrin.h>
+#endif
+
+namespace NeuroGait {
+
+// Host-side cycle counter for profiling the firmware code paths.
+// x86: TSC (constant-rate reference cycles), AArch64: virtual counter,
+// otherwise falls back to CLOCK_MONOTONIC nanoseconds.
+inline uint64_t read_cycle_counter() {
+#if defined(__x86_64__) || defined(__i386__)
+    return __rdtsc();
+#elif defined(__aarch64__)
+    uint64_t value;
+    asm volatile("mrs %0, cntvct_el0" : "=r"(value));
+    return value;
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ull + (uint64_t)ts.tv_nsec;
+#endif
+}
+
+}
+
+#endif
@@ -1,4 +1,5 @@
 #include "feature_extraction.h"
+#include "fixed_point.h"
 
 namespace NeuroGait {
 
@@ -49,4 +50,215 @@ namespace NeuroGait {
 
         return features;
     }
-}
\ No newline at end of file
+
+    // --- RunningFeatureExtractor Implementation ---
+
+    RunningFeatureExtractor::RunningFeatureExtractor() {
+        reset();
+    }
+
+    void RunningFeatureExtractor::resetWindow(WindowSums& w, int len) {
+        w.len = len;
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            w.sum_abs[ch] = 0.0f;
+            w.sum_sq[ch] = 0.0f;
+            w.sum_wl[ch] = 0.0f;
+            w.last_left[ch] = 0.0f;
+            w.fresh_abs[ch] = 0.0f;
+            w.fresh_sq[ch] = 0.0f;
+            w.fresh_wl[ch] = 0.0f;
+        }
+        w.fresh_count = 0;
+    }
+
+    void RunningFeatureExtractor::reset() {
+        resetWindow(context, CONTEXT_WINDOW);
+        resetWindow(phase, PHASE_WINDOW);
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) prev_rect[ch] = 0.0f;
+        count = 0;
+    }
+
+    // Window = the `len` samples ending at (and including) the newest one.
+    // WL counts `len` differences: the first one is taken against the sample just
+    // before the window (last_left), as in FeatureExtractor::compute.
+    // Float drift of the add/subtract sums is bounded without a buffer rescan: the
+    // fresh_* sums only ever add, and after `len` pushes they hold exactly the current
+    // window, so they replace the running sums and start over (O(1) per sample).
+    void RunningFeatureExtractor::push(float buffers[NUM_CHANNELS][WINDOW_SIZE], int head, const float samples[NUM_CHANNELS]) {
+        WindowSums* windows[2] = { &context, &phase };
+
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            float rect = std::fabs(samples[ch]);
+            float diff = rect - prev_rect[ch];
+            float abs_diff = std::fabs(diff);
+            float sq = rect * rect;
+
+            for (int k = 0; k < 2; k++) {
+                WindowSums& w = *windows[k];
+                w.sum_abs[ch] += rect;
+                w.sum_sq[ch] += sq;
+                w.sum_wl[ch] += abs_diff;
+                w.fresh_abs[ch] += rect;
+                w.fresh_sq[ch] += sq;
+                w.fresh_wl[ch] += abs_diff;
+
+                if (count >= w.len) {
+                    // Oldest sample drops out (read before the write below overwrites it)
+                    int idx = head - w.len;
+                    if (idx < 0) idx += WINDOW_SIZE;
+                    float left = std::fabs(buffers[ch][idx]);
+
+                    w.sum_abs[ch] -= left;
+                    w.sum_sq[ch] -= left * left;
+                    w.sum_wl[ch] -= std::fabs(left - w.last_left[ch]);
+                    w.last_left[ch] = left;
+                }
+            }
+
+            buffers[ch][head] = samples[ch];
+            prev_rect[ch] = rect;
+        }
+
+        count++;
+
+        for (int k = 0; k < 2; k++) {
+            WindowSums& w = *windows[k];
+            if (++w.fresh_count == w.len) {
+                for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+                    w.sum_abs[ch] = w.fresh_abs[ch];
+                    w.sum_sq[ch] = w.fresh_sq[ch];
+                    w.sum_wl[ch] = w.fresh_wl[ch];
+                    w.fresh_abs[ch] = 0.0f;
+                    w.fresh_sq[ch] = 0.0f;
+                    w.fresh_wl[ch] = 0.0f;
+                }
+                w.fresh_count = 0;
+            }
+        }
+    }
+
+    NeuroFeatures RunningFeatureExtractor::features(const WindowSums& w) const {
+        NeuroFeatures features;
+        int n = (count < w.len) ? count : w.len;
+        float inv_n = (n > 0) ? 1.0f / n : 0.0f;
+        int f_idx = 0;
+
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            float mean_sq = w.sum_sq[ch] * inv_n;
+            float wl = w.sum_wl[ch];
+            features.values[f_idx++] = w.sum_abs[ch] * inv_n;                     // MAV
+            features.values[f_idx++] = std::sqrt((mean_sq > 0) ? mean_sq : 0.0f);  // RMS
+            features.values[f_idx++] = (wl > 0) ? wl : 0.0f;                       // WL
+        }
+
+        return features;
+    }
+
+    NeuroFeatures RunningFeatureExtractor::contextFeatures() const {
+        return features(context);
+    }
+
+    NeuroFeatures RunningFeatureExtractor::phaseFeatures() const {
+        return features(phase);
+    }
+
+    // --- RunningFeatureExtractorQ15 Implementation ---
+
+    // Branchless |x|: random-sign EMG defeats branch prediction
+    static inline uint32_t abs_i32(int32_t x) {
+        int32_t mask = x >> 31;
+        return (uint32_t)((x ^ mask) - mask);
+    }
+
+    static inline uint16_t rectify_q15(int16_t x) {
+        return (uint16_t)abs_i32(x);
+    }
+
+    static inline uint32_t abs_diff_u16(uint16_t a, uint16_t b) {
+        return abs_i32((int32_t)a - (int32_t)b);
+    }
+
+    RunningFeatureExtractorQ15::RunningFeatureExtractorQ15() {
+        reset();
+    }
+
+    void RunningFeatureExtractorQ15::resetWindow(WindowSums& w, int len) {
+        w.len = len;
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            w.sum_abs[ch] = 0;
+            w.sum_sq[ch] = 0;
+            w.sum_wl[ch] = 0;
+            w.last_left[ch] = 0;
+        }
+    }
+
+    void RunningFeatureExtractorQ15::reset() {
+        resetWindow(context, CONTEXT_WINDOW);
+        resetWindow(phase, PHASE_WINDOW);
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) prev_rect[ch] = 0;
+        count = 0;
+    }
+
+    // Same window and WL conventions as RunningFeatureExtractor::push
+    void RunningFeatureExtractorQ15::push(int16_t buffers[NUM_CHANNELS][WINDOW_SIZE], int head, const int16_t samples[NUM_CHANNELS]) {
+        WindowSums* windows[2] = { &context, &phase };
+
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            uint16_t rect = rectify_q15(samples[ch]);
+            uint32_t wl = abs_diff_u16(rect, prev_rect[ch]);
+            uint32_t sq = (uint32_t)rect * rect;
+
+            for (int k = 0; k < 2; k++) {
+                WindowSums& w = *windows[k];
+                w.sum_abs[ch] += rect;
+                w.sum_sq[ch] += sq;
+                w.sum_wl[ch] += wl;
+
+                if (count >= w.len) {
+                    int idx = head - w.len;
+                    if (idx < 0) idx += WINDOW_SIZE;
+                    uint16_t left = rectify_q15(buffers[ch][idx]);
+
+                    w.sum_abs[ch] -= left;
+                    w.sum_sq[ch] -= (uint32_t)left * left;
+                    w.sum_wl[ch] -= abs_diff_u16(left, w.last_left[ch]);
+                    w.last_left[ch] = left;
+                }
+            }
+
+            buffers[ch][head] = samples[ch];
+            prev_rect[ch] = rect;
+        }
+
+        count++;
+    }
+
+    // Divisions run once per inference tick, not per sample
+    NeuroFeaturesQ15 RunningFeatureExtractorQ15::features(const WindowSums& w) const {
+        NeuroFeaturesQ15 features;
+        uint32_t n = (count < w.len) ? count : w.len;
+        int f_idx = 0;
+
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            if (n == 0) {
+                features.values[f_idx++] = 0;
+                features.values[f_idx++] = 0;
+                features.values[f_idx++] = 0;
+                continue;
+            }
+            features.values[f_idx++] = (int32_t)(w.sum_abs[ch] / n);                     // MAV
+            features.values[f_idx++] = (int32_t)isqrt32((uint32_t)(w.sum_sq[ch] / n));   // RMS
+            features.values[f_idx++] = (int32_t)w.sum_wl[ch];                            // WL
+        }
+
+        return features;
+    }
+
+    NeuroFeaturesQ15 RunningFeatureExtractorQ15::contextFeatures() const {
+        return features(context);
+    }
+
+    NeuroFeaturesQ15 RunningFeatureExtractorQ15::phaseFeatures() const {
+        return features(phase);
+    }
+}
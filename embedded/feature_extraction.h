@@ -2,22 +2,101 @@
 #define FEATURE_EXTRACTION_H
 
 #include <cmath>
+#include <stdint.h>
 
 namespace NeuroGait {
-    
+
     const int WINDOW_SIZE = 500;
     const int NUM_CHANNELS = 2; // TA, MG
 
+    const int CONTEXT_WINDOW = 500; // Walking mode context (2000 ms @ 250 Hz)
+    const int PHASE_WINDOW = 50;    // Gait phase window (200 ms @ 250 Hz)
+
     struct NeuroFeatures {
         // 2 channels * 3 features (MAV, RMS, WL) = 6 values
-        float values[NUM_CHANNELS * 3]; 
+        float values[NUM_CHANNELS * 3];
     };
 
     class FeatureExtractor {
     public:
-        static NeuroFeatures compute(const float buffers[NUM_CHANNELS][WINDOW_SIZE], 
-                                     int head_index, 
+        static NeuroFeatures compute(const float buffers[NUM_CHANNELS][WINDOW_SIZE],
+                                     int head_index,
                                      int len);
     };
+
+    // Incremental MAV/RMS/WL for the context and phase windows.
+    // Owns the writes into the shared ring buffer so it can see the sample that
+    // each window drops: every push is O(NUM_CHANNELS) and feature reads are O(1),
+    // with no modulo and no rescan of the buffer at inference time.
+    class RunningFeatureExtractor {
+    public:
+        RunningFeatureExtractor();
+        void reset();
+
+        // Stores the new filtered samples at buffers[ch][head] and updates both windows
+        void push(float buffers[NUM_CHANNELS][WINDOW_SIZE], int head, const float samples[NUM_CHANNELS]);
+
+        NeuroFeatures contextFeatures() const; // Last CONTEXT_WINDOW samples
+        NeuroFeatures phaseFeatures() const;   // Last PHASE_WINDOW samples
+
+    private:
+        struct WindowSums {
+            int len;
+            float sum_abs[NUM_CHANNELS];
+            float sum_sq[NUM_CHANNELS];
+            float sum_wl[NUM_CHANNELS];
+            float last_left[NUM_CHANNELS];      // Rectified sample just before the window
+            // Add-only sums since the last refresh: equal to the window after `len` pushes
+            float fresh_abs[NUM_CHANNELS];
+            float fresh_sq[NUM_CHANNELS];
+            float fresh_wl[NUM_CHANNELS];
+            int fresh_count;
+        };
+
+        WindowSums context;
+        WindowSums phase;
+        float prev_rect[NUM_CHANNELS];          // Newest rectified sample
+        int count;
+
+        static void resetWindow(WindowSums& w, int len);
+        NeuroFeatures features(const WindowSums& w) const;
+    };
+
+    // Fixed-point features for the Q15 chain: MAV and RMS in Q15, WL as the sum of
+    // Q15 differences over the window (same units as NeuroFeatures, times 32768 / EMG_FULL_SCALE)
+    struct NeuroFeaturesQ15 {
+        int32_t values[NUM_CHANNELS * 3];
+    };
+
+    // Integer counterpart of RunningFeatureExtractor. Integer sums are exact, so
+    // unlike the float version it needs no fresh_* refresh sums.
+    class RunningFeatureExtractorQ15 {
+    public:
+        RunningFeatureExtractorQ15();
+        void reset();
+
+        // Stores the new filtered samples at buffers[ch][head] and updates both windows
+        void push(int16_t buffers[NUM_CHANNELS][WINDOW_SIZE], int head, const int16_t samples[NUM_CHANNELS]);
+
+        NeuroFeaturesQ15 contextFeatures() const; // Last CONTEXT_WINDOW samples
+        NeuroFeaturesQ15 phaseFeatures() const;   // Last PHASE_WINDOW samples
+
+    private:
+        struct WindowSums {
+            int len;
+            uint32_t sum_abs[NUM_CHANNELS];     // <= 500 * 2^15
+            uint64_t sum_sq[NUM_CHANNELS];      // <= 500 * 2^30
+            uint32_t sum_wl[NUM_CHANNELS];      // <= 500 * 2^15
+            uint16_t last_left[NUM_CHANNELS];   // Rectified sample just before the window
+        };
+
+        WindowSums context;
+        WindowSums phase;
+        uint16_t prev_rect[NUM_CHANNELS];       // Newest rectified sample
+        int count;
+
+        static void resetWindow(WindowSums& w, int len);
+        NeuroFeaturesQ15 features(const WindowSums& w) const;
+    };
 }
-#endif
\ No newline at end of file
+#endif
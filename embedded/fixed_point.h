@@ -0,0 +1,73 @@
+#ifndef FIXED_POINT_H
+#define FIXED_POINT_H
+
+#include <stdint.h>
+#include <cmath>
+
+// Fixed-point helpers for FPU-less targets (Cortex-M0+).
+// Bit-exact Python reference: src/lib/fixed_point.py
+
+// Input amplitude mapped to Q15 1.0. Must match the analog front-end gain
+// (and the value used when quantizing the LDA models).
+#ifndef NEUROGAIT_EMG_FULL_SCALE
+#define NEUROGAIT_EMG_FULL_SCALE 1.0f
+#endif
+
+namespace NeuroGait {
+
+    const int Q15_SHIFT = 15;   // Samples and MAV/RMS: 1.0 == EMG_FULL_SCALE
+    const int COEF_SHIFT = 14;  // Biquad coefficients: Q2.14 so |a1| up to 2 fits in int16
+    const float EMG_FULL_SCALE = (float)(NEUROGAIT_EMG_FULL_SCALE);
+
+    inline int16_t saturate_q15(int32_t x) {
+        if (x > 32767) return 32767;
+        if (x < -32768) return -32768;
+        return (int16_t)x;
+    }
+
+    // Host/ADC boundary only: float sample -> Q15 (round half to even, saturating)
+    inline int16_t float_to_q15(float x) {
+        float scaled = x * (32768.0f / EMG_FULL_SCALE);
+        if (scaled >= 32767.0f) return 32767;
+        if (scaled <= -32768.0f) return -32768;
+        return (int16_t)std::lrint(scaled);
+    }
+
+    inline float q15_to_float(int32_t x) {
+        return x * (EMG_FULL_SCALE / 32768.0f);
+    }
+
+    // floor(sqrt(x)), bit-by-bit: shifts, adds and compares only
+    inline uint32_t isqrt32(uint32_t x) {
+        uint32_t res = 0;
+        uint32_t bit = 1u << 30;
+        while (bit > x) bit >>= 2;
+        while (bit != 0) {
+            if (x >= res + bit) {
+                x -= res + bit;
+                res = (res >> 1) + bit;
+            } else {
+                res >>= 1;
+            }
+            bit >>= 2;
+        }
+        return res;
+    }
+
+    // One class score of a quantized LDA: intercept + sum(w_i * g_i), with
+    // g_i = min(features[i] >> shifts[i], 32767). Weights are int16 and the
+    // exporter bounds |intercept| + 32767 * sum|w_i| below 2^31, so the 32-bit
+    // accumulator cannot overflow.
+    inline int32_t lda_score_q15(const int16_t* weights, int32_t intercept,
+                                 const int32_t* features, const uint8_t* shifts, int n) {
+        int32_t score = intercept;
+        for (int i = 0; i < n; i++) {
+            int32_t g = features[i] >> shifts[i];
+            if (g > 32767) g = 32767;
+            score += (int32_t)weights[i] * g;
+        }
+        return score;
+    }
+}
+
+#endif
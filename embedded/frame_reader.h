@@ -0,0 +1,119 @@
+#ifndef FRAME_READER_H
+#define FRAME_READER_H
+
+// Host-only (simulator): zero-copy reader of packed float32 frame files (.ngf)
+// written by src/lib/frames.py. The file is mmap'ed once and frames are read in
+// place, so replay needs no parsing and no copies.
+
+#include <stdint.h>
+#include <cstdio>
+#include <cstring>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ != __ORDER_LITTLE_ENDIAN__
+#error "Frame files are little-endian; add byte swapping for this host"
+#endif
+
+class FrameFile {
+public:
+    static const uint16_t VERSION = 1;
+    static const int HEADER_BYTES = 32;
+    static const int NAME_BYTES = 16;
+
+    FrameFile() : base(NULL), size(0), n_frames(0), n_channels(0), fs(0.0f), data(NULL) {}
+    ~FrameFile() { close(); }
+
+    // True if the file starts with the frame magic
+    static bool isFrameFile(const char* path) {
+        char magic[4];
+        FILE* f = fopen(path, "rb");
+        if (!f) return false;
+        bool match = fread(magic, 1, 4, f) == 4 && memcmp(magic, "NGFR", 4) == 0;
+        fclose(f);
+        return match;
+    }
+
+    // Maps `path` read-only and validates the header. Prints the reason on failure.
+    bool open(const char* path) {
+        close();
+        int fd = ::open(path, O_RDONLY);
+        if (fd < 0) {
+            perror(path);
+            return false;
+        }
+        struct stat st;
+        if (fstat(fd, &st) != 0 || st.st_size < HEADER_BYTES) {
+            fprintf(stderr, "%s: not a frame file\n", path);
+            ::close(fd);
+            return false;
+        }
+        void* mapped = mmap(NULL, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+        ::close(fd);
+        if (mapped == MAP_FAILED) {
+            perror(path);
+            return false;
+        }
+        base = static_cast<const uint8_t*>(mapped);
+        size = st.st_size;
+        madvise(mapped, size, MADV_SEQUENTIAL);
+
+        uint16_t version, channels;
+        uint32_t data_offset;
+        memcpy(&version, base + 4, 2);
+        memcpy(&channels, base + 6, 2);
+        memcpy(&n_frames, base + 8, 8);
+        memcpy(&fs, base + 16, 4);
+        memcpy(&data_offset, base + 20, 4);
+        n_channels = channels;
+
+        if (memcmp(base, "NGFR", 4) != 0 || version != VERSION || n_channels == 0 ||
+            data_offset % sizeof(float) != 0 ||
+            data_offset < (uint64_t)HEADER_BYTES + n_channels * NAME_BYTES ||
+            data_offset + n_frames * n_channels * sizeof(float) > size) {
+            fprintf(stderr, "%s: invalid or truncated frame file\n", path);
+            close();
+            return false;
+        }
+        data = reinterpret_cast<const float*>(base + data_offset);
+        return true;
+    }
+
+    void close() {
+        if (base) munmap(const_cast<uint8_t*>(base), size);
+        base = NULL;
+        data = NULL;
+        size = 0;
+        n_frames = 0;
+        n_channels = 0;
+    }
+
+    // Column of channel `name`, or -1
+    int channelIndex(const char* name) const {
+        for (int i = 0; i < n_channels; i++) {
+            const char* entry = reinterpret_cast<const char*>(base + HEADER_BYTES + i * NAME_BYTES);
+            if (strncmp(entry, name, NAME_BYTES) == 0) return i;
+        }
+        return -1;
+    }
+
+    uint64_t frames() const { return n_frames; }
+    int channels() const { return n_channels; }
+    float sampleRate() const { return fs; }
+    const float* frame(uint64_t i) const { return data + i * n_channels; }
+
+private:
+    const uint8_t* base;
+    size_t size;
+    uint64_t n_frames;
+    int n_channels;
+    float fs;
+    const float* data;
+
+    FrameFile(const FrameFile&);
+    FrameFile& operator=(const FrameFile&);
+};
+
+#endif
@@ -14,5 +14,16 @@ namespace NeuroGait {
             }
             return (score > 0) ? 1.0 : 0.0;
         }
+
+        // Quantized LDA (src/lib/fixed_point.py, QuantizedLDA.from_float with full scale 1.0)
+        const int16_t LDA_WEIGHTS_Q15[6] = { -12092, 4781, 9557, 5488, -15310, 7495 };
+        const int32_t LDA_INTERCEPT_Q15 = 5057834;
+        const uint8_t LDA_FEATURE_SHIFTS[6] = { 0, 0, 6, 0, 0, 6 };
+
+        int predict_gait_phase_q15(const int32_t* input_data) {
+            int32_t score = lda_score_q15(LDA_WEIGHTS_Q15, LDA_INTERCEPT_Q15,
+                                          input_data, LDA_FEATURE_SHIFTS, LDA_N_FEATURES);
+            return (score > 0) ? 1 : 0;
+        }
     }
 }
\ No newline at end of file
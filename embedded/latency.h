@@ -0,0 +1,152 @@
+#ifndef LATENCY_H
+#define LATENCY_H
+
+// Host-only (simulator): latency histograms of the per-stage timings recorded by
+// Pipeline::step (see Pipeline::setTimings).
+
+#include <stdint.h>
+#include <time.h>
+#include <vector>
+
+#include "pipeline.h"
+#include "cycle_counter.h"
+
+namespace NeuroGait {
+
+    const char* const STAGE_NAMES[NUM_STAGES] = {
+        "filter", "features", "predict_walking_mode", "predict_gait_phase", "fsm_update"
+    };
+
+    // Log-linear histogram of nanosecond latencies: exact below 128 ns, then 64
+    // sub-buckets per power of two (<= 1.6 % relative error on percentiles).
+    class LatencyHistogram {
+    public:
+        LatencyHistogram() : n(0), total(0), max_ns(0) {}
+
+        void record(uint64_t ns) {
+            if (counts.empty()) counts.assign(NUM_BUCKETS, 0);
+            counts[bucket(ns)]++;
+            n++;
+            total += ns;
+            if (ns > max_ns) max_ns = ns;
+        }
+
+        void merge(const LatencyHistogram& other) {
+            if (other.n == 0) return;
+            if (counts.empty()) counts.assign(NUM_BUCKETS, 0);
+            for (int b = 0; b < NUM_BUCKETS; b++) counts[b] += other.counts[b];
+            n += other.n;
+            total += other.total;
+            if (other.max_ns > max_ns) max_ns = other.max_ns;
+        }
+
+        uint64_t count() const { return n; }
+        uint64_t max() const { return max_ns; }
+        double mean() const { return n ? (double)total / n : 0.0; }
+
+        // Upper bound of the bucket holding the p-th percentile (0 < p <= 100)
+        uint64_t percentile(double p) const {
+            if (n == 0) return 0;
+            uint64_t rank = (uint64_t)(p / 100.0 * n + 0.999999);
+            if (rank < 1) rank = 1;
+            uint64_t seen = 0;
+            for (int b = 0; b < NUM_BUCKETS; b++) {
+                seen += counts[b];
+                if (seen >= rank) {
+                    uint64_t upper = bucketUpper(b);
+                    return upper < max_ns ? upper : max_ns;
+                }
+            }
+            return max_ns;
+        }
+
+    private:
+        static const int SUB_BITS = 6;
+        static const int SUB_BUCKETS = 1 << SUB_BITS;
+        static const int NUM_BUCKETS = (64 - SUB_BITS + 1) * SUB_BUCKETS;
+
+        std::vector<uint64_t> counts;  // Allocated on the first record
+        uint64_t n;
+        uint64_t total;
+        uint64_t max_ns;
+
+        static int bucket(uint64_t v) {
+            if (v < 2 * SUB_BUCKETS) return (int)v;
+            int shift = 63 - __builtin_clzll(v) - SUB_BITS;
+            return shift * SUB_BUCKETS + (int)(v >> shift);
+        }
+
+        static uint64_t bucketUpper(int b) {
+            if (b < 2 * SUB_BUCKETS) return b;
+            int shift = b / SUB_BUCKETS - 1;
+            uint64_t mantissa = b % SUB_BUCKETS + SUB_BUCKETS;
+            return ((mantissa + 1) << shift) - 1;
+        }
+    };
+
+    // Per-stage and whole-tick latencies of one or more replays
+    struct LatencyProfile {
+        LatencyHistogram stages[NUM_STAGES];
+        LatencyHistogram ticks;     // All stages of an inference tick: the real-time deadline path
+        uint64_t worst_tick_ns;
+        long worst_tick_sample;     // Sample index of the slowest tick
+
+        LatencyProfile() : worst_tick_ns(0), worst_tick_sample(-1) {}
+
+        void record(const StageTimings& t, bool tick, long sample, double ns_per_cycle) {
+            uint64_t tick_ns = 0;
+            for (int s = 0; s < NUM_STAGES; s++) {
+                if (!(t.ran & (1u << s))) continue;
+                uint64_t ns = (uint64_t)(t.cycles[s] * ns_per_cycle + 0.5);
+                stages[s].record(ns);
+                tick_ns += ns;
+            }
+            if (!tick) return;
+            ticks.record(tick_ns);
+            if (worst_tick_sample < 0 || tick_ns > worst_tick_ns) {
+                worst_tick_ns = tick_ns;
+                worst_tick_sample = sample;
+            }
+        }
+
+        void merge(const LatencyProfile& other) {
+            for (int s = 0; s < NUM_STAGES; s++) stages[s].merge(other.stages[s]);
+            ticks.merge(other.ticks);
+        }
+    };
+
+    // Nanoseconds per read_cycle_counter() unit, measured against CLOCK_MONOTONIC
+    inline double calibrate_ns_per_cycle() {
+        struct timespec t0, t1, pause = { 0, 20000000 };
+        clock_gettime(CLOCK_MONOTONIC, &t0);
+        uint64_t c0 = read_cycle_counter();
+        nanosleep(&pause, NULL);
+        clock_gettime(CLOCK_MONOTONIC, &t1);
+        uint64_t c1 = read_cycle_counter();
+        double ns = (t1.tv_sec - t0.tv_sec) * 1e9 + (t1.tv_nsec - t0.tv_nsec);
+        return c1 > c0 ? ns / (double)(c1 - c0) : 1.0;
+    }
+
+    // Cost of one read_cycle_counter() pair, included in every recorded stage
+    inline uint64_t counter_overhead_cycles() {
+        uint64_t best = ~0ull;
+        for (int i = 0; i < 1000; i++) {
+            uint64_t a = read_cycle_counter();
+            uint64_t b = read_cycle_counter();
+            if (b - a < best) best = b - a;
+        }
+        return best;
+    }
+
+    inline const char* cycle_counter_source() {
+#if defined(__x86_64__) || defined(__i386__)
+        return "tsc";
+#elif defined(__aarch64__)
+        return "cntvct_el0";
+#else
+        return "clock_monotonic";
+#endif
+    }
+}
+
+#endif
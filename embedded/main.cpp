@@ -1,31 +1,46 @@
 #include <cstdio>  // printf, fopen
 #include <cstdlib> // strtof, atoi
-#include <cstring> // strtok
+#include <cstring> // strtok_r, strerror
+#include <cerrno>
 #include <vector>
 #include <cmath>
+#include <atomic>
+#include <thread>
+#include <getopt.h>
 #include <unistd.h>
 #include <time.h>
 #include <sys/resource.h>
 
-#include "signal_conditioner.h"
-#include "feature_extraction.h"
-#include "classifiers.h"
-#include "state_machine.h"
+#include "pipeline.h"
+#include "cycle_counter.h"
+#include "frame_reader.h"
+#include "latency.h"
 
 // --- CONFIGURATION ---
-const char* CSV_PATH = "../data/AB156/Raw/AB156_Circuit_001_raw.csv";
+const char* CSV_PATH = "../data/AB156/Raw/AB156_Circuit_001_raw.csv"; // Default input
 const int DECIMATION = 4;    // 1000Hz -> 250Hz
+const float TARGET_FS = 250.0f;
+const double LATENCY_BUDGET_US = 10000.0; // Real-time requirement: <10 ms per tick
+
+// --- NUMERIC BUILD (make FIXED_POINT=1 for FPU-less targets, see pipeline.h) ---
+#ifdef NEUROGAIT_FIXED_POINT
+const char* SAMPLE_TYPE = "Q15";
+#else
+const char* SAMPLE_TYPE = "float";
+#endif
 
 // --- MEMORY DIAGNOSTICS ---
 void print_memory_report(size_t buffer_size) {
     // 1. Calculate Theoretical Embedded Usage
-    size_t filter_size = sizeof(NeuroGait::SignalConditioner) * 2; // 2 Channels
+    size_t filter_size = sizeof(NeuroGait::Conditioner) * 2; // 2 Channels
     size_t fsm_size = sizeof(NeuroGait::StimulationController);
-    size_t total_static = buffer_size + filter_size + fsm_size;
+    size_t extractor_size = sizeof(NeuroGait::Extractor);
+    size_t total_static = buffer_size + filter_size + fsm_size + extractor_size;
 
     printf("\n=== MEMORY DIAGNOSTICS (Target: Cortex-M0+) ===\n");
-    printf("  [Data Buffers]   %zu bytes (2 channels x %d float samples)\n", buffer_size, NeuroGait::WINDOW_SIZE);
+    printf("  [Data Buffers]   %zu bytes (2 channels x %d %s samples)\n", buffer_size, NeuroGait::WINDOW_SIZE, SAMPLE_TYPE);
     printf("  [Filter States]  %zu bytes (Biquad coefficients)\n", filter_size);
+    printf("  [Feature Sums]   %zu bytes (running MAV/RMS/WL accumulators)\n", extractor_size);
     printf("  [State Machine]  %zu bytes\n", fsm_size);
     printf("  ------------------------------------------------\n");
     printf("  TOTAL SRAM USAGE: %zu bytes (%.2f KB)\n", total_static, total_static / 1024.0f);
@@ -43,7 +58,8 @@ void print_pc_process_usage() {
 int get_col_index(char* header_line, const char* target) {
     int index = 0;
     char* line_copy = strdup(header_line);
-    char* token = strtok(line_copy, ",");
+    char* save = NULL;
+    char* token = strtok_r(line_copy, ",", &save);
     int result = -1;
 
     while (token != NULL) {
@@ -52,137 +68,664 @@ int get_col_index(char* header_line, const char* target) {
             result = index;
             break;
         }
-        token = strtok(NULL, ",");
+        token = strtok_r(NULL, ",", &save);
         index++;
     }
     free(line_copy);
     return result;
 }
 
-int main() {
+// --- BENCHMARK: legacy window rescan vs running accumulators ---
+// Feeds a synthetic EMG-like signal and compares the feature work of an
+// inference tick (one context + one phase feature vector every 25 samples).
+int run_feature_benchmark() {
     using namespace NeuroGait;
 
-    // Open CSV
-    FILE* file = fopen(CSV_PATH, "r");
-    if (!file) {
-        perror("Error opening file");
-        return 1;
+    const int N_SAMPLES = 50000;
+    const int TICK = 25;
+    static float signal[N_SAMPLES][NUM_CHANNELS];
+    static float legacy_buffers[NUM_CHANNELS][WINDOW_SIZE] = {0};
+    static float running_buffers[NUM_CHANNELS][WINDOW_SIZE] = {0};
+    RunningFeatureExtractor extractor;
+
+    unsigned int seed = 12345;
+    for (int n = 0; n < N_SAMPLES; n++) {
+        float envelope = (std::sin(n / 60.0f) > 0.5f) ? 0.3f : 0.02f;
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            seed = seed * 1103515245u + 12345u;
+            signal[n][ch] = envelope * (((seed >> 8) & 0xFFFF) / 32768.0f - 1.0f);
+        }
     }
 
-    // Parse Header
-    char line[1024];
-    if (!fgets(line, sizeof(line), file)) return 1;
+    uint64_t legacy_cycles = 0, running_cycles = 0;
+    int ticks = 0;
+    float max_diff = 0.0f;
+    volatile float sink = 0.0f; // Keeps the feature computations alive under -O
+
+    int head = 0;
+    for (int n = 0; n < N_SAMPLES; n += TICK) {
+        // Stage the tick's samples so neither path pays the cold reads of `signal`
+        float block[TICK][NUM_CHANNELS];
+        for (int k = 0; k < TICK; k++) {
+            for (int ch = 0; ch < NUM_CHANNELS; ch++) block[k][ch] = signal[n + k][ch];
+        }
+
+        // Running: one push per sample, then O(1) reads at the tick
+        int h = head;
+        uint64_t t0 = read_cycle_counter();
+        for (int k = 0; k < TICK; k++) {
+            extractor.push(running_buffers, h, block[k]);
+            if (++h == WINDOW_SIZE) h = 0;
+        }
+        int newest = (h == 0) ? WINDOW_SIZE - 1 : h - 1;
+        NeuroFeatures ctx_new = extractor.contextFeatures();
+        NeuroFeatures phs_new = extractor.phaseFeatures();
+        uint64_t t1 = read_cycle_counter();
+
+        // Legacy: plain buffer writes, then a full rescan of both windows at the tick
+        h = head;
+        for (int k = 0; k < TICK; k++) {
+            for (int ch = 0; ch < NUM_CHANNELS; ch++) legacy_buffers[ch][h] = block[k][ch];
+            h = (h + 1) % WINDOW_SIZE;
+        }
+        NeuroFeatures ctx_old = FeatureExtractor::compute(legacy_buffers, newest, CONTEXT_WINDOW);
+        NeuroFeatures phs_old = FeatureExtractor::compute(legacy_buffers, newest, PHASE_WINDOW);
+        uint64_t t2 = read_cycle_counter();
+        head = h;
 
-    int idx_ta = get_col_index(line, "Right_TA");
-    int idx_mg = get_col_index(line, "Right_MG");
-    int idx_mode = get_col_index(line, "Mode");
+        sink = sink + ctx_old.values[0] + phs_old.values[0] + ctx_new.values[0] + phs_new.values[0];
+        if (n + TICK <= WINDOW_SIZE) continue; // Windows still filling
 
-    if (idx_ta == -1 || idx_mg == -1) {
-        fprintf(stderr, "Error: Missing TA or MG columns.\n");
-        return 1;
+        running_cycles += t1 - t0;
+        legacy_cycles += t2 - t1;
+        ticks++;
+
+        // Reference over the exact windows ending at the newest sample. The context
+        // WL is skipped: its pre-window sample has already been overwritten in the ring.
+        int ref_head = (newest + 1) % WINDOW_SIZE;
+        NeuroFeatures ctx_ref = FeatureExtractor::compute(legacy_buffers, ref_head, CONTEXT_WINDOW);
+        NeuroFeatures phs_ref = FeatureExtractor::compute(legacy_buffers, ref_head, PHASE_WINDOW);
+        for (int i = 0; i < NUM_CHANNELS * 3; i++) {
+            float d = std::fabs(phs_ref.values[i] - phs_new.values[i]);
+            if (d > max_diff) max_diff = d;
+            if (i % 3 == 2) continue;
+            d = std::fabs(ctx_ref.values[i] - ctx_new.values[i]);
+            if (d > max_diff) max_diff = d;
+        }
     }
 
-    // Initialize System (2 Channels)
-    SignalConditioner filters[2];
-    for(int i=0; i<2; i++) filters[i].init();
-    StimulationController fsm;
-    
-    // Static Buffers
-    static float buffers[2][WINDOW_SIZE] = {0}; 
-    int buffer_head = 0;
+    double legacy_per_tick = (double)legacy_cycles / ticks;
+    double running_per_tick = (double)running_cycles / ticks;
 
-    // --- PRINT MEMORY STATS STARTUP ---
-    print_memory_report(sizeof(buffers));
+    printf("=== FEATURE EXTRACTION BENCHMARK (%d samples, %d ticks) ===\n", N_SAMPLES, ticks);
+    printf("  Legacy rescan:        %10.0f cycles/tick\n", legacy_per_tick);
+    printf("  Running accumulators: %10.0f cycles/tick (%d pushes + reads)\n", running_per_tick, TICK);
+    printf("  Speedup:              %10.1fx\n", legacy_per_tick / running_per_tick);
+    printf("  Max |feature diff| vs exact windows: %.3e\n", max_diff);
+    return 0;
+}
+
+// --- BENCHMARK: float vs Q15 per-sample chain (filter + feature update) ---
+// On the host both paths run on hardware; on an FPU-less MCU every float op of
+// the float path is a soft-float library call.
+int run_chain_benchmark() {
+    using namespace NeuroGait;
+
+    const int N_SAMPLES = 50000;
+    const int TICK = 25;
+    static float signal[N_SAMPLES][NUM_CHANNELS];
+    static float float_buffers[NUM_CHANNELS][WINDOW_SIZE] = {0};
+    static int16_t q15_buffers[NUM_CHANNELS][WINDOW_SIZE] = {0};
 
-    printf("--- STARTING SIMULATION (250Hz) ---\n");
-    printf(" Time(s)  |  GT  |  Mode  |  Phase  |  Stim  \n");
+    unsigned int seed = 54321;
+    for (int n = 0; n < N_SAMPLES; n++) {
+        float envelope = (std::sin(n / 60.0f) > 0.5f) ? 0.3f : 0.02f;
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            seed = seed * 1103515245u + 12345u;
+            signal[n][ch] = envelope * (((seed >> 8) & 0xFFFF) / 32768.0f - 1.0f);
+        }
+    }
+
+    SignalConditioner float_filters[NUM_CHANNELS];
+    SignalConditionerQ15 q15_filters[NUM_CHANNELS];
+    RunningFeatureExtractor float_extractor;
+    RunningFeatureExtractorQ15 q15_extractor;
+
+    uint64_t float_cycles = 0, q15_cycles = 0;
+    int ticks = 0, mode_agree = 0, phase_agree = 0;
+    float max_rms_diff = 0.0f;
+
+    int head = 0;
+    for (int n = 0; n < N_SAMPLES; n += TICK) {
+        float block[TICK][NUM_CHANNELS];
+        int16_t block_q15[TICK][NUM_CHANNELS];
+        for (int k = 0; k < TICK; k++) {
+            for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+                block[k][ch] = signal[n + k][ch];
+                block_q15[k][ch] = float_to_q15(signal[n + k][ch]);
+            }
+        }
+
+        int h = head;
+        uint64_t t0 = read_cycle_counter();
+        for (int k = 0; k < TICK; k++) {
+            float filtered[NUM_CHANNELS];
+            for (int ch = 0; ch < NUM_CHANNELS; ch++) filtered[ch] = float_filters[ch].filter(block[k][ch]);
+            float_extractor.push(float_buffers, h, filtered);
+            if (++h == WINDOW_SIZE) h = 0;
+        }
+        uint64_t t1 = read_cycle_counter();
+
+        h = head;
+        for (int k = 0; k < TICK; k++) {
+            int16_t filtered[NUM_CHANNELS];
+            for (int ch = 0; ch < NUM_CHANNELS; ch++) filtered[ch] = q15_filters[ch].filter(block_q15[k][ch]);
+            q15_extractor.push(q15_buffers, h, filtered);
+            if (++h == WINDOW_SIZE) h = 0;
+        }
+        uint64_t t2 = read_cycle_counter();
+        head = h;
+
+        if (n + TICK <= WINDOW_SIZE) continue; // Windows still filling
+        float_cycles += t1 - t0;
+        q15_cycles += t2 - t1;
+        ticks++;
+
+        NeuroFeatures ctx = float_extractor.contextFeatures();
+        NeuroFeatures phs = float_extractor.phaseFeatures();
+        NeuroFeaturesQ15 ctx_q = q15_extractor.contextFeatures();
+        NeuroFeaturesQ15 phs_q = q15_extractor.phaseFeatures();
+
+        mode_agree += WalkingModel::predict_walking_mode(ctx.values) == WalkingModel::predict_walking_mode_q15(ctx_q.values);
+        phase_agree += GaitPhaseModel::predict_gait_phase(phs.values) == GaitPhaseModel::predict_gait_phase_q15(phs_q.values);
+        float d = std::fabs(q15_to_float(ctx_q.values[1]) - ctx.values[1]);
+        if (d > max_rms_diff) max_rms_diff = d;
+    }
+
+    int samples = ticks * TICK;
+    printf("=== SIGNAL CHAIN BENCHMARK: float vs Q15 (%d samples) ===\n", samples);
+    printf("  Float chain:          %10.1f cycles/sample\n", (double)float_cycles / samples);
+    printf("  Q15 chain:            %10.1f cycles/sample\n", (double)q15_cycles / samples);
+    printf("  Mode agreement:       %10.2f %%\n", 100.0 * mode_agree / ticks);
+    printf("  Phase agreement:      %10.2f %%\n", 100.0 * phase_agree / ticks);
+    printf("  Max |TA RMS diff|:    %10.3e\n", max_rms_diff);
+    return 0;
+}
+
+// --- COMMAND LINE ---
+struct SimOptions {
+    std::vector<const char*> files;
+    double speed;  // Replay speed factor: 1 = real time, 0 = unthrottled
+    int jobs;      // Worker threads for multi-file runs
+    bool quiet;    // No per-tick table, FSM log or memory checks
+    const char* latency_report; // JSON output of the per-stage timings, NULL = not timed
+    double ns_per_cycle;        // read_cycle_counter() calibration
+};
+
+// Totals of one replayed file
+struct ReplayStats {
+    const char* path;
+    bool ok;
+    long samples;
+    long ticks;
+    long labeled_ticks;  // Ticks with a ground-truth Mode column
+    long correct_ticks;  // ... where the predicted mode matches it
+    long stim_ticks;     // Ticks with stimulation on
+    double seconds;
+    NeuroGait::LatencyProfile latency; // Filled with --latency-report
+};
+
+void print_usage(const char* prog) {
+    printf("Usage: %s [options] [circuit_raw.csv | circuit.ngf ...]\n", prog);
+    printf("  Replays ENABL3S raw circuits (CSV, or frame files from src/tools/export_frames.py)\n");
+    printf("  through the firmware chain (default: %s)\n\n", CSV_PATH);
+    printf("  --speed X    Replay speed factor (1 = real time, default; 0 = unthrottled)\n");
+    printf("  -j, --jobs N Worker threads spreading multi-file runs (implies --quiet if N > 1)\n");
+    printf("  -q, --quiet  Summary only: no per-tick table, FSM log or memory checks\n");
+    printf("  --latency-report FILE\n");
+    printf("               Time every stage of every step and write p50/p99/max per stage and per\n");
+    printf("               inference tick as JSON to FILE (- for stdout). Use with -q: FSM logging\n");
+    printf("               would be timed as part of the FSM update.\n");
+    printf("  --bench      Run the feature and signal chain benchmarks\n");
+}
+
+double elapsed_seconds(const struct timespec& start) {
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (now.tv_sec - start.tv_sec) + (now.tv_nsec - start.tv_nsec) * 1e-9;
+}
+
+// --- INPUT SOURCES ---
+// Each source yields decimated 250 Hz samples: TA, MG and the ground-truth Mode
+// (has_mode is false when the input has no Mode column).
+
+// ENABL3S raw CSV: parses every kept row, skips DECIMATION - 1 of DECIMATION rows
+class CsvSource {
+public:
+    bool has_mode;
+
+    CsvSource() : has_mode(false), file(NULL), line(NULL), capacity(0), raw_line_count(0),
+                  idx_ta(-1), idx_mg(-1), idx_mode(-1) {}
+    ~CsvSource() {
+        free(line);
+        if (file) fclose(file);
+    }
+
+    bool open(const char* path) {
+        // Open CSV
+        file = fopen(path, "r");
+        if (!file) {
+            fprintf(stderr, "Error opening %s: %s\n", path, strerror(errno));
+            return false;
+        }
+
+        // Parse Header (getline grows the buffer for wide rows)
+        if (getline(&line, &capacity, file) < 0) return false;
+        idx_ta = get_col_index(line, "Right_TA");
+        idx_mg = get_col_index(line, "Right_MG");
+        idx_mode = get_col_index(line, "Mode");
+        has_mode = idx_mode != -1;
+
+        if (idx_ta == -1 || idx_mg == -1) {
+            fprintf(stderr, "Error: Missing TA or MG columns in %s.\n", path);
+            return false;
+        }
+        return true;
+    }
+
+    bool next(float input[2], int& gt_mode) {
+        while (getline(&line, &capacity, file) >= 0) {
+            if (raw_line_count++ % DECIMATION != 0) continue;
+
+            input[0] = input[1] = 0.0f;
+            int col_idx = 0;
+            char* save = NULL;
+            char* token = strtok_r(line, ",", &save);
+
+            while (token != NULL) {
+                if (col_idx == idx_ta) input[0] = strtof(token, NULL);
+                else if (col_idx == idx_mg) input[1] = strtof(token, NULL);
+                else if (col_idx == idx_mode) gt_mode = atoi(token);
+                token = strtok_r(NULL, ",", &save);
+                col_idx++;
+            }
+            return true;
+        }
+        return false;
+    }
+
+private:
+    FILE* file;
+    char* line;
+    size_t capacity;
+    long raw_line_count;
+    int idx_ta, idx_mg, idx_mode;
+};
+
+// Packed float32 frame file (src/tools/export_frames.py): mmap'ed, read in place
+class FrameSource {
+public:
+    bool has_mode;
+
+    FrameSource() : has_mode(false), pos(0), stride(1), idx_ta(-1), idx_mg(-1), idx_mode(-1) {}
+
+    bool open(const char* path) {
+        if (!frames.open(path)) return false;
+        idx_ta = frames.channelIndex("TA");
+        idx_mg = frames.channelIndex("MG");
+        idx_mode = frames.channelIndex("Mode");
+        has_mode = idx_mode != -1;
+
+        if (idx_ta == -1 || idx_mg == -1) {
+            fprintf(stderr, "Error: Missing TA or MG channels in %s.\n", path);
+            return false;
+        }
+        // Decimate on the fly if the frames were exported above the firmware rate
+        float ratio = frames.sampleRate() / TARGET_FS;
+        stride = (int)(ratio + 0.5f);
+        if (stride < 1 || std::fabs(ratio - stride) > 1e-3f) {
+            fprintf(stderr, "Error: %s is sampled at %.1f Hz, not a multiple of %.0f Hz.\n",
+                    path, frames.sampleRate(), TARGET_FS);
+            return false;
+        }
+        return true;
+    }
+
+    bool next(float input[2], int& gt_mode) {
+        if (pos >= frames.frames()) return false;
+        const float* frame = frames.frame(pos);
+        input[0] = frame[idx_ta];
+        input[1] = frame[idx_mg];
+        if (idx_mode != -1) gt_mode = (int)frame[idx_mode];
+        pos += stride;
+        return true;
+    }
+
+private:
+    FrameFile frames;
+    uint64_t pos;
+    int stride;
+    int idx_ta, idx_mg, idx_mode;
+};
+
+template <class Source>
+ReplayStats replay_source(Source& source, const char* path, const SimOptions& opts) {
+    using namespace NeuroGait;
+
+    ReplayStats stats = { path, false, 0, 0, 0, 0, 0, 0.0 };
+    bool verbose = !opts.quiet;
+
+    // Initialize System (2 Channels): filters, ring buffers, feature sums, FSM.
+    // One pipeline per file (and thread), on the heap rather than the thread stack.
+    Pipeline* pipeline = new Pipeline();
+    pipeline->fsm.setVerbose(verbose);
+    TickResult result;
+    StageTimings timings;
+    bool timed = opts.latency_report != NULL;
+    if (timed) pipeline->setTimings(&timings);
+
+    if (verbose) {
+        printf("--- STARTING SIMULATION (250Hz): %s ---\n", path);
+        printf(" Time(s)  |  GT  |  Mode  |  Phase  |  Stim  \n");
+    }
 
-    int sample_count = 0;
-    long t_ms = 0;
     int current_gt_mode = 0;
+    float input[2];
+    const long period_ns = opts.speed > 0 ? (long)(SAMPLE_PERIOD_MS * 1000000L / opts.speed) : 0;
 
-    struct timespec next_tick;
-    clock_gettime(CLOCK_MONOTONIC, &next_tick);
+    struct timespec start, next_tick;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    next_tick = start;
 
     // 4. Processing Loop
-    while (fgets(line, sizeof(line), file)) {
-        
-        static int raw_line_count = 0;
-        if (raw_line_count % DECIMATION != 0) {
-            raw_line_count++;
-            continue;
-        }
-        raw_line_count++;
-
-        float ta=0, mg=0;
-        int col_idx = 0;
-        char* token = strtok(line, ",");
-        
-        while (token != NULL) {
-            if (col_idx == idx_ta) ta = strtof(token, NULL);
-            else if (col_idx == idx_mg) mg = strtof(token, NULL);
-            else if (col_idx == idx_mode) current_gt_mode = atoi(token);
-            token = strtok(NULL, ",");
-            col_idx++;
-        }
-
-        // B. Add to Buffer (Circular Write)
-        buffers[0][buffer_head] = filters[0].filter(ta);
-        buffers[1][buffer_head] = filters[1].filter(mg);
-
-        // C. Inference (Every 100ms)
-        if (sample_count % 25 == 0 && sample_count >= WINDOW_SIZE) {
-    
-            // Extract FULL Context features (500 samples / 2000ms) for Walking Mode
-            NeuroFeatures context_feats = FeatureExtractor::compute(buffers, buffer_head, 500);
-            int pred_mode = WalkingModel::predict_walking_mode(context_feats.values);
-            
-            int pred_phase = 0;
-            if (pred_mode != 0 && pred_mode != 6) { // If Walking
-                // Extract SHORT Phase features (50 samples / 200ms) for Gait Phase
-                NeuroFeatures phase_feats = FeatureExtractor::compute(buffers, buffer_head, 50);
-                pred_phase = GaitPhaseModel::predict_gait_phase(phase_feats.values);
-            }
+    while (source.next(input, current_gt_mode)) {
+        long sample_count = pipeline->sampleCount();
+
+        // Filter, buffer, features and (every 100ms) inference + FSM update
+        bool tick = pipeline->step(input, result);
+        if (timed) stats.latency.record(timings, tick, sample_count, opts.ns_per_cycle);
 
-            fsm.update(pred_mode, pred_phase, context_feats.values[1], t_ms);
-            
-            const char* mode_str;
-            switch (pred_mode) {
-                case 0:  mode_str = "SIT"; break;
-                case 1:  mode_str = "LEVEL WALK"; break;
-                case 2:  mode_str = "Ramp ASCENT"; break;
-                case 3:  mode_str = "Ramp DESCENT"; break;
-                default: mode_str = "UNKNOWN"; break;
+        if (tick) {
+            stats.ticks++;
+            stats.stim_ticks += result.stimulating;
+            if (source.has_mode) {
+                stats.labeled_ticks++;
+                stats.correct_ticks += (result.mode == current_gt_mode);
             }
 
-            // Output with Buffer Monitor
-            printf(" %6.2fs  |  %d   |  %-4s  |  %-3s  |  %-3s  \n",
-                   sample_count * 0.004, 
-                   current_gt_mode,
-                   mode_str,
-                   (pred_phase == 1 ? "SWG " : "STC "),
-                   (fsm.getStimulationStatus() ? "ON " : "OFF")
-            );
+            if (verbose) {
+                const char* mode_str;
+                switch (result.mode) {
+                    case 0:  mode_str = "SIT"; break;
+                    case 1:  mode_str = "LEVEL WALK"; break;
+                    case 2:  mode_str = "Ramp ASCENT"; break;
+                    case 3:  mode_str = "Ramp DESCENT"; break;
+                    default: mode_str = "UNKNOWN"; break;
+                }
+
+                // Output with Buffer Monitor
+                printf(" %6.2fs  |  %d   |  %-4s  |  %-3s  |  %-3s  \n",
+                       sample_count * 0.004, 
+                       current_gt_mode,
+                       mode_str,
+                       (result.phase == 1 ? "SWG " : "STC "),
+                       (result.stimulating ? "ON " : "OFF")
+                );
+            }
         }
 
         // Periodic PC Memory Check (Every 5 seconds of sim time)
-        if (sample_count % 1250 == 0) {
+        if (verbose && sample_count % 1250 == 0) {
             print_pc_process_usage();
         }
 
-        buffer_head = (buffer_head + 1) % WINDOW_SIZE;
-        sample_count++;
-        t_ms += 4;
+        // Pace to the sample clock (scaled by --speed)
+        if (period_ns > 0) {
+            next_tick.tv_nsec += period_ns;
+            while (next_tick.tv_nsec >= 1000000000) {
+                next_tick.tv_nsec -= 1000000000;
+                next_tick.tv_sec += 1;
+            }
+            clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &next_tick, NULL);
+        }
+    }
+
+    stats.samples = pipeline->sampleCount();
+    stats.seconds = elapsed_seconds(start);
+    stats.ok = true;
+
+    if (verbose) printf("--- END ---\n");
+    delete pipeline;
+    return stats;
+}
+
+// Replays a raw CSV or a frame file (detected by its magic)
+ReplayStats replay_file(const char* path, const SimOptions& opts) {
+    ReplayStats failed = { path, false, 0, 0, 0, 0, 0, 0.0 };
+    if (FrameFile::isFrameFile(path)) {
+        FrameSource source;
+        return source.open(path) ? replay_source(source, path, opts) : failed;
+    }
+    CsvSource source;
+    return source.open(path) ? replay_source(source, path, opts) : failed;
+}
+
+void print_summary(const std::vector<ReplayStats>& all, double wall_seconds) {
+    long files_ok = 0, samples = 0, ticks = 0, labeled = 0, correct = 0, stim = 0;
+    for (size_t i = 0; i < all.size(); i++) {
+        const ReplayStats& s = all[i];
+        if (!s.ok) continue;
+        files_ok++;
+        samples += s.samples;
+        ticks += s.ticks;
+        labeled += s.labeled_ticks;
+        correct += s.correct_ticks;
+        stim += s.stim_ticks;
+    }
+
+    printf("\n=== REPLAY SUMMARY ===\n");
+    if (all.size() > 1) {
+        for (size_t i = 0; i < all.size(); i++) {
+            const ReplayStats& s = all[i];
+            if (!s.ok) {
+                printf("  %-40s FAILED\n", s.path);
+                continue;
+            }
+            printf("  %-40s %8ld samples  acc %6.2f %%  stim %5.1f %%\n", s.path, s.samples,
+                   s.labeled_ticks ? 100.0 * s.correct_ticks / s.labeled_ticks : 0.0,
+                   s.ticks ? 100.0 * s.stim_ticks / s.ticks : 0.0);
+        }
+        printf("  ------------------------------------------------\n");
+    }
+    double recorded = samples * 0.004;
+    printf("  Files:             %ld ok, %ld failed\n", files_ok, (long)all.size() - files_ok);
+    printf("  Samples:           %ld (%.1f s of recording)\n", samples, recorded);
+    printf("  Wall time:         %.3f s\n", wall_seconds);
+    if (wall_seconds > 0) {
+        printf("  Throughput:        %.0f samples/s (%.1fx real time)\n",
+               samples / wall_seconds, recorded / wall_seconds);
+    }
+    if (labeled > 0) {
+        printf("  Mode accuracy:     %.2f %% (%ld ticks vs Mode column)\n", 100.0 * correct / labeled, labeled);
+    } else {
+        printf("  Mode accuracy:     n/a (no Mode column)\n");
+    }
+    printf("  Stim duty cycle:   %.1f %% of %ld ticks\n", ticks ? 100.0 * stim / ticks : 0.0, ticks);
+}
+
+// --- LATENCY REPORT ---
+void print_latency_row(const char* name, const NeuroGait::LatencyHistogram& h) {
+    printf("  %-22s %9llu %9.2f %9.2f %9.2f %9.2f\n", name, (unsigned long long)h.count(),
+           h.mean() / 1000.0, h.percentile(50) / 1000.0, h.percentile(99) / 1000.0, h.max() / 1000.0);
+}
+
+void write_json_string(FILE* out, const char* text) {
+    fputc('"', out);
+    for (const char* c = text; *c; c++) {
+        if (*c == '"' || *c == '\\') fputc('\\', out);
+        if ((unsigned char)*c < 0x20) fprintf(out, "\\u%04x", *c);
+        else fputc(*c, out);
+    }
+    fputc('"', out);
+}
+
+void write_latency_json(FILE* out, const char* name, const NeuroGait::LatencyHistogram& h, bool last) {
+    fprintf(out, "    \"%s\": {\"count\": %llu, \"mean_ns\": %.1f, \"p50_ns\": %llu, \"p99_ns\": %llu, \"max_ns\": %llu}%s\n",
+            name, (unsigned long long)h.count(), h.mean(), (unsigned long long)h.percentile(50),
+            (unsigned long long)h.percentile(99), (unsigned long long)h.max(), last ? "" : ",");
+}
+
+// Merges the per-file timings, prints a table and writes the JSON report.
+// Returns false if the report file cannot be written.
+bool report_latency(const std::vector<ReplayStats>& all, const SimOptions& opts) {
+    using namespace NeuroGait;
+
+    LatencyProfile total;
+    const ReplayStats* worst = NULL;
+    long samples = 0;
+    for (size_t i = 0; i < all.size(); i++) {
+        if (!all[i].ok) continue;
+        total.merge(all[i].latency);
+        samples += all[i].samples;
+        if (all[i].latency.worst_tick_sample >= 0 &&
+            (!worst || all[i].latency.worst_tick_ns > worst->latency.worst_tick_ns)) {
+            worst = &all[i];
+        }
+    }
+    double overhead_ns = counter_overhead_cycles() * opts.ns_per_cycle;
+
+    printf("\n=== LATENCY (us per step, %s build, %s clock, ~%.0f ns timer overhead per stage) ===\n",
+           SAMPLE_TYPE, cycle_counter_source(), overhead_ns);
+    printf("  %-22s %9s %9s %9s %9s %9s\n", "Stage", "count", "mean", "p50", "p99", "max");
+    for (int s = 0; s < NUM_STAGES; s++) print_latency_row(STAGE_NAMES[s], total.stages[s]);
+    print_latency_row("tick (all stages)", total.ticks);
+    if (worst) {
+        printf("  Worst tick: %.2f us at %.2fs of %s (budget %.0f us)\n", worst->latency.worst_tick_ns / 1000.0,
+               worst->latency.worst_tick_sample * 0.004, worst->path, LATENCY_BUDGET_US);
+    }
+
+    bool to_stdout = strcmp(opts.latency_report, "-") == 0;
+    FILE* out = to_stdout ? stdout : fopen(opts.latency_report, "w");
+    if (!out) {
+        fprintf(stderr, "Error writing %s: %s\n", opts.latency_report, strerror(errno));
+        return false;
+    }
+    fprintf(out, "{\n");
+    fprintf(out, "  \"numeric\": \"%s\",\n", SAMPLE_TYPE);
+    fprintf(out, "  \"clock\": \"%s\",\n", cycle_counter_source());
+    fprintf(out, "  \"ns_per_cycle\": %.6f,\n", opts.ns_per_cycle);
+    fprintf(out, "  \"timer_overhead_ns\": %.1f,\n", overhead_ns);
+    fprintf(out, "  \"budget_us\": %.0f,\n", LATENCY_BUDGET_US);
+    fprintf(out, "  \"files\": [");
+    bool first = true;
+    for (size_t i = 0; i < all.size(); i++) {
+        if (!all[i].ok) continue;
+        if (!first) fprintf(out, ", ");
+        write_json_string(out, all[i].path);
+        first = false;
+    }
+    fprintf(out, "],\n");
+    fprintf(out, "  \"samples\": %ld,\n", samples);
+    fprintf(out, "  \"stages\": {\n");
+    for (int s = 0; s < NUM_STAGES; s++) write_latency_json(out, STAGE_NAMES[s], total.stages[s], s == NUM_STAGES - 1);
+    fprintf(out, "  },\n");
+    fprintf(out, "  \"tick\": {\n");
+    write_latency_json(out, "all_stages", total.ticks, true);
+    fprintf(out, "  },\n");
+    if (worst) {
+        fprintf(out, "  \"worst_tick\": {\"file\": ");
+        write_json_string(out, worst->path);
+        fprintf(out, ", \"sample\": %ld, \"ns\": %llu},\n", worst->latency.worst_tick_sample,
+                (unsigned long long)worst->latency.worst_tick_ns);
+    } else {
+        fprintf(out, "  \"worst_tick\": null,\n");
+    }
+    fprintf(out, "  \"within_budget\": %s\n", total.ticks.max() <= LATENCY_BUDGET_US * 1000.0 ? "true" : "false");
+    fprintf(out, "}\n");
+    if (!to_stdout) {
+        fclose(out);
+        printf("  Report written to %s\n", opts.latency_report);
+    }
+    return true;
+}
 
-        next_tick.tv_nsec += 4000000; 
-        if (next_tick.tv_nsec >= 1000000000) {
-            next_tick.tv_nsec -= 1000000000;
-            next_tick.tv_sec += 1;
+int main(int argc, char** argv) {
+    using namespace NeuroGait;
+
+    SimOptions opts;
+    opts.speed = 1.0;
+    opts.jobs = 1;
+    opts.quiet = false;
+    opts.latency_report = NULL;
+    opts.ns_per_cycle = 1.0;
+    bool bench = false;
+
+    static const struct option long_options[] = {
+        {"speed", required_argument, NULL, 's'},
+        {"jobs",  required_argument, NULL, 'j'},
+        {"quiet", no_argument,       NULL, 'q'},
+        {"bench", no_argument,       NULL, 'b'},
+        {"latency-report", required_argument, NULL, 'l'},
+        {"help",  no_argument,       NULL, 'h'},
+        {NULL, 0, NULL, 0}
+    };
+    int opt;
+    while ((opt = getopt_long(argc, argv, "j:qh", long_options, NULL)) != -1) {
+        switch (opt) {
+            case 's': opts.speed = strtod(optarg, NULL); break;
+            case 'j': opts.jobs = atoi(optarg); break;
+            case 'q': opts.quiet = true; break;
+            case 'b': bench = true; break;
+            case 'l': opts.latency_report = optarg; break;
+            case 'h': print_usage(argv[0]); return 0;
+            default:  print_usage(argv[0]); return 2;
+        }
+    }
+    if (opts.speed < 0 || opts.jobs < 1) {
+        print_usage(argv[0]);
+        return 2;
+    }
+
+    if (bench) {
+        run_feature_benchmark();
+        return run_chain_benchmark();
+    }
+
+    for (int i = optind; i < argc; i++) opts.files.push_back(argv[i]);
+    if (opts.files.empty()) opts.files.push_back(CSV_PATH);
+    if (opts.jobs > (int)opts.files.size()) opts.jobs = (int)opts.files.size();
+    if (opts.jobs > 1) opts.quiet = true; // Interleaved per-tick tables are unreadable
+
+    if (opts.latency_report) opts.ns_per_cycle = calibrate_ns_per_cycle();
+
+    // --- PRINT MEMORY STATS STARTUP ---
+    if (!opts.quiet) print_memory_report(Pipeline::bufferBytes());
+
+    std::vector<ReplayStats> stats(opts.files.size());
+    struct timespec start;
+    clock_gettime(CLOCK_MONOTONIC, &start);
+
+    if (opts.jobs == 1) {
+        for (size_t i = 0; i < opts.files.size(); i++) stats[i] = replay_file(opts.files[i], opts);
+    } else {
+        // Workers pull the next file index until the list is exhausted
+        std::atomic<size_t> next(0);
+        std::vector<std::thread> workers;
+        for (int w = 0; w < opts.jobs; w++) {
+            workers.push_back(std::thread([&]() {
+                for (size_t i = next++; i < opts.files.size(); i = next++) {
+                    stats[i] = replay_file(opts.files[i], opts);
+                }
+            }));
         }
-        clock_nanosleep(CLOCK_MONOTONIC, TIMER_ABSTIME, &next_tick, NULL);
+        for (size_t w = 0; w < workers.size(); w++) workers[w].join();
     }
 
-    printf("--- END ---\n");
-    fclose(file);
+    print_summary(stats, elapsed_seconds(start));
+    if (opts.latency_report && !report_latency(stats, opts)) return 1;
+
+    for (size_t i = 0; i < stats.size(); i++) {
+        if (!stats[i].ok) return 1;
+    }
     return 0;
-}
\ No newline at end of file
+}
@@ -0,0 +1,93 @@
+#include "neurogait_api.h"
+#include "pipeline.h"
+
+using namespace NeuroGait;
+
+static const int FEATURE_COUNT = NUM_CHANNELS * 3;
+
+int ng_api_version(void) { return 1; }
+
+int ng_fixed_point(void) {
+#ifdef NEUROGAIT_FIXED_POINT
+    return 1;
+#else
+    return 0;
+#endif
+}
+
+int ng_num_channels(void) { return NUM_CHANNELS; }
+int ng_feature_count(void) { return FEATURE_COUNT; }
+int ng_context_window(void) { return WINDOW_SIZE; }
+int ng_inference_period(void) { return INFERENCE_PERIOD; }
+
+int ng_max_ticks(int n_samples) {
+    if (n_samples <= WINDOW_SIZE) return 0;
+    return (n_samples - WINDOW_SIZE - 1) / INFERENCE_PERIOD + 1;
+}
+
+void ng_filter(const float* samples, int n_samples, float* filtered) {
+    Conditioner filters[NUM_CHANNELS];
+    for (int n = 0; n < n_samples; n++) {
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            int i = n * NUM_CHANNELS + ch;
+            filtered[i] = sample_to_float(filters[ch].filter(to_sample(samples[i])));
+        }
+    }
+}
+
+static void store_features(const Features& f, float* out) {
+    for (int i = 0; i < FEATURE_COUNT; i++) out[i] = feature_to_float(f.values[i]);
+}
+
+int ng_replay(const float* samples, int n_samples,
+              float* filtered,
+              int32_t* tick_index,
+              float* context_features,
+              float* phase_features,
+              int32_t* mode,
+              int32_t* phase,
+              uint8_t* stimulating) {
+    // ~4 KB of ring buffers: heap, not the caller's thread stack
+    Pipeline* pipeline = new Pipeline();
+    pipeline->fsm.setVerbose(false);
+    TickResult result;
+    int ticks = 0;
+
+    for (int n = 0; n < n_samples; n++) {
+        bool tick = pipeline->step(&samples[n * NUM_CHANNELS], result);
+
+        if (filtered) {
+            for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+                filtered[n * NUM_CHANNELS + ch] = sample_to_float(pipeline->lastFiltered()[ch]);
+            }
+        }
+        if (!tick) continue;
+
+        tick_index[ticks] = n;
+        if (context_features) store_features(result.context, &context_features[ticks * FEATURE_COUNT]);
+        if (phase_features) store_features(result.phase_features, &phase_features[ticks * FEATURE_COUNT]);
+        mode[ticks] = result.mode;
+        phase[ticks] = result.phase;
+        stimulating[ticks] = result.stimulating ? 1 : 0;
+        ticks++;
+    }
+
+    delete pipeline;
+    return ticks;
+}
+
+void ng_predict_walking_mode(const float* features, int n_rows, int32_t* out) {
+    float row[FEATURE_COUNT];
+    for (int r = 0; r < n_rows; r++) {
+        for (int i = 0; i < FEATURE_COUNT; i++) row[i] = features[r * FEATURE_COUNT + i];
+        out[r] = WalkingModel::predict_walking_mode(row);
+    }
+}
+
+void ng_predict_gait_phase(const float* features, int n_rows, int32_t* out) {
+    float row[FEATURE_COUNT];
+    for (int r = 0; r < n_rows; r++) {
+        for (int i = 0; i < FEATURE_COUNT; i++) row[i] = features[r * FEATURE_COUNT + i];
+        out[r] = GaitPhaseModel::predict_gait_phase(row);
+    }
+}
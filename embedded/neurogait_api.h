@@ -0,0 +1,54 @@
+#ifndef NEUROGAIT_API_H
+#define NEUROGAIT_API_H
+
+#include <stdint.h>
+
+// C batch API of the firmware chain for host tools (make lib -> libneurogait.so).
+// Python bindings: src/lib/firmware.py
+//
+// Sample arrays are row-major (n_samples, ng_num_channels()) float32 in input units
+// (TA, MG), already decimated to 250 Hz. Feature arrays are row-major
+// (n_rows, ng_feature_count()) float32 [MAV, RMS, WL] per channel. In a FIXED_POINT
+// build the chain runs in Q15 and its outputs are converted back to float.
+
+#ifdef __cplusplus
+extern "C" {
+#endif
+
+int ng_api_version(void);
+int ng_fixed_point(void);       // 1 if built with NEUROGAIT_FIXED_POINT
+int ng_num_channels(void);
+int ng_feature_count(void);     // Features per window (NUM_CHANNELS * 3)
+int ng_context_window(void);    // Samples; ticks start once this many are buffered
+int ng_inference_period(void);  // Samples between ticks
+
+// Upper bound of the ticks ng_replay produces for n_samples
+int ng_max_ticks(int n_samples);
+
+// Runs SignalConditioner over every channel, from reset state.
+void ng_filter(const float* samples, int n_samples, float* filtered);
+
+// Replays a recording through the full chain (filters, running features, both
+// LDA layers, StimulationController), from reset state.
+// Per sample: filtered (n_samples x channels), may be NULL.
+// Per tick: tick_index (sample index of the tick), context / phase features
+// (may be NULL), mode, phase and stimulating, each sized ng_max_ticks(n_samples).
+// Returns the number of ticks written.
+int ng_replay(const float* samples, int n_samples,
+              float* filtered,
+              int32_t* tick_index,
+              float* context_features,
+              float* phase_features,
+              int32_t* mode,
+              int32_t* phase,
+              uint8_t* stimulating);
+
+// Float LDA layers over n_rows feature vectors
+void ng_predict_walking_mode(const float* features, int n_rows, int32_t* out);
+void ng_predict_gait_phase(const float* features, int n_rows, int32_t* out);
+
+#ifdef __cplusplus
+}
+#endif
+
+#endif
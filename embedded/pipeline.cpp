@@ -0,0 +1,85 @@
+#include "pipeline.h"
+#include "cycle_counter.h"
+
+namespace NeuroGait {
+
+    Pipeline::Pipeline() : timings(NULL) {
+        reset();
+    }
+
+    void Pipeline::reset() {
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            filters[ch].init();
+            filtered[ch] = 0;
+            for (int i = 0; i < WINDOW_SIZE; i++) buffers[ch][i] = 0;
+        }
+        extractor.reset();
+        fsm.reset();
+        buffer_head = 0;
+        sample_count = 0;
+        t_ms = 0;
+    }
+
+    // Charges the cycles since `mark` to `stage` and restarts the mark
+    inline void Pipeline::lap(Stage stage, uint64_t& mark) {
+        uint64_t now = read_cycle_counter();
+        timings->cycles[stage] += now - mark;
+        timings->ran |= 1u << stage;
+        mark = now;
+    }
+
+    bool Pipeline::step(const float input[NUM_CHANNELS], TickResult& result) {
+        uint64_t mark = 0;
+        if (timings) {
+            for (int s = 0; s < NUM_STAGES; s++) timings->cycles[s] = 0;
+            timings->ran = 0;
+            mark = read_cycle_counter();
+        }
+
+        // A. Filter (ADC boundary: the device samples integers, the host converts floats)
+        for (int ch = 0; ch < NUM_CHANNELS; ch++) {
+            filtered[ch] = filters[ch].filter(to_sample(input[ch]));
+        }
+        if (timings) lap(STAGE_FILTER, mark);
+
+        // B. Add to Buffer (Circular Write) and update the running feature sums
+        extractor.push(buffers, buffer_head, filtered);
+        if (timings) lap(STAGE_FEATURES, mark);
+
+        // C. Inference (Every 100ms)
+        bool tick = (sample_count % INFERENCE_PERIOD == 0) && (sample_count >= WINDOW_SIZE);
+        if (tick) {
+            // FULL Context features (500 samples / 2000ms) for Walking Mode,
+            // SHORT Phase features (50 samples / 200ms) for Gait Phase
+            result.context = extractor.contextFeatures();
+            result.phase_features = extractor.phaseFeatures();
+            if (timings) lap(STAGE_FEATURES, mark);
+#ifdef NEUROGAIT_FIXED_POINT
+            result.mode = WalkingModel::predict_walking_mode_q15(result.context.values);
+#else
+            result.mode = WalkingModel::predict_walking_mode(result.context.values);
+#endif
+            result.ta_rms = feature_to_float(result.context.values[1]);
+            if (timings) lap(STAGE_WALKING_MODE, mark);
+
+            result.phase = 0;
+            if (result.mode != 0 && result.mode != 6) { // If Walking
+#ifdef NEUROGAIT_FIXED_POINT
+                result.phase = GaitPhaseModel::predict_gait_phase_q15(result.phase_features.values);
+#else
+                result.phase = GaitPhaseModel::predict_gait_phase(result.phase_features.values);
+#endif
+                if (timings) lap(STAGE_GAIT_PHASE, mark);
+            }
+
+            fsm.update(result.mode, result.phase, result.ta_rms, t_ms);
+            result.stimulating = fsm.getStimulationStatus();
+            if (timings) lap(STAGE_FSM, mark);
+        }
+
+        buffer_head = (buffer_head + 1) % WINDOW_SIZE;
+        sample_count++;
+        t_ms += SAMPLE_PERIOD_MS;
+        return tick;
+    }
+}
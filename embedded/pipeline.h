@@ -0,0 +1,97 @@
+#ifndef PIPELINE_H
+#define PIPELINE_H
+
+#include "signal_conditioner.h"
+#include "feature_extraction.h"
+#include "classifiers.h"
+#include "state_machine.h"
+
+namespace NeuroGait {
+
+    const int INFERENCE_PERIOD = 25;  // Samples between inference ticks (100 ms @ 250 Hz)
+    const int SAMPLE_PERIOD_MS = 4;   // 250 Hz
+
+    // --- NUMERIC BUILD (make FIXED_POINT=1 for FPU-less targets) ---
+#ifdef NEUROGAIT_FIXED_POINT
+    typedef int16_t Sample;
+    typedef SignalConditionerQ15 Conditioner;
+    typedef RunningFeatureExtractorQ15 Extractor;
+    typedef NeuroFeaturesQ15 Features;
+#else
+    typedef float Sample;
+    typedef SignalConditioner Conditioner;
+    typedef RunningFeatureExtractor Extractor;
+    typedef NeuroFeatures Features;
+#endif
+
+    // Stages of Pipeline::step timed by the host latency instrumentation
+    enum Stage { STAGE_FILTER, STAGE_FEATURES, STAGE_WALKING_MODE, STAGE_GAIT_PHASE, STAGE_FSM, NUM_STAGES };
+
+    // Per-stage cost of one step in read_cycle_counter() units
+    struct StageTimings {
+        uint64_t cycles[NUM_STAGES];
+        unsigned ran;  // Bit (1 << stage) set if the stage ran in this step
+    };
+
+    // Decisions of one inference tick
+    struct TickResult {
+        int mode;          // Walking mode (0=Sitting, 1=Walking, 2=Ascent, 3=Descent)
+        int phase;         // Gait phase (0=Stance, 1=Swing), 0 unless walking
+        bool stimulating;  // StimulationController output after the update
+        float ta_rms;      // TA RMS of the context window (volitional trigger input)
+        Features context;  // Last CONTEXT_WINDOW samples
+        Features phase_features; // Last PHASE_WINDOW samples
+    };
+
+    // The per-sample firmware chain: conditioning, ring buffer + running features,
+    // and every INFERENCE_PERIOD samples (once the context window is full) both LDA
+    // layers and the stimulation state machine. Shared by the simulator and the host
+    // library so both run exactly the device code path.
+    class Pipeline {
+    public:
+        Pipeline();
+        void reset();
+
+        // Takes one sample per channel (input units; converted at the ADC boundary in
+        // the Q15 build). Returns true on inference ticks, with the decisions in `result`.
+        bool step(const float input[NUM_CHANNELS], TickResult& result);
+
+        // Newest filtered sample of each channel
+        const Sample* lastFiltered() const { return filtered; }
+        long sampleCount() const { return sample_count; }
+
+        // Host instrumentation: while set, every step writes its per-stage cycle counts
+        // to `t` (NULL, the default, disables it)
+        void setTimings(StageTimings* t) { timings = t; }
+
+        // Static SRAM of the chain's parts, for the memory report
+        static size_t bufferBytes() { return sizeof(Sample) * NUM_CHANNELS * WINDOW_SIZE; }
+
+        StimulationController fsm;
+
+    private:
+        Conditioner filters[NUM_CHANNELS];
+        Extractor extractor;
+        Sample buffers[NUM_CHANNELS][WINDOW_SIZE];
+        Sample filtered[NUM_CHANNELS];
+        int buffer_head;
+        long sample_count;
+        long t_ms;
+        StageTimings* timings;
+
+        void lap(Stage stage, uint64_t& mark);
+    };
+
+    // Conversions between the build's sample / feature types and float
+#ifdef NEUROGAIT_FIXED_POINT
+    inline Sample to_sample(float x) { return float_to_q15(x); }
+    inline float sample_to_float(Sample x) { return q15_to_float(x); }
+    inline float feature_to_float(int32_t x) { return q15_to_float(x); }
+#else
+    inline Sample to_sample(float x) { return x; }
+    inline float sample_to_float(Sample x) { return x; }
+    inline float feature_to_float(float x) { return x; }
+#endif
+}
+
+#endif
@@ -47,4 +47,45 @@ float SignalConditioner::filter(float sample) {
     return notch_out;
 }
 
+// --- BiquadQ15 Implementation ---
+
+BiquadQ15::BiquadQ15(int16_t _b0, int16_t _b1, int16_t _b2, int16_t _a1, int16_t _a2)
+    : b0(_b0), b1(_b1), b2(_b2), a1(_a1), a2(_a2), x1(0), x2(0), y1(0), y2(0) {}
+
+void BiquadQ15::reset() {
+    x1 = x2 = 0;
+    y1 = y2 = 0;
+}
+
+// y[n] = (b0*x[n] + b1*x[n-1] + b2*x[n-2] - a1*y[n-1] - a2*y[n-2]) >> 14, rounded and saturated.
+// Products are Q29; sum(|coef|) < 4 for both filters, so the accumulator stays within int32.
+int16_t BiquadQ15::process(int16_t x) {
+    int32_t acc = (int32_t)b0 * x + (int32_t)b1 * x1 + (int32_t)b2 * x2
+                - (int32_t)a1 * y1 - (int32_t)a2 * y2;
+    int16_t y = saturate_q15((acc + (1 << (COEF_SHIFT - 1))) >> COEF_SHIFT);
+    x2 = x1;
+    x1 = x;
+    y2 = y1;
+    y1 = y;
+    return y;
+}
+
+// --- SignalConditionerQ15 Implementation ---
+
+SignalConditionerQ15::SignalConditionerQ15()
+    // Same filters as SignalConditioner, coefficients rounded to Q14
+    : bandpass(10854, 0, -10854, 3811, -5323),
+      notch(15966, 0, 15966, 0, 15548)
+{
+}
+
+void SignalConditionerQ15::init() {
+    bandpass.reset();
+    notch.reset();
+}
+
+int16_t SignalConditionerQ15::filter(int16_t sample) {
+    return notch.process(bandpass.process(sample));
+}
+
 }
\ No newline at end of file
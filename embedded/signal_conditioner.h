@@ -1,6 +1,8 @@
 #ifndef SIGNAL_CONDITIONER_H
 #define SIGNAL_CONDITIONER_H
 
+#include "fixed_point.h"
+
 namespace NeuroGait {
 
 // A standard Biquad filter class (Direct Form II Transposed)
@@ -29,6 +31,33 @@ public:
     float filter(float sample);
 };
 
+// Fixed-point Biquad (Direct Form I): Q15 samples, Q14 coefficients, 32-bit accumulator.
+// DF1 keeps only input/output history at sample precision and rounds once per sample,
+// where DF2T would need wider state words.
+class BiquadQ15 {
+private:
+    int16_t b0, b1, b2, a1, a2;
+    int16_t x1, x2, y1, y2; // Input / output history
+
+public:
+    BiquadQ15(int16_t _b0, int16_t _b1, int16_t _b2, int16_t _a1, int16_t _a2);
+    void reset();
+    int16_t process(int16_t x);
+};
+
+// Q15 version of the filter chain (Bandpass + Notch)
+class SignalConditionerQ15 {
+private:
+    BiquadQ15 bandpass;
+    BiquadQ15 notch;
+
+public:
+    SignalConditionerQ15();
+    void init();
+
+    int16_t filter(int16_t sample);
+};
+
 }
 
 #endif
\ No newline at end of file
@@ -3,11 +3,21 @@
 
 namespace NeuroGait {
 
-StimulationController::StimulationController() 
-    : currentPhase(0), currentMode(0), // Default Stance/Sitting 
-      lastTransitionTime(0), currentPhaseDuration(0),
-      avgSwingDuration(400.0f), avgStanceDuration(600.0f),
-      swingCount(0), stanceCount(0), isStimulating(false) {}
+StimulationController::StimulationController() : verbose(true) {
+    reset();
+}
+
+void StimulationController::reset() {
+    currentPhase = 0; // Default Stance/Sitting
+    currentMode = 0;
+    lastTransitionTime = 0;
+    currentPhaseDuration = 0;
+    avgSwingDuration = 400.0f;
+    avgStanceDuration = 600.0f;
+    swingCount = 0;
+    stanceCount = 0;
+    isStimulating = false;
+}
 
 void StimulationController::update(int mode, int predictedPhase, float ta_rms, long currentTimeMs) {
     currentMode = mode;
@@ -41,7 +51,7 @@ void StimulationController::update(int mode, int predictedPhase, float ta_rms, l
             currentPhase = 1; 
             lastTransitionTime = currentTimeMs;
             isStimulating = true;
-            std::cout << "[FSM] >>> SWING ONSET (" << currentPhaseDuration << "ms Stance)" << std::endl;
+            if (verbose) std::cout << "[FSM] >>> SWING ONSET (" << currentPhaseDuration << "ms Stance)" << std::endl;
         }
 
     } else if (currentPhase == 1) { // In Swing, looking for Stance
@@ -56,7 +66,7 @@ void StimulationController::update(int mode, int predictedPhase, float ta_rms, l
             currentPhase = 0;
             lastTransitionTime = currentTimeMs;
             isStimulating = false;
-            std::cout << "[FSM] <<< HEEL STRIKE (" << currentPhaseDuration << "ms Swing)" << std::endl;
+            if (verbose) std::cout << "[FSM] <<< HEEL STRIKE (" << currentPhaseDuration << "ms Swing)" << std::endl;
         }
     }
 }
@@ -65,6 +75,10 @@ bool StimulationController::getStimulationStatus() const {
     return isStimulating; 
 }
 
+void StimulationController::setVerbose(bool enabled) {
+    verbose = enabled;
+}
+
 void StimulationController::printDebugInfo() const {
     std::cout << "\n[FSM STATISTICS]" << std::endl;
     std::cout << "  Avg Swing Duration: " << (int)avgSwingDuration << " ms" << std::endl;
@@ -23,9 +23,15 @@ private:
     // Safety
     bool isStimulating;
 
+    // Transition log on stdout (off for batch replays)
+    bool verbose;
+
 public:
     StimulationController();
 
+    // Back to the power-on state (Sitting, Stance, default durations)
+    void reset();
+
     /**
      * Main logic loop. 
      * @param mode: Context from LDA 1
@@ -36,6 +42,7 @@ public:
     void update(int mode, int predictedPhase, float ta_rms, long currentTimeMs);
 
     bool getStimulationStatus() const;
+    void setVerbose(bool enabled);
     void printDebugInfo() const;
 };
 
@@ -23,5 +23,33 @@ namespace NeuroGait {
             }
             return LDA_CLASSES[best_idx];
         }
+
+        // Quantized LDA (src/lib/fixed_point.py, QuantizedLDA.from_float with full scale 1.0):
+        // class score = (intercept + sum(w * (f >> shift))) >> (exponent - min exponent)
+        const int16_t LDA_WEIGHTS_Q15[24] = { 1780, -1447, -2206, -10542, -4940, 11993, -5340, 316, 5802, -7688, 10880, -4521, 4506, -564, -851, 15353, 6152, -18118, 440, 2596, -2910, 17743, -9614, -2603 };
+        const int32_t LDA_INTERCEPTS_Q15[4] = { 2956761, -3498976, -9785363, -2503875 };
+        const uint8_t LDA_EXPONENTS[4] = { 18, 19, 18, 18 };
+        const uint8_t LDA_FEATURE_SHIFTS[6] = { 0, 0, 9, 0, 0, 9 };
+
+        int predict_walking_mode_q15(const int32_t* input_data) {
+            int min_exp = LDA_EXPONENTS[0];
+            for (int c = 1; c < 4; ++c) {
+                if (LDA_EXPONENTS[c] < min_exp) min_exp = LDA_EXPONENTS[c];
+            }
+
+            int best_idx = 0;
+            int32_t max_score = INT32_MIN;
+
+            for (int c = 0; c < 4; ++c) {
+                int32_t current_score = lda_score_q15(&LDA_WEIGHTS_Q15[c * 6], LDA_INTERCEPTS_Q15[c],
+                                                      input_data, LDA_FEATURE_SHIFTS, 6);
+                current_score >>= (LDA_EXPONENTS[c] - min_exp);
+                if (current_score > max_score) {
+                    max_score = current_score;
+                    best_idx = c;
+                }
+            }
+            return LDA_CLASSES[best_idx];
+        }
     }
 }
\ No newline at end of file
@@ -0,0 +1,109 @@
+import os
+import json
+import hashlib
+import logging
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitCache:
+    """
+    On-disk columnar cache for parsed ENABL3S circuit files.
+
+    Each entry is an uncompressed ``.npz`` archive with one contiguous array per column,
+    stored in the dtype pandas parsed it as, plus a small JSON sidecar holding the column
+    names. A hit therefore returns the same frame as parsing the CSV.
+    Entries are keyed by source path, mtime, size and the requested channel map: editing
+    the CSV or remapping a channel produces a new key instead of a stale hit.
+    """
+
+    VERSION = 2
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir (str): Directory holding the cache entries (created if missing).
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def make_key(self, file_path: str, channels: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Builds the cache key of a source file.
+
+        Args:
+            file_path (str): Path of the source CSV.
+            channels (dict, optional): Abstract name -> CSV column of the requested
+                                       channels. None means all columns.
+
+        Returns:
+            str: Hex digest identifying the entry, or None if the source does not exist.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        channel_spec = sorted(channels.items()) if channels is not None else '*'
+        raw_key = f"v{self.VERSION}|{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{channel_spec}"
+        return hashlib.sha1(raw_key.encode('utf-8')).hexdigest()
+
+    def _entry_paths(self, key: str):
+        base = os.path.join(self.cache_dir, key)
+        return base + '.npz', base + '.json'
+
+    def load(self, key: str) -> Optional[pd.DataFrame]:
+        """Returns the cached DataFrame for `key`, or None on a miss."""
+        data_path, columns_path = self._entry_paths(key)
+        if not (os.path.exists(data_path) and os.path.exists(columns_path)):
+            return None
+
+        try:
+            with open(columns_path, 'r') as f:
+                columns: List[str] = json.load(f)
+            with np.load(data_path) as archive:
+                if len(archive.files) != len(columns):
+                    logger.warning(f"Discarding inconsistent cache entry {key}")
+                    return None
+                data = {col: archive[f"c{i}"] for i, col in enumerate(columns)}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Discarding unreadable cache entry {key}: {e}")
+            return None
+
+        return pd.DataFrame(data)
+
+    def store(self, key: str, df: pd.DataFrame) -> bool:
+        """
+        Writes `df` as a columnar entry, keeping each column's dtype.
+
+        Non-numeric frames are not cached. Files are written under a temporary name and
+        renamed into place so concurrent readers never see a partial entry.
+
+        Returns:
+            bool: True if the entry was written.
+        """
+        if df.empty or not all(pd.api.types.is_numeric_dtype(t) for t in df.dtypes):
+            return False
+
+        data_path, columns_path = self._entry_paths(key)
+        tmp_suffix = f".{os.getpid()}.tmp"
+        data = {f"c{i}": df.iloc[:, i].to_numpy() for i in range(df.shape[1])}
+
+        try:
+            with open(data_path + tmp_suffix, 'wb') as f:
+                np.savez(f, **data)
+            with open(columns_path + tmp_suffix, 'w') as f:
+                json.dump([str(c) for c in df.columns], f)
+            os.replace(columns_path + tmp_suffix, columns_path)
+            os.replace(data_path + tmp_suffix, data_path)
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {key}: {e}")
+            for path in (data_path + tmp_suffix, columns_path + tmp_suffix):
+                if os.path.exists(path):
+                    os.remove(path)
+            return False
+
+        return True
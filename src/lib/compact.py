@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Sequence, Tuple
+
+
+def smallest_dtype(values: np.ndarray) -> np.dtype:
+    """
+    Smallest dtype holding `values` exactly: int8/16/32 for integral values, float32 otherwise
+    (NaN labels stay representable).
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.dtype(np.int8)
+    if values.dtype.kind == 'f':
+        if not np.all(np.isfinite(values)) or not np.all(values == np.round(values)):
+            return np.dtype(np.float32)
+    elif values.dtype.kind not in 'iub':
+        raise TypeError(f"Cannot compact non-numeric column of dtype {values.dtype}")
+
+    lo, hi = values.min(), values.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class RunLengthColumn:
+    """
+    Run-length encoded per-sample column (label, mode, circuit id).
+
+    Stores one value and one start offset per run of equal consecutive samples. Mode and
+    circuit columns change a few times per circuit, so a column of millions of samples
+    shrinks to a few kilobytes. NaN samples form runs like any other value.
+    """
+
+    def __init__(self, values: np.ndarray, starts: np.ndarray, length: int):
+        self.values = values  # (n_runs,) smallest exact dtype
+        self.starts = starts  # (n_runs,) int64 first sample of each run
+        self.length = length
+
+    @classmethod
+    def encode(cls, values: np.ndarray) -> 'RunLengthColumn':
+        values = np.asarray(values)
+        n = len(values)
+        if n == 0:
+            return cls(np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int64), 0)
+
+        changed = values[1:] != values[:-1]
+        if values.dtype.kind == 'f':
+            # NaN != NaN, but consecutive NaNs are one run
+            changed &= ~(np.isnan(values[1:]) & np.isnan(values[:-1]))
+        starts = np.concatenate(([0], np.flatnonzero(changed) + 1)).astype(np.int64)
+        run_values = values[starts]
+        return cls(run_values.astype(smallest_dtype(run_values)), starts, n)
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def n_runs(self) -> int:
+        return len(self.starts)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.starts.nbytes
+
+    def decode(self) -> np.ndarray:
+        """Expands the runs back to one value per sample."""
+        return np.repeat(self.values, np.diff(np.append(self.starts, self.length)))
+
+
+class CompactRecording:
+    """
+    Compact in-memory form of a preprocessed (combined) subject frame.
+
+    Signals are one C-contiguous float32 (n_samples, n_channels) array and every other
+    column is a `RunLengthColumn`. Segment boundaries are derived from the run starts of
+    the segment columns, so there is no per-sample group key (such as a string
+    'Circuit_Mode' column). This is the in-memory counterpart of `SubjectStore`.
+    """
+
+    def __init__(self, signals: np.ndarray, channels: Sequence[str], columns: Dict[str, RunLengthColumn]):
+        self.signals = signals
+        self.channels = list(channels)
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, signal_cols: Sequence[str], columns: Sequence[str]) -> 'CompactRecording':
+        """
+        Args:
+            df (pd.DataFrame): Preprocessed data.
+            signal_cols (list): Signal columns, stored as float32 (e.g. ['TA', 'MG']).
+            columns (list): Label / mode / circuit columns to keep run-length encoded.
+        """
+        signals = np.empty((len(df), len(signal_cols)), dtype=np.float32)
+        for i, col in enumerate(signal_cols):
+            signals[:, i] = df[col].to_numpy()
+        encoded = {col: RunLengthColumn.encode(df[col].to_numpy()) for col in columns}
+        return cls(signals, signal_cols, encoded)
+
+    def __len__(self):
+        return self.signals.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.signals.nbytes + sum(col.nbytes for col in self.columns.values())
+
+    def column(self, name: str) -> np.ndarray:
+        """Decoded per-sample values of a run-length column."""
+        return self.columns[name].decode()
+
+    def segment_offsets(self, segment_cols: Sequence[str]) -> np.ndarray:
+        """Sample offsets of contiguous segments: a new one starts whenever any column changes."""
+        starts = np.unique(np.concatenate([self.columns[col].starts for col in segment_cols] + [[0]]))
+        return np.append(starts, len(self)).astype(np.int64)
+
+    def segments(self, label_col: str, segment_cols: Sequence[str]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns the valid segments as (X, y): X are views into `signals`, y label slices.
+
+        Segments with NaN signal samples or NaN labels are skipped, matching the
+        filtering done by `MultiModeDataset`.
+
+        Args:
+            label_col (str): Run-length column to use as targets (e.g. 'Mode').
+            segment_cols (list): Columns whose changes split segments (e.g. ['Circuit_ID', 'Mode']).
+        """
+        offsets = self.segment_offsets(segment_cols)
+        labels = self.column(label_col)
+
+        invalid = np.isnan(self.signals).any(axis=1)
+        if labels.dtype.kind == 'f':
+            invalid |= np.isnan(labels)
+        invalid_count = np.concatenate(([0], np.cumsum(invalid, dtype=np.int64)))
+        keep = invalid_count[offsets[1:]] == invalid_count[offsets[:-1]]
+
+        return [(self.signals[start:stop], labels[start:stop])
+                for start, stop, ok in zip(offsets[:-1].tolist(), offsets[1:].tolist(), keep) if ok]
+
+    def memory_report(self, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        Compares the footprint of this recording with the frame it was built from.
+
+        Returns:
+            dict: 'frame_bytes' (deep, including index and object columns),
+                  'compact_bytes' and 'reduction' (frame / compact).
+        """
+        frame_bytes = int(df.memory_usage(deep=True).sum())
+        return {
+            'frame_bytes': frame_bytes,
+            'compact_bytes': self.nbytes,
+            'reduction': frame_bytes / max(self.nbytes, 1),
+        }
@@ -0,0 +1,111 @@
+"""
+Host-side size and speed measurements of generated C++ classifiers, shared by the
+`write_*_to_c.py` export tools.
+
+Both helpers compile with the given C++ compiler and return None when it (or `size`) is
+unavailable or fails, so reports degrade to the Python reference numbers.
+"""
+import os
+import subprocess
+from typing import Optional, Tuple
+
+import numpy as np
+
+EMBEDDED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'embedded')
+
+# Reads n x d float32 features, converts them to the kernel's input (PREPARE), times `PREDICT(x)` in TSC
+# (or CLOCK_MONOTONIC) ticks and nanoseconds, and writes the int32 predictions
+HARNESS = """
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <vector>
+#include "cycle_counter.h"
+%(model)s
+int main(int argc, char** argv) {
+    int n = atoi(argv[3]), d = atoi(argv[4]), reps = atoi(argv[5]);
+    std::vector<float> x((size_t)n * d);
+    FILE* f = fopen(argv[1], "rb");
+    if (!f || fread(x.data(), sizeof(float), x.size(), f) != x.size()) return 1;
+    fclose(f);
+    std::vector<%(input_type)s> input((size_t)n * d);
+    %(prepare)s
+    std::vector<int> pred(n);
+    double best_cycles = 1e300, best_ns = 1e300;
+    for (int trial = 0; trial < 5; trial++) {  // Best of 5 filters out preemption
+        uint64_t c0 = NeuroGait::read_cycle_counter();
+        auto t0 = std::chrono::steady_clock::now();
+        for (int r = 0; r < reps; r++) {
+            for (int i = 0; i < n; i++) pred[i] = %(predict)s(&input[(size_t)i * d]);
+        }
+        double ns = std::chrono::duration<double, std::nano>(std::chrono::steady_clock::now() - t0).count();
+        double cycles = (double)(NeuroGait::read_cycle_counter() - c0);
+        if (cycles < best_cycles) best_cycles = cycles;
+        if (ns < best_ns) best_ns = ns;
+    }
+    printf("%%.2f %%.2f\\n", best_cycles / ((double)n * reps), best_ns / ((double)n * reps));
+    f = fopen(argv[2], "wb");
+    fwrite(pred.data(), sizeof(int), n, f);
+    fclose(f);
+    return 0;
+}
+"""
+
+# PREPARE step for kernels taking the features as they are (float or double)
+COPY_FEATURES = "input.assign(x.begin(), x.end());"
+
+
+def flash_bytes(source: str, predict: str, input_type: str, cxx: str, workdir: str) -> Optional[int]:
+    """text + data of `source` compiled alone with -Os, keeping what a caller of `predict` links in."""
+    src = os.path.join(workdir, 'model_size.cpp')
+    obj = os.path.join(workdir, 'model_size.o')
+    with open(src, 'w') as f:
+        f.write(source)
+        # One external entry point keeps exactly the tables and code reachable from `predict`
+        f.write(f"\nint model_entry({input_type}* x) {{ return {predict}(x); }}\n")
+    try:
+        subprocess.run([cxx, '-Os', '-std=c++11', '-w', '-c', src, '-o', obj], check=True, capture_output=True)
+        out = subprocess.run(['size', obj], check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    text, data = out.splitlines()[1].split()[:2]
+    return int(text) + int(data)
+
+
+def host_benchmark(source: str, predict: str, input_type: str, X: np.ndarray, cxx: str, workdir: str,
+                   prepare: str = COPY_FEATURES, reps: int = 20
+                   ) -> Tuple[Optional[float], Optional[float], Optional[np.ndarray]]:
+    """
+    Compiles `source` with the harness (-O2) and runs `predict` over the rows of `X`.
+
+    Args:
+        source (str): Generated model code defining `int predict(<input_type>* x)`.
+        predict (str): Name of the predict function.
+        input_type (str): C type of the kernel's input array.
+        X (np.ndarray): Features (n x d), passed to the harness as float32.
+        cxx (str): C++ compiler.
+        workdir (str): Scratch directory for sources, binaries and data files.
+        prepare (str): C++ statement filling `input` from the float vector `x`.
+        reps (int): Passes over `X` per timing trial.
+
+    Returns:
+        (cycles/call, ns/call, int32 predictions), or (None, None, None) if compiling or
+        running fails.
+    """
+    src = os.path.join(workdir, f'{predict}_bench.cpp')
+    exe = os.path.join(workdir, f'{predict}_bench')
+    data = os.path.join(workdir, 'features.bin')
+    out = os.path.join(workdir, f'{predict}_pred.bin')
+    with open(src, 'w') as f:
+        f.write(HARNESS % {'model': source, 'input_type': input_type, 'prepare': prepare, 'predict': predict})
+    np.ascontiguousarray(X, dtype=np.float32).tofile(data)
+    try:
+        subprocess.run([cxx, '-O2', '-std=c++11', '-w', '-I', EMBEDDED_DIR, src, '-o', exe],
+                       check=True, capture_output=True)
+        timing = subprocess.run([exe, data, out, str(X.shape[0]), str(X.shape[1]), str(reps)],
+                                check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"  Host benchmark failed: {e}")
+        return None, None, None
+    cycles, ns = (float(v) for v in timing.split())
+    return cycles, ns, np.fromfile(out, dtype=np.int32)
@@ -2,9 +2,12 @@ import os
 import pandas as pd
 import numpy as np
 import logging
-from typing import List, Optional, Dict
+from functools import partial
+from typing import Iterator, List, Optional, Dict, Sequence, Tuple
 
 from .utils import resample_df
+from .circuit_cache import CircuitCache
+from .parallel import process_map
 
 logging.basicConfig(
     level=logging.INFO,
@@ -42,7 +45,11 @@ class Enabl3sDataLoader:
         'Mode': 'Mode'
     }
 
-    def __init__(self, root_path: str, subject_id: str, custom_map: Optional[Dict[str, str]] = None, target_fs: Optional[float] = None):
+    # Gait event columns of the processed ('post') files used for phase labels
+    EVENT_CHANNELS = ('Heel_Strike', 'Toe_Off')
+
+    def __init__(self, root_path: str, subject_id: str, custom_map: Optional[Dict[str, str]] = None, target_fs: Optional[float] = None,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the loader.
 
@@ -50,17 +57,20 @@ class Enabl3sDataLoader:
             root_path (str): Absolute path to the dataset root (e.g., '/data/AB156').
             subject_id (str): Subject identifier (e.g., 'AB156').
             custom_map (dict, optional): Override default channel mapping if necessary.
+            cache_dir (str, optional): Enables the columnar circuit cache in this directory.
         """
         self.root_path = root_path
         self.subject_id = subject_id
         self.channel_map = custom_map if custom_map else self.DEFAULT_CHANNEL_MAP
         self.original_fs = 1000.0 # Hz
         self.target_fs = target_fs
+        self.cache = CircuitCache(cache_dir) if cache_dir else None
     
         # Load Metadata
         metadata_path = os.path.join(self.root_path, self.subject_id, f"{self.subject_id}_Metadata.csv")
         self.metadata = pd.read_csv(metadata_path)
         self.metadata['Filename'] = self.metadata['Filename'].str.strip()
+        self.metadata_index = {row['Filename']: row for row in self.metadata.to_dict('records')}
 
 
     def _get_file_path(self, circuit_id: int, file_type: str = 'raw') -> str:
@@ -77,86 +87,125 @@ class Enabl3sDataLoader:
         
         return os.path.join(self.root_path, self.subject_id, folder_name, filename)
 
-    def load_circuit(self, circuit_id: int, requested_channels: Optional[List[str]] = None, file_type: str = 'raw') -> pd.DataFrame:
+    def load_circuit(self, circuit_id: int, requested_channels: Optional[List[str]] = None, file_type: str = 'raw',
+                     channel_map: Optional[Dict[str, str]] = None) -> pd.DataFrame:
         """
         Loads a single circuit trial from disk with memory optimization.
+        If a cache is configured, repeated loads are served from the columnar cache.
 
         Args:
             circuit_id (int): The circuit number (e.g., 1).
             requested_channels (list): List of abstract names (e.g., ['TA', 'MG']).
                                        If None, loads all columns.
             file_type (str): 'raw' or 'processed'.
+            channel_map (dict, optional): Mapping used for this call instead of the loader's.
 
         Returns:
             pd.DataFrame: Loaded data with normalized column names, or empty DataFrame on failure.
         """
         file_path = self._get_file_path(circuit_id, file_type)
+        channel_map = channel_map or self.channel_map
 
         usecols = None
         valid_keys = []
         
         if requested_channels:
-            valid_keys = [k for k in requested_channels if k in self.channel_map]
-            
-            try:
-                header = pd.read_csv(file_path, nrows=0).columns.tolist()
-                wanted_raw = [self.channel_map[k] for k in valid_keys]
-                usecols = [c for c in wanted_raw if c in header]
-                
-                missing = set(wanted_raw) - set(usecols)
-                if missing:
-                    logger.debug(f"Missing optional columns in {file_path}: {missing}")
-                     
-            except Exception as e:
-                logger.error(f"Failed to read header of {file_path}: {e}")
-                return pd.DataFrame()
+            valid_keys = [k for k in requested_channels if k in channel_map]
+
+        cache_key = None
+        if self.cache is not None:
+            cached_channels = {k: channel_map[k] for k in valid_keys} if requested_channels else None
+            cache_key = self.cache.make_key(file_path, cached_channels)
+            if cache_key:
+                df = self.cache.load(cache_key)
+                if df is not None:
+                    logger.debug(f"Cache hit for {file_path}")
+                    return df
+
+        if requested_channels:
+            # Column pruning happens inside the single parse: no separate header read
+            wanted_raw = [channel_map[k] for k in valid_keys]
+            wanted_set = set(wanted_raw)
+            usecols = lambda col: col in wanted_set
 
         try:
             df = pd.read_csv(file_path, usecols=usecols)
 
-            if not df.empty and isinstance(df.index, pd.RangeIndex):
-                df.index = pd.to_timedelta(df.index / self.original_fs, unit='s')
-            
             if requested_channels:
-                reverse_map = {v: k for k, v in self.channel_map.items() if k in valid_keys}
+                missing = wanted_set - set(df.columns)
+                if missing:
+                    logger.debug(f"Missing optional columns in {file_path}: {missing}")
+
+            if requested_channels:
+                reverse_map = {v: k for k, v in channel_map.items() if k in valid_keys}
                 df.rename(columns=reverse_map, inplace=True)
 
+            if cache_key:
+                self.cache.store(cache_key, df)
+
             return df
+
+        except OSError as e:
+            logger.error(f"Failed to read {file_path}: {e}")
+            return pd.DataFrame()
             
         except ValueError as e:
             logger.error(f"Column mismatch in file {file_path}. Error: {e}")
             return pd.DataFrame()
 
 
-    def load_dataset_batch(self, circuit_range: range, channels: List[str]) -> pd.DataFrame:
+    def iter_circuit_chunks(self, circuit_id: int, chunk_samples: int, requested_channels: Optional[List[str]] = None,
+                            file_type: str = 'raw') -> Iterator[pd.DataFrame]:
+        """
+        Streams a circuit from disk in fixed-size chunks.
+
+        Memory use is bounded by `chunk_samples` whatever the recording length. Chunks keep
+        the global sample index, and pair with `EMGPreprocessor.filter_chunk` for
+        constant-memory filtering. The circuit cache is bypassed.
+
+        Args:
+            circuit_id (int): The circuit number (e.g., 1).
+            chunk_samples (int): Number of samples per chunk (the last one may be shorter).
+            requested_channels (list): List of abstract names (e.g., ['TA', 'MG']).
+                                       If None, loads all columns.
+            file_type (str): 'raw' or 'processed'.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks with normalized column names.
+        """
+        file_path = self._get_file_path(circuit_id, file_type)
+
+        usecols = None
+        reverse_map = {}
+        if requested_channels:
+            valid_keys = [k for k in requested_channels if k in self.channel_map]
+            wanted_set = {self.channel_map[k] for k in valid_keys}
+            usecols = lambda col: col in wanted_set
+            reverse_map = {v: k for k, v in self.channel_map.items() if k in valid_keys}
+
+        with pd.read_csv(file_path, usecols=usecols, chunksize=chunk_samples) as reader:
+            for chunk in reader:
+                if reverse_map:
+                    chunk.rename(columns=reverse_map, inplace=True)
+                yield chunk
+
+    def load_dataset_batch(self, circuit_range: range, channels: List[str], n_workers: Optional[int] = 1) -> pd.DataFrame:
         """
         Loads multiple circuits and concatenates them into a single training set.
         
         Args:
             circuit_range (range): Range of circuits to load (e.g., range(1, 11)).
             channels (list): List of channels to load.
+            n_workers (int, optional): Worker processes for per-circuit loading.
+                                       1 loads serially, None or <= 0 uses all cores.
 
         Returns:
-            pd.DataFrame: Concatenated dataset.
+            pd.DataFrame: Concatenated dataset, circuits in `circuit_range` order.
         """
-        data_frames = []
         logger.info(f"Starting batch load: Circuits {circuit_range.start} to {circuit_range.stop - 1}...")
         
-        for cid in circuit_range:
-            if not self.metadata.empty:
-                df = self.load_calibrated_circuit(cid, requested_channels=channels)
-            else:
-                df = self.load_circuit(cid, requested_channels=channels)
-            
-            if df is not None and not df.empty:
-                df['Circuit_ID'] = cid
-                df = self.add_gait_phase_label(df, circuit_id=cid)
-                if self.target_fs:
-                    df = resample_df(df, self.target_fs, 'Label_Phase')
-
-                data_frames.append(df)
-            else:
-                logger.debug(f"Skipping empty/bad Circuit {cid}")
+        results = process_map(partial(self._load_labeled_circuit, channels=channels), circuit_range, n_workers)
+        data_frames = [df for df in results if df is not None]
         
         if not data_frames:
             logger.error("No data loaded. Check paths or circuit IDs.")
@@ -166,6 +215,24 @@ class Enabl3sDataLoader:
         logger.info(f"Batch load complete. Total Shape: {full_df.shape}")
         return full_df
 
+    def _load_labeled_circuit(self, cid: int, channels: List[str]) -> Optional[pd.DataFrame]:
+        """Loads, calibrates, labels and resamples one circuit. Returns None if unusable."""
+        if not self.metadata.empty:
+            df = self.load_calibrated_circuit(cid, requested_channels=channels)
+        else:
+            df = self.load_circuit(cid, requested_channels=channels)
+        
+        if df is None or df.empty:
+            logger.debug(f"Skipping empty/bad Circuit {cid}")
+            return None
+
+        df['Circuit_ID'] = cid
+        df = self.add_gait_phase_label(df, circuit_id=cid)
+        if self.target_fs:
+            df = resample_df(df, self.target_fs, 'Label_Phase', source_fs=self.original_fs)
+
+        return df
+
     def load_calibrated_circuit(self, circuit_id: int, requested_channels: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Loads a circuit and applies patient-specific calibration (Drift Removal).
@@ -182,12 +249,10 @@ class Enabl3sDataLoader:
         if self.metadata.empty:
             return self.load_circuit(circuit_id, requested_channels)
              
-        meta_row = self.metadata[self.metadata['Filename'] == file_id]
-        if meta_row.empty:
+        meta = self.metadata_index.get(file_id)
+        if meta is None:
             logger.warning(f"No metadata for {file_id}")
             return self.load_circuit(circuit_id, requested_channels)
-            
-        meta = meta_row.iloc[0]
 
         req = set(requested_channels) if requested_channels else set(self.channel_map.keys())
         df = self.load_circuit(circuit_id, list(req))
@@ -227,28 +292,64 @@ class Enabl3sDataLoader:
         Returns:
             Binary labels: 0=Swing, 1=Stance
         """
-        labels = np.zeros(n_samples, dtype=int)
-        
-        events = []
-        for hc in heel_contacts:
-            if not np.isnan(hc) and 0 <= hc < n_samples:
-                events.append((int(hc), 1))  # Stance starts
-        for to in toe_offs:
-            if not np.isnan(to) and 0 <= to < n_samples:
-                events.append((int(to), 0))  # Swing starts
-        
-        events.sort()
-        
-        current_phase = 0
-        for i, (idx, phase) in enumerate(events):
-            if i < len(events) - 1:
-                next_idx = events[i + 1][0]
-                labels[idx:next_idx] = phase
-                current_phase = phase
-            else:
-                labels[idx:] = phase
-        
-        return labels
+        return self.events_to_labels_batch([n_samples], [heel_contacts], [toe_offs])[0]
+
+    @staticmethod
+    def events_to_labels_batch(n_samples: Sequence[int], heel_contacts: Sequence[np.ndarray],
+                               toe_offs: Sequence[np.ndarray]) -> List[np.ndarray]:
+        """
+        Vectorized `_events_to_labels` over several circuits in one pass.
+
+        Events of all circuits are shifted to a common sample axis, sorted once and
+        expanded with `np.repeat`. Each circuit starts with an implicit Swing (0) event
+        so labels never leak across circuit boundaries. At equal indices a Stance event
+        wins over a Swing event, as in the per-circuit definition.
+
+        Args:
+            n_samples: Number of samples of each circuit.
+            heel_contacts: Per-circuit heel contact indices (NaN padding allowed).
+            toe_offs: Per-circuit toe off indices (NaN padding allowed).
+
+        Returns:
+            list: One binary label array (0=Swing, 1=Stance) per circuit.
+        """
+        lengths = np.asarray(n_samples, dtype=np.int64)
+        if lengths.size == 0:
+            return []
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        total = int(lengths.sum())
+
+        # Tie priority at equal indices: circuit start < Swing < Stance (last one wins)
+        idx_parts = [starts]
+        priority_parts = [np.zeros(len(starts), dtype=np.int8)]
+        for start, n, hc, to in zip(starts, lengths, heel_contacts, toe_offs):
+            for events, priority in ((to, 1), (hc, 2)):
+                events = np.asarray(events, dtype=float)
+                # NaN compares False, so this also drops the padding
+                events = events[(events >= 0) & (events < n)].astype(np.int64)
+                idx_parts.append(events + start)
+                priority_parts.append(np.full(len(events), priority, dtype=np.int8))
+
+        idx = np.concatenate(idx_parts)
+        priority = np.concatenate(priority_parts)
+        order = np.lexsort((priority, idx))
+        idx, priority = idx[order], priority[order]
+
+        run_lengths = np.diff(np.append(idx, total))
+        phases = (priority == 2).astype(int)
+        labels = np.repeat(phases, run_lengths)
+
+        return np.split(labels, np.cumsum(lengths)[:-1])
+
+    def _load_gait_events(self, circuit_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """Reads (heel_contacts, toe_offs) from the processed file, or None if unavailable."""
+        # Only the two event columns are parsed from the processed file. A custom map without
+        # event keys falls back to the default ENABL3S column names.
+        event_map = {k: self.channel_map.get(k, self.DEFAULT_CHANNEL_MAP[k]) for k in self.EVENT_CHANNELS}
+        df_events = self.load_circuit(circuit_id, list(self.EVENT_CHANNELS), file_type='post', channel_map=event_map)
+        if df_events.empty or not all(k in df_events.columns for k in self.EVENT_CHANNELS):
+            return None
+        return df_events['Heel_Strike'].values, df_events['Toe_Off'].values
 
     def add_gait_phase_label(self, df: pd.DataFrame, circuit_id: Optional[int] = None) -> pd.DataFrame:
         """
@@ -268,10 +369,9 @@ class Enabl3sDataLoader:
         """
         if circuit_id is not None:
             try:
-                df_processed = self.load_circuit(circuit_id, file_type='post')
-                if not df_processed.empty and 'Right_Heel_Contact' in df_processed.columns and 'Right_Toe_Off' in df_processed.columns:
-                    heel_contacts = df_processed['Right_Heel_Contact'].values
-                    toe_offs = df_processed['Right_Toe_Off'].values
+                events = self._load_gait_events(circuit_id)
+                if events is not None:
+                    heel_contacts, toe_offs = events
                     
                     df['Label_Phase'] = self._events_to_labels(len(df), heel_contacts, toe_offs)
                     method = "Processed Events (Heel Contact + Toe Off)"
@@ -2,7 +2,14 @@
 import numpy as np
 import pandas as pd
 import bisect
-from typing import List, Tuple, Generator, Optional
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Tuple, Generator, Optional, Sequence, Union
+
+from .subject_store import SubjectStore
+from .compact import CompactRecording
+from .features import extract_statistical_features_batch
 
 class SlidingWindowDataset:
     """
@@ -13,7 +20,8 @@ class SlidingWindowDataset:
         data_segments: List[Tuple[np.ndarray, np.ndarray]], 
         window_size_ms: float, 
         step_size_ms: float, 
-        fs: float
+        fs: float,
+        n_channels: Optional[int] = None
     ):
         self.fs = fs
         self.window_samples = int(window_size_ms * fs / 1000)
@@ -21,6 +29,10 @@ class SlidingWindowDataset:
         
         self.segments = []
         self.segment_offsets = [0]
+        # Kept for empty datasets, whose feature matrix still needs its width
+        if n_channels is None and data_segments:
+            n_channels = data_segments[0][0].shape[1]
+        self.n_channels = n_channels
         
         current_offset = 0
         
@@ -37,6 +49,72 @@ class SlidingWindowDataset:
             self.segment_offsets.append(current_offset)
             
         self.total_windows = current_offset
+        self._offsets = np.asarray(self.segment_offsets, dtype=np.int64)
+        self._gather_sources = None
+        self.last_epoch_stats: Optional[Dict[str, float]] = None
+
+    @classmethod
+    def from_store(cls,
+        store_paths: Union[str, Sequence[str]],
+        label_col: str,
+        window_size_ms: float,
+        step_size_ms: float,
+        channels: Optional[Sequence[str]] = None
+    ) -> 'SlidingWindowDataset':
+        """
+        Opens one or more `SubjectStore` directories as a windowed dataset.
+
+        Segments are views into the memory-mapped store arrays and windows are slices of
+        those views, so no signal data is copied and resident memory stays bounded by the
+        pages actually read.
+
+        Args:
+            store_paths: Store directory or list of directories (one per subject).
+            label_col: Label array to use as targets (e.g. 'Mode', 'Phase_Class').
+            window_size_ms: Window size in milliseconds.
+            step_size_ms: Step size for sliding window in milliseconds.
+            channels: Optional channel subset (default: all stored channels).
+        """
+        if isinstance(store_paths, str):
+            store_paths = [store_paths]
+
+        segments = []
+        fs = None
+        for path in store_paths:
+            store = SubjectStore(path)
+            if fs is not None and store.fs != fs:
+                raise ValueError(f"Sampling rate mismatch: {path} is {store.fs} Hz, expected {fs} Hz")
+            fs = store.fs
+            segments.extend(store.segments(label_col, channels))
+
+        if fs is None:
+            raise ValueError("No stores given")
+
+        n_channels = len(channels) if channels is not None else len(store.channels)
+        return SlidingWindowDataset(segments, window_size_ms, step_size_ms, fs, n_channels)
+
+    @classmethod
+    def from_recording(cls,
+        recording: CompactRecording,
+        label_col: str,
+        segment_cols: Sequence[str],
+        window_size_ms: float,
+        step_size_ms: float,
+        fs: float
+    ) -> 'SlidingWindowDataset':
+        """
+        Builds a windowed dataset from a `CompactRecording`.
+
+        Args:
+            recording: Compact float32 / run-length encoded data.
+            label_col: Run-length column to use as targets (e.g. 'Mode', 'Phase_Class').
+            segment_cols: Columns whose changes split segments (e.g. ['Circuit_ID', 'Mode']).
+            window_size_ms: Window size in milliseconds.
+            step_size_ms: Step size for sliding window in milliseconds.
+            fs: Sampling frequency in Hz.
+        """
+        return SlidingWindowDataset(recording.segments(label_col, segment_cols), window_size_ms, step_size_ms, fs,
+                                    len(recording.channels))
 
     def __len__(self):
         return self.total_windows
@@ -57,30 +135,242 @@ class SlidingWindowDataset:
         
         return X_segment[start_sample:end_sample], y_segment[end_sample - 1]
 
-    def batch_generator(self, batch_size: int, shuffle: bool = True) -> Generator[Tuple[np.ndarray, np.ndarray], None, None]:
+    def iter_features(self, feature_fn: Callable[[np.ndarray, int, int], np.ndarray] = extract_statistical_features_batch
+    ) -> Generator[Tuple[np.ndarray, np.ndarray], None, None]:
+        """
+        Yields the (features, labels) of one segment at a time, in dataset index order, so
+        consumers such as `LDAStatistics.from_chunks` never hold the full feature matrix.
+
+        Args:
+            feature_fn: Batch feature function (segment, window_samples, step_samples)
+                        -> (n_windows, n_features). Defaults to MAV/RMS/WL per channel.
+        """
+        for X_segment, y_segment in self.segments:
+            X_part = feature_fn(X_segment, self.window_samples, self.step_samples)
+            label_idx = np.arange(X_part.shape[0]) * self.step_samples + self.window_samples - 1
+            yield X_part, np.asarray(y_segment)[label_idx]
+
+    def extract_features(self, feature_fn: Callable[[np.ndarray, int, int], np.ndarray] = extract_statistical_features_batch
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the feature matrix of every window, one vectorized call per segment.
+
+        Args:
+            feature_fn: Batch feature function (segment, window_samples, step_samples)
+                        -> (n_windows, n_features). Defaults to MAV/RMS/WL per channel.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (Features, Labels) in dataset index order.
+        """
+        X_parts, y_parts = [], []
+        for X_part, y_part in self.iter_features(feature_fn):
+            X_parts.append(X_part)
+            y_parts.append(y_part)
+
+        if not X_parts:
+            # Width of the feature matrix from the feature function itself (0 windows)
+            n_features = feature_fn(np.zeros((0, self.n_channels or 0)), self.window_samples, self.step_samples).shape[1]
+            return np.zeros((0, n_features)), np.zeros(0)
+        return np.concatenate(X_parts), np.concatenate(y_parts)
+
+    @staticmethod
+    def _common_source(arrays: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (source, start_rows) such that arrays[i] == source[start_rows[i]:][:len(arrays[i])].
+
+        When every array is a row slice (all columns) of the same base array (segments
+        cut from one DataFrame column block or one memory-mapped store), the base itself
+        is used and nothing is copied. Otherwise, e.g. for channel subsets, the arrays
+        are concatenated once.
+        """
+        base = arrays[0].base if arrays[0].base is not None else arrays[0]
+        if isinstance(base, np.ndarray) and base.ndim == arrays[0].ndim:
+            starts = []
+            for a in arrays:
+                if a.base is not base and a is not base:
+                    break
+                # Column slices share strides (and maybe the start address) with the base
+                if a.strides != base.strides or a.dtype != base.dtype or a.shape[1:] != base.shape[1:]:
+                    break
+                delta = a.__array_interface__['data'][0] - base.__array_interface__['data'][0]
+                row, rem = divmod(delta, base.strides[0])
+                if rem or row < 0 or row + len(a) > len(base):
+                    break
+                starts.append(row)
+            else:
+                return base, np.asarray(starts, dtype=np.int64)
+
+        lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        return np.concatenate(arrays), starts
+
+    def _sources(self):
+        if self._gather_sources is None:
+            X_source, X_starts = self._common_source([np.asarray(X) for X, _ in self.segments])
+            y_source, y_starts = self._common_source([np.asarray(y) for _, y in self.segments])
+            # Read-only view where row r is the window X_source[r:r + window_samples]
+            X_windows = np.lib.stride_tricks.as_strided(
+                X_source,
+                shape=(len(X_source) - self.window_samples + 1, self.window_samples) + X_source.shape[1:],
+                strides=(X_source.strides[0],) + X_source.strides,
+                writeable=False)
+            self._gather_sources = (X_windows, X_starts, y_source, y_starts)
+        return self._gather_sources
+
+    def gather(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fetches many windows in one vectorized operation.
+
+        Global indices are mapped to (segment, offset) with `searchsorted`, turned into row
+        numbers of a single source array, and all windows are pulled from a strided window
+        view of that array with one fancy index.
+
+        Args:
+            indices: Global window indices.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (Batch x Samples x Channels, Batch) windows and labels.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size and (indices.min() < 0 or indices.max() >= self.total_windows):
+            raise IndexError("Index out of bounds")
+
+        X_windows, X_starts, y_source, y_starts = self._sources()
+        segment_idx = np.searchsorted(self._offsets, indices, side='right') - 1
+        local_start = (indices - self._offsets[segment_idx]) * self.step_samples
+
+        X_batch = X_windows[X_starts[segment_idx] + local_start]
+        y_batch = y_source[y_starts[segment_idx] + local_start + self.window_samples - 1]
+        return X_batch, y_batch
+
+    def batch_generator(self, batch_size: int, shuffle: bool = True, prefetch: int = 0
+    ) -> Generator[Tuple[np.ndarray, np.ndarray], None, None]:
         """
         Yields batches of data as (Batch_Size, Window_Len, Channels).
         Replaces the PyTorch DataLoader.
+
+        Args:
+            batch_size: Windows per batch.
+            shuffle: Shuffle window order once per epoch.
+            prefetch: If > 0, batches are assembled by a background thread into a queue of
+                      at most `prefetch` batches, overlapping assembly with the consumer.
+
+        After a full pass, `last_epoch_stats` holds the window count, elapsed seconds and
+        throughput in windows/sec.
         """
         indices = np.arange(self.total_windows)
         if shuffle:
             np.random.shuffle(indices)
-            
-        for start_idx in range(0, self.total_windows, batch_size):
-            end_idx = min(start_idx + batch_size, self.total_windows)
-            batch_indices = indices[start_idx:end_idx]
-            
-            X_batch = []
-            y_batch = []
-            
-            for idx in batch_indices:
-                X, y = self.__getitem__(idx)
-                X_batch.append(X)
-                y_batch.append(y)
-                
-            yield np.array(X_batch), np.array(y_batch)
+
+        batches = (indices[start:start + batch_size] for start in range(0, self.total_windows, batch_size))
+        t_start = time.perf_counter()
+
+        if prefetch > 0:
+            batch_iter = self._prefetch(batches, prefetch)
+        else:
+            batch_iter = (self.gather(batch_indices) for batch_indices in batches)
+
+        for batch in batch_iter:
+            yield batch
+
+        elapsed = time.perf_counter() - t_start
+        self.last_epoch_stats = {
+            'windows': float(self.total_windows),
+            'seconds': elapsed,
+            'windows_per_sec': self.total_windows / elapsed if elapsed > 0 else float('inf'),
+        }
+
+    def _prefetch(self, batches, depth: int):
+        """Runs `gather` over `batches` in a daemon thread feeding a bounded queue."""
+        buffer = queue.Queue(maxsize=depth)
+        done = object()
+        stop = threading.Event()
+
+        def producer():
+            try:
+                for batch_indices in batches:
+                    if stop.is_set():
+                        return
+                    buffer.put(self.gather(batch_indices))
+                buffer.put(done)
+            except BaseException as e:  # Re-raised in the consumer
+                buffer.put(e)
+
+        thread = threading.Thread(target=producer, daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is done:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Consumer stopped early: unblock and retire the producer
+            stop.set()
+            while thread.is_alive():
+                try:
+                    buffer.get_nowait()
+                except queue.Empty:
+                    thread.join(timeout=0.01)
+
+    def measure_throughput(self, batch_size: int, prefetch: int = 0, shuffle: bool = True) -> float:
+        """Runs one full pass of `batch_generator` and returns windows/sec."""
+        for _ in self.batch_generator(batch_size, shuffle=shuffle, prefetch=prefetch):
+            pass
+        return self.last_epoch_stats['windows_per_sec']
         
 
+def _valid_runs(keys: np.ndarray, invalid: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Splits rows into runs of consecutive equal `keys` and keeps the runs without invalid rows.
+
+    Equivalent to grouping on `(keys != keys.shift()).cumsum()` and dropping groups that
+    contain an invalid row, but done with boundary detection and one cumulative count.
+
+    Args:
+        keys: Per-row run key (mode, label or segment id).
+        invalid: Per-row boolean mask of rows that disqualify their whole run.
+
+    Returns:
+        List[Tuple[int, int]]: (start, stop) row ranges of the kept runs.
+    """
+    n = len(keys)
+    if n == 0:
+        return []
+
+    boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    stops = np.concatenate((boundaries, [n]))
+
+    invalid_count = np.concatenate(([0], np.cumsum(invalid, dtype=np.int64)))
+    keep = invalid_count[stops] == invalid_count[starts]
+    return list(zip(starts[keep].tolist(), stops[keep].tolist()))
+
+
+def _run_ids(df: pd.DataFrame, cols: Sequence[str]) -> np.ndarray:
+    """Integer id per row that changes whenever any of `cols` changes (no per-row strings)."""
+    changed = np.zeros(len(df), dtype=bool)
+    for col in cols:
+        values = df[col].to_numpy()
+        changed[1:] |= values[1:] != values[:-1]
+    return np.cumsum(changed, dtype=np.int64)
+
+
+def _feature_matrix(df: pd.DataFrame, feature_cols: List[str]) -> np.ndarray:
+    """Row-major (Samples x Channels) array of the feature columns, copied once."""
+    return np.ascontiguousarray(df[feature_cols].to_numpy())
+
+
+def _nan_rows(values: np.ndarray) -> np.ndarray:
+    """Boolean mask of rows containing a NaN (all False for non-float arrays)."""
+    if values.dtype.kind not in 'fc':
+        return np.zeros(len(values), dtype=bool)
+    mask = np.isnan(values)
+    return mask.any(axis=1) if mask.ndim > 1 else mask
+
+
 class MovementModeDataset(SlidingWindowDataset):
     """
     Extracts specific movement modes (e.g., Walking) from raw DataFrames
@@ -95,22 +385,17 @@ class MovementModeDataset(SlidingWindowDataset):
         step_size_ms: float = 100.0,
         fs: float = 500.0
     ):
-        processed_segments = []
+        # Segments are row slices (views) of these arrays
+        X_all = _feature_matrix(df, feature_cols)
+        y_all = df[label_col].to_numpy()
+        mode = df['Mode'].to_numpy()
 
-        df_ops = df.copy()
-        df_ops['group_id'] = (df_ops['Mode'] != df_ops['Mode'].shift()).cumsum()
+        # Runs of the target mode; other modes count as invalid so their runs are dropped
+        invalid = _nan_rows(X_all) | (mode != target_mode)
+        processed_segments = [(X_all[start:stop], y_all[start:stop])
+                              for start, stop in _valid_runs(mode, invalid)]
         
-        mode_df = df_ops[df_ops['Mode'] == target_mode]
-        
-        for _, group in mode_df.groupby('group_id'):
-            
-            X = group[feature_cols].values
-            y = group[label_col].values
-            
-            if len(X) > 0 and not np.isnan(X).any():
-                processed_segments.append((X, y))
-        
-        super().__init__(processed_segments, window_size_ms, step_size_ms, fs)
+        super().__init__(processed_segments, window_size_ms, step_size_ms, fs, len(feature_cols))
 
 
 class MultiModeDataset(SlidingWindowDataset):
@@ -122,6 +407,8 @@ class MultiModeDataset(SlidingWindowDataset):
         df: DataFrame containing EMG data and Mode labels
         feature_cols: List of EMG channel names to use as features (e.g., ['TA', 'MG', 'RF'])
         label_col: Column name containing mode labels (e.g., 'Mode')
+        group_col: Column, or list of columns, whose changes split segments
+                   (e.g., ['Circuit_ID', 'Mode']); defaults to label_col
         window_size_ms: Window size in milliseconds
         step_size_ms: Step size for sliding window in milliseconds
         fs: Sampling frequency in Hz
@@ -130,30 +417,27 @@ class MultiModeDataset(SlidingWindowDataset):
         df: pd.DataFrame, 
         feature_cols: List[str], 
         label_col: str,
-        group_col: Optional[str] = None,
+        group_col: Optional[Union[str, Sequence[str]]] = None,
         window_size_ms: float = 200.0,
         step_size_ms: float = 50.0,
         fs: float = 250.0
     ):
-        processed_segments = []
-
         # Create segments based on group_col if provided, else label_col
         # We need to ensure we split on changes in this column
         segment_key = group_col if group_col else label_col
+        if isinstance(segment_key, str):
+            keys = df[segment_key].to_numpy()
+        else:
+            keys = _run_ids(df, segment_key)
+
+        # Features (EMG channels only) and labels; segments are row slices (views) of these
+        X_all = _feature_matrix(df, feature_cols)
+        y_all = df[label_col].to_numpy()
+
+        # Only keep continuous segments with valid data
+        invalid = _nan_rows(X_all) | _nan_rows(y_all)
+        processed_segments = [(X_all[start:stop], y_all[start:stop])
+                              for start, stop in _valid_runs(keys, invalid)]
         
-        df_ops = df.copy()
-        df_ops['group_id'] = (df_ops[segment_key] != df_ops[segment_key].shift()).cumsum()
-        
-        # Process each continuous mode segment
-        for _, group in df_ops.groupby('group_id'):
-            # Extract features (EMG channels only)
-            X = group[feature_cols].values
-            # Extract labels (Mode)
-            y = group[label_col].values
-            
-            # Only add segments with valid data
-            if len(X) > 0 and not np.isnan(X).any() and not np.isnan(y).any():
-                processed_segments.append((X, y))
-        
-        super().__init__(processed_segments, window_size_ms, step_size_ms, fs)
+        super().__init__(processed_segments, window_size_ms, step_size_ms, fs, len(feature_cols))
             
\ No newline at end of file
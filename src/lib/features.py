@@ -54,6 +54,78 @@ def extract_statistical_features(window):
     return np.array(features)
 
 
+def feature_prefix_sums(signal):
+    """Cumulative sums behind `extract_statistical_features_batch`, shared by every window/step.
+
+    Args:
+        signal: 2D numpy array of shape (n_samples, n_channels)
+    Returns:
+        3D numpy array of shape (3, n_samples + 1, n_channels): cumulative sums of |x|,
+        x^2 and |diff(x)|, each with a leading zero row (the |diff(x)| sums end one row
+        early and repeat their last value, so all three have the same length).
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    n_samples, n_channels = signal.shape
+    sums = np.zeros((3, n_samples + 1, n_channels))
+    np.cumsum(np.abs(signal), axis=0, out=sums[0, 1:])
+    np.cumsum(signal ** 2, axis=0, out=sums[1, 1:])
+    if n_samples > 1:
+        np.cumsum(np.abs(np.diff(signal, axis=0)), axis=0, out=sums[2, 1:n_samples])
+        sums[2, n_samples] = sums[2, n_samples - 1]
+    return sums
+
+
+def features_from_prefix_sums(sums, window_samples, step_samples):
+    """MAV, RMS and WL of every sliding window, read from `feature_prefix_sums` output.
+
+    Args:
+        sums: Array of shape (3, n_samples + 1, n_channels) from `feature_prefix_sums`
+        window_samples: Window length in samples
+        step_samples: Stride between window starts in samples
+    Returns:
+        2D numpy array: Feature matrix of shape (n_windows, n_channels * 3)
+    """
+    n_samples, n_channels = sums.shape[1] - 1, sums.shape[2]
+    n_windows = (n_samples - window_samples) // step_samples + 1
+    if window_samples <= 0 or n_windows <= 0:
+        return np.zeros((0, n_channels * 3))
+
+    cs_abs, cs_sq, cs_wl = sums
+    starts = np.arange(n_windows) * step_samples
+    ends = starts + window_samples
+
+    mav = (cs_abs[ends] - cs_abs[starts]) / window_samples
+    # Clamp tiny negative rounding residue before the square root
+    rms = np.sqrt(np.maximum(cs_sq[ends] - cs_sq[starts], 0.0) / window_samples)
+    wl = cs_wl[ends - 1] - cs_wl[starts]
+
+    return np.stack((mav, rms, wl), axis=2).reshape(n_windows, n_channels * 3)
+
+
+def extract_statistical_features_batch(signal, window_samples, step_samples):
+    """Extract MAV, RMS, and WL features for every sliding window of a segment at once.
+
+    Equivalent to calling `extract_statistical_features` on
+    signal[i*step : i*step + window] for each window i, but computed in one pass
+    from cumulative sums of |x|, x^2 and |diff(x)|, so the cost is O(n_samples)
+    regardless of window overlap.
+    Args:
+        signal: 2D numpy array of shape (n_samples, n_channels)
+        window_samples: Window length in samples
+        step_samples: Stride between window starts in samples
+    Returns:
+        2D numpy array: Feature matrix of shape (n_windows, n_channels * 3),
+                        rows ordered like `extract_statistical_features`
+                        ([ch0_MAV, ch0_RMS, ch0_WL, ch1_MAV, ...]).
+    """
+    signal = np.asarray(signal, dtype=np.float64)
+    n_samples, n_channels = signal.shape
+    n_windows = (n_samples - window_samples) // step_samples + 1
+    if window_samples <= 0 or n_windows <= 0:
+        return np.zeros((0, n_channels * 3))
+    return features_from_prefix_sums(feature_prefix_sums(signal), window_samples, step_samples)
+
+
 def sum_channels(window):
     """Sum EMG signals across all channels to create a single channel.
     This preprocessing step reduces multi-channel EMG to a single channel
@@ -65,4 +137,103 @@ def sum_channels(window):
     Returns:
         1D numpy array: Summed signal of shape (n_samples,)
     """
-    return np.sum(window, axis=1)
\ No newline at end of file
+    return np.sum(window, axis=1)
+
+class StreamingFeatureExtractor:
+    """Online MAV, RMS and WL over several trailing windows at once.
+
+    Mirrors the firmware inference loop: samples are pushed one at a time and
+    running sums of |x|, x^2 and |x[t] - x[t-1]| are kept per channel and per
+    window length. Each push adds the newest sample and subtracts the one that
+    left each window, so it costs O(n_windows * n_channels) regardless of the
+    window lengths, and features are available at any tick without rescanning.
+
+    Running sums are recomputed from the ring buffer every `resync_interval`
+    pushes to bound floating point drift on long streams.
+    Args:
+        n_channels: Number of channels per sample
+        window_lengths: Window lengths in samples (e.g. [500, 50])
+        resync_interval: Pushes between exact recomputations (0 disables)
+    """
+
+    def __init__(self, n_channels, window_lengths, resync_interval=10000):
+        self.n_channels = n_channels
+        self.window_lengths = [int(w) for w in window_lengths]
+        if min(self.window_lengths) < 1:
+            raise ValueError("Window lengths must be >= 1")
+        self.resync_interval = resync_interval
+
+        # One extra slot keeps the sample just before the longest window
+        self._capacity = max(self.window_lengths) + 1
+        self._lengths = np.array(self.window_lengths)
+        self.reset()
+
+    def reset(self):
+        """Clears the buffer and all running sums."""
+        self._buffer = np.zeros((self._capacity, self.n_channels))
+        self._head = 0  # Next write position
+        self.n_samples = 0
+        # Running sums [|x|, x^2, |dx|] per window and channel
+        self._sums = np.zeros((3, len(self.window_lengths), self.n_channels))
+
+    def push(self, sample):
+        """Adds one sample (array of n_channels values) and updates every window."""
+        x = np.asarray(sample, dtype=np.float64)
+        prev = self._buffer[self._head - 1] if self.n_samples > 0 else x
+        self._buffer[self._head] = x
+
+        # Sample leaving each window, and its successor (the diff that leaves with it).
+        # The extra buffer slot keeps both valid for the longest window.
+        leaving_idx = (self._head - self._lengths) % self._capacity
+        leaving = self._buffer[leaving_idx]
+        successor = self._buffer[(leaving_idx + 1) % self._capacity]
+
+        entering = np.stack((np.abs(x), x * x, np.abs(x - prev)))
+        exiting = np.stack((np.abs(leaving), leaving * leaving, np.abs(successor - leaving)))
+        if self.n_samples < self._capacity - 1:
+            # Warm-up: only windows that were already full drop a sample
+            exiting *= (self.n_samples >= self._lengths)[np.newaxis, :, np.newaxis]
+
+        self._sums += entering[:, np.newaxis, :] - exiting
+        self._head = (self._head + 1) % self._capacity
+        self.n_samples += 1
+
+        if self.resync_interval and self.n_samples % self.resync_interval == 0:
+            self.resync()
+
+    def resync(self):
+        """Recomputes all running sums exactly from the ring buffer."""
+        for k, length in enumerate(self.window_lengths):
+            window = self._window(length)
+            self._sums[0, k] = np.sum(np.abs(window), axis=0)
+            self._sums[1, k] = np.sum(window ** 2, axis=0)
+            self._sums[2, k] = np.sum(np.abs(np.diff(window, axis=0)), axis=0)
+
+    def _window(self, length):
+        """Returns the last min(length, n_samples) samples in time order."""
+        n = min(length, self.n_samples)
+        idx = (self._head - n + np.arange(n)) % self._capacity
+        return self._buffer[idx]
+
+    def is_ready(self, window_length):
+        """True once `window_length` samples have been pushed."""
+        return self.n_samples >= window_length
+
+    def features(self, window_length):
+        """Feature vector of the trailing window, ordered like `extract_statistical_features`.
+
+        Before the window has filled, features cover the samples pushed so far.
+        Args:
+            window_length: One of the configured window lengths
+        Returns:
+            1D numpy array: [ch0_MAV, ch0_RMS, ch0_WL, ch1_MAV, ...]
+        """
+        k = self.window_lengths.index(window_length)
+        n = min(window_length, self.n_samples)
+        if n == 0:
+            return np.zeros(self.n_channels * 3)
+
+        mav = self._sums[0, k] / n
+        rms = np.sqrt(np.maximum(self._sums[1, k], 0.0) / n)
+        wl = np.maximum(self._sums[2, k], 0.0)
+        return np.stack((mav, rms, wl), axis=1).reshape(-1)
@@ -0,0 +1,154 @@
+"""
+ctypes bindings of the firmware chain (embedded/neurogait_api.h).
+
+Build the library with `make lib` in embedded/ (add FIXED_POINT=1 for the Q15 chain).
+Every call runs the device C++ code from reset state over a whole recording, so
+replaying a circuit takes milliseconds instead of its recording time.
+"""
+import ctypes
+import os
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'embedded', 'libneurogait.so')
+API_VERSION = 1
+
+_floats = np.ctypeslib.ndpointer(dtype=np.float32, flags='C_CONTIGUOUS')
+_int32s = np.ctypeslib.ndpointer(dtype=np.int32, flags='C_CONTIGUOUS')
+_uint8s = np.ctypeslib.ndpointer(dtype=np.uint8, flags='C_CONTIGUOUS')
+
+
+class _OptionalFloats:
+    """ctypes argtype accepting a float32 array or None (NULL)."""
+
+    @classmethod
+    def from_param(cls, value):
+        if value is None:
+            return None
+        return _floats.from_param(value)
+
+
+class FirmwareReplay(NamedTuple):
+    """Outputs of `FirmwareLibrary.replay`. Per-tick arrays share the first axis."""
+    filtered: np.ndarray          # (n_samples, n_channels) conditioned signal
+    tick_index: np.ndarray        # (n_ticks,) sample index of each inference tick
+    context_features: np.ndarray  # (n_ticks, n_features) walking mode window
+    phase_features: np.ndarray    # (n_ticks, n_features) gait phase window
+    mode: np.ndarray              # (n_ticks,) walking mode decision
+    phase: np.ndarray             # (n_ticks,) gait phase decision (0 unless walking)
+    stimulating: np.ndarray       # (n_ticks,) bool, StimulationController output
+
+
+class FirmwareLibrary:
+    """
+    Host build of the firmware pipeline (SignalConditioner, RunningFeatureExtractor, both
+    LDA layers, StimulationController) with a batch interface.
+
+    Inputs are (n_samples, n_channels) arrays of decimated (250 Hz) EMG in input units,
+    channels in firmware order (TA, MG).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str, optional): Shared library path. Defaults to embedded/libneurogait.so.
+
+        Raises:
+            FileNotFoundError: If the library has not been built.
+        """
+        path = os.path.abspath(path or DEFAULT_LIBRARY)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found: build it with 'make lib' in embedded/")
+
+        lib = ctypes.CDLL(path)
+        if lib.ng_api_version() != API_VERSION:
+            raise RuntimeError(f"{path}: API version {lib.ng_api_version()}, expected {API_VERSION}")
+
+        lib.ng_filter.argtypes = [_floats, ctypes.c_int, _floats]
+        lib.ng_filter.restype = None
+        lib.ng_replay.argtypes = [_floats, ctypes.c_int, _OptionalFloats, _int32s,
+                                  _OptionalFloats, _OptionalFloats, _int32s, _int32s, _uint8s]
+        lib.ng_replay.restype = ctypes.c_int
+        for name in ('ng_predict_walking_mode', 'ng_predict_gait_phase'):
+            getattr(lib, name).argtypes = [_floats, ctypes.c_int, _int32s]
+            getattr(lib, name).restype = None
+
+        self.path = path
+        self._lib = lib
+        self.fixed_point = bool(lib.ng_fixed_point())
+        self.n_channels = lib.ng_num_channels()
+        self.n_features = lib.ng_feature_count()
+        self.context_window = lib.ng_context_window()
+        self.inference_period = lib.ng_inference_period()
+
+    def _samples(self, samples: np.ndarray) -> np.ndarray:
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        if samples.ndim != 2 or samples.shape[1] != self.n_channels:
+            raise ValueError(f"Expected samples of shape (n, {self.n_channels}), got {samples.shape}")
+        return samples
+
+    def _features(self, features: np.ndarray) -> np.ndarray:
+        features = np.ascontiguousarray(np.atleast_2d(features), dtype=np.float32)
+        if features.shape[1] != self.n_features:
+            raise ValueError(f"Expected features of shape (n, {self.n_features}), got {features.shape}")
+        return features
+
+    def filter(self, samples: np.ndarray) -> np.ndarray:
+        """Runs the firmware SignalConditioner over each channel."""
+        samples = self._samples(samples)
+        filtered = np.empty_like(samples)
+        self._lib.ng_filter(samples, len(samples), filtered)
+        return filtered
+
+    def replay(self, samples: np.ndarray, keep_filtered: bool = True, keep_features: bool = True) -> FirmwareReplay:
+        """
+        Replays a recording through the full chain, exactly as the device loop would.
+
+        Args:
+            samples (np.ndarray): (n_samples, n_channels) decimated EMG.
+            keep_filtered (bool): Also return the conditioned signal (else an empty array).
+            keep_features (bool): Also return the per-tick features (else empty arrays).
+
+        Returns:
+            FirmwareReplay: Per-sample and per-tick outputs.
+        """
+        samples = self._samples(samples)
+        n = len(samples)
+        max_ticks = self._lib.ng_max_ticks(n)
+
+        filtered = np.empty_like(samples) if keep_filtered else None
+        context = np.empty((max_ticks, self.n_features), dtype=np.float32) if keep_features else None
+        phase_features = np.empty_like(context) if keep_features else None
+        tick_index = np.empty(max_ticks, dtype=np.int32)
+        mode = np.empty(max_ticks, dtype=np.int32)
+        phase = np.empty(max_ticks, dtype=np.int32)
+        stimulating = np.empty(max_ticks, dtype=np.uint8)
+
+        ticks = self._lib.ng_replay(samples, n, filtered, tick_index, context, phase_features,
+                                    mode, phase, stimulating)
+
+        empty = np.zeros((0, self.n_features), dtype=np.float32)
+        return FirmwareReplay(
+            filtered=filtered if keep_filtered else np.zeros((0, self.n_channels), dtype=np.float32),
+            tick_index=tick_index[:ticks],
+            context_features=context[:ticks] if keep_features else empty,
+            phase_features=phase_features[:ticks] if keep_features else empty,
+            mode=mode[:ticks],
+            phase=phase[:ticks],
+            stimulating=stimulating[:ticks].astype(bool),
+        )
+
+    def predict_walking_mode(self, features: np.ndarray) -> np.ndarray:
+        """Firmware float walking mode LDA over (n, n_features) context features."""
+        features = self._features(features)
+        out = np.empty(len(features), dtype=np.int32)
+        self._lib.ng_predict_walking_mode(features, len(features), out)
+        return out
+
+    def predict_gait_phase(self, features: np.ndarray) -> np.ndarray:
+        """Firmware float gait phase LDA over (n, n_features) phase features."""
+        features = self._features(features)
+        out = np.empty(len(features), dtype=np.int32)
+        self._lib.ng_predict_gait_phase(features, len(features), out)
+        return out
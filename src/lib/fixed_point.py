@@ -0,0 +1,426 @@
+"""
+Bit-exact Python reference of the firmware's fixed-point (Q15) signal chain.
+
+Mirrors embedded/fixed_point.h, `SignalConditionerQ15`, `RunningFeatureExtractorQ15`
+and the quantized LDA scorers, so the accuracy cost of the integer build can be measured
+offline on ENABL3S without running the firmware.
+"""
+import numpy as np
+from typing import Optional, Sequence, Tuple
+
+Q15_SHIFT = 15   # Samples and MAV/RMS: 1.0 == full scale
+COEF_SHIFT = 14  # Biquad coefficients (Q2.14)
+Q15_MAX = 32767
+INT32_MAX = 2**31 - 1
+
+# Float coefficients of embedded/signal_conditioner.cpp as (b0, b1, b2, a1, a2)
+FIRMWARE_BANDPASS = (0.66245985, 0.0, -0.66245985, 0.23261682, -0.32491970)
+FIRMWARE_NOTCH = (0.97448228, 0.0, 0.97448228, 0.0, 0.94896457)
+
+
+def to_q15(x: np.ndarray, full_scale: float = 1.0) -> np.ndarray:
+    """
+    Converts float samples to Q15 exactly like `float_to_q15` (float32 multiply,
+    round half to even, saturation).
+
+    Args:
+        x (np.ndarray): Samples in input units.
+        full_scale (float): Input amplitude mapped to Q15 1.0 (NEUROGAIT_EMG_FULL_SCALE).
+
+    Returns:
+        np.ndarray: int16 samples.
+    """
+    scale = np.float32(32768.0) / np.float32(full_scale)
+    scaled = np.asarray(x, dtype=np.float32) * scale
+    return np.clip(np.rint(scaled), -32768, Q15_MAX).astype(np.int16)
+
+
+def from_q15(x: np.ndarray, full_scale: float = 1.0) -> np.ndarray:
+    """Converts Q15 integers (samples or MAV/RMS/WL features) back to input units."""
+    return np.asarray(x, dtype=np.float64) * (full_scale / 32768.0)
+
+
+def quantize_biquad(coefficients: Sequence[float]) -> Tuple[int, ...]:
+    """
+    Rounds (b0, b1, b2, a1, a2) to Q14 and checks the 32-bit accumulator headroom.
+
+    Raises:
+        ValueError: If a coefficient does not fit in int16 or sum(|coef|) >= 4, in which
+                    case the DF1 accumulator could overflow int32.
+    """
+    quantized = tuple(int(round(c * (1 << COEF_SHIFT))) for c in coefficients)
+    if any(abs(q) > Q15_MAX for q in quantized):
+        raise ValueError(f"Coefficient out of Q2.14 range: {coefficients}")
+    if sum(abs(q) for q in quantized) * 32768 > INT32_MAX:
+        raise ValueError(f"Biquad gain too large for a 32-bit accumulator: {coefficients}")
+    return quantized
+
+
+def biquad_q15(x: np.ndarray, coefficients: Tuple[int, ...]) -> np.ndarray:
+    """
+    Reference of `BiquadQ15::process` over a whole signal (Direct Form I, zero state).
+
+    Args:
+        x (np.ndarray): int16 samples.
+        coefficients (tuple): Q14 (b0, b1, b2, a1, a2) from `quantize_biquad`.
+
+    Returns:
+        np.ndarray: int16 filtered samples.
+    """
+    b0, b1, b2, a1, a2 = coefficients
+    rounding = 1 << (COEF_SHIFT - 1)
+    out = np.empty(len(x), dtype=np.int16)
+    x1 = x2 = y1 = y2 = 0
+    # The recurrence rounds every output, so it cannot be vectorized; plain ints keep it fast
+    for n, xn in enumerate(x.tolist()):
+        acc = b0 * xn + b1 * x1 + b2 * x2 - a1 * y1 - a2 * y2
+        y = (acc + rounding) >> COEF_SHIFT
+        y = -32768 if y < -32768 else (Q15_MAX if y > Q15_MAX else y)
+        out[n] = y
+        x2, x1 = x1, xn
+        y2, y1 = y1, y
+    return out
+
+
+def condition_q15(x: np.ndarray) -> np.ndarray:
+    """
+    Reference of `SignalConditionerQ15::filter` (bandpass then notch).
+
+    Args:
+        x (np.ndarray): int16 samples of one channel, shape (n_samples,).
+    """
+    bandpass = quantize_biquad(FIRMWARE_BANDPASS)
+    notch = quantize_biquad(FIRMWARE_NOTCH)
+    return biquad_q15(biquad_q15(x, bandpass), notch)
+
+
+def isqrt(values: np.ndarray) -> np.ndarray:
+    """Vectorized floor(sqrt(x)) for non-negative integers below 2^52, same as `isqrt32`."""
+    values = np.asarray(values, dtype=np.int64)
+    root = np.floor(np.sqrt(values.astype(np.float64))).astype(np.int64)
+    # Float sqrt can be off by one around perfect squares
+    root -= (root * root > values)
+    root += ((root + 1) * (root + 1) <= values)
+    return root
+
+
+def running_features_q15(samples: np.ndarray, window_len: int, ticks: np.ndarray) -> np.ndarray:
+    """
+    Reference of `RunningFeatureExtractorQ15` features read at the given sample indices.
+
+    The window at tick t is the last min(t + 1, window_len) samples ending at t. WL sums
+    |r[j] - r[j-1]| over the window with r[-1] = 0. Integer sums are exact, so prefix sums
+    reproduce the firmware's running accumulators.
+
+    Args:
+        samples (np.ndarray): int16 filtered samples, shape (n_samples, n_channels).
+        window_len (int): CONTEXT_WINDOW or PHASE_WINDOW.
+        ticks (np.ndarray): Indices of the newest sample at each inference tick.
+
+    Returns:
+        np.ndarray: int64 features (n_ticks, n_channels * 3) ordered [MAV, RMS, WL] per channel.
+    """
+    rect = np.abs(samples.astype(np.int64))
+    prev = np.vstack([np.zeros((1, rect.shape[1]), dtype=np.int64), rect[:-1]])
+    zero = np.zeros((1, rect.shape[1]), dtype=np.int64)
+    cs_abs = np.vstack([zero, np.cumsum(rect, axis=0)])
+    cs_sq = np.vstack([zero, np.cumsum(rect * rect, axis=0)])
+    cs_wl = np.vstack([zero, np.cumsum(np.abs(rect - prev), axis=0)])
+
+    ticks = np.asarray(ticks, dtype=np.int64)
+    stop = ticks + 1
+    start = np.maximum(stop - window_len, 0)
+    n = (stop - start)[:, None]
+
+    mav = (cs_abs[stop] - cs_abs[start]) // n
+    rms = isqrt((cs_sq[stop] - cs_sq[start]) // n)
+    wl = cs_wl[stop] - cs_wl[start]
+    return np.stack([mav, rms, wl], axis=2).reshape(len(ticks), -1)
+
+
+def feature_shifts(window_len: int, n_channels: int) -> np.ndarray:
+    """
+    Right shifts bringing each feature of a window into 15 bits before the LDA.
+
+    MAV and RMS are already Q15. WL can reach window_len * 32768, so it is shifted by the
+    smallest amount that keeps that worst case at or below 32767.
+    """
+    wl_shift = 0
+    while (window_len * 32768) >> wl_shift > Q15_MAX:
+        wl_shift += 1
+    return np.tile([0, 0, wl_shift], n_channels).astype(np.int64)
+
+
+def feature_exponents(X: np.ndarray, bits: int = 16, headroom_bits: int = 1) -> np.ndarray:
+    """
+    Per-feature power-of-two scales for float features that have no fixed-point format of
+    their own (e.g. features computed offline in input units).
+
+    Feature i is stored as round(x_i * 2^e_i) in a `bits`-bit integer. e_i is the largest
+    exponent that maps max|x_i| over the calibration set to the integer range with
+    `headroom_bits` to spare; values beyond that saturate.
+
+    Args:
+        X (np.ndarray): Calibration features (n_samples, n_features), typically the training set.
+        bits (int): 16 or 8.
+        headroom_bits (int): Margin for inputs larger than any calibration value.
+
+    Returns:
+        np.ndarray: int64 exponents (n_features,).
+    """
+    limit = 2 ** (bits - 1) - 1
+    largest = np.maximum(np.max(np.abs(np.asarray(X, dtype=np.float64)), axis=0), 1e-30)
+    return (np.floor(np.log2(limit / largest)) - headroom_bits).astype(np.int64)
+
+
+def quantize_features(X: np.ndarray, exponents: np.ndarray, bits: int = 16) -> np.ndarray:
+    """
+    Scales float features by 2^exponents, rounds half to even and saturates to `bits` bits,
+    the same float32 arithmetic as the generated `quantize_<prefix>_features`.
+
+    Returns:
+        np.ndarray: int64 features in the signed `bits`-bit range.
+    """
+    limit = 2 ** (bits - 1) - 1
+    scaled = np.ldexp(np.asarray(X, dtype=np.float32), np.asarray(exponents, dtype=np.int32))
+    return np.clip(np.rint(scaled), -limit - 1, limit).astype(np.int64)
+
+
+def _quantize_rows(effective: np.ndarray, intercept: np.ndarray, weight_limit: int,
+                   input_limit: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Rounds each row of integer-input weights to `weight_limit` with its own power-of-two
+    exponent, lowering the exponent until |intercept| + input_limit * sum|w| fits in int32.
+    """
+    weights = np.zeros(effective.shape, dtype=np.int64)
+    intercepts = np.zeros(len(intercept), dtype=np.int64)
+    exponents = np.zeros(len(intercept), dtype=np.int64)
+    for c in range(len(intercept)):
+        largest = max(np.max(np.abs(effective[c])), 1e-30)
+        exponent = int(np.floor(np.log2(weight_limit / largest)))
+        while True:
+            w_q = np.round(effective[c] * 2.0 ** exponent).astype(np.int64)
+            b_q = int(round(intercept[c] * 2.0 ** exponent))
+            fits = np.all(np.abs(w_q) <= weight_limit)
+            if fits and abs(b_q) + input_limit * int(np.sum(np.abs(w_q))) <= INT32_MAX:
+                break
+            exponent -= 1
+        weights[c], intercepts[c], exponents[c] = w_q, b_q, exponent
+    return weights, intercepts, exponents
+
+
+class QuantizedLDA:
+    """
+    Integer LDA scorer matching `lda_score_q15` in the firmware.
+
+    Each class score is intercept + sum(w_i * g_i) with int16 (or int8) weights and
+    g_i = min(F_i >> shift_i, 32767) computed from the Q15 features. Every class has its
+    own power-of-two scale 2^exponent; scores are aligned to the smallest exponent with an
+    arithmetic right shift before they are compared. Binary models have a single score
+    whose sign picks the class, as in sklearn.
+
+    Models built with `from_float_features` take float features instead: they are scaled by
+    per-feature powers of two (`feature_exponents`) into int16/int8 before the same scorer,
+    with all shifts zero.
+    """
+
+    def __init__(self, weights: np.ndarray, intercepts: np.ndarray, exponents: np.ndarray,
+                 shifts: np.ndarray, classes: np.ndarray, weight_bits: int = 16,
+                 feature_exponents: Optional[np.ndarray] = None, feature_bits: int = 16):
+        self.weights = np.asarray(weights, dtype=np.int64)       # (n_rows, n_features), weight_bits range
+        self.intercepts = np.asarray(intercepts, dtype=np.int64)  # (n_rows,), int32 range
+        self.exponents = np.asarray(exponents, dtype=np.int64)    # (n_rows,)
+        self.shifts = np.asarray(shifts, dtype=np.int64)          # (n_features,)
+        self.classes = np.asarray(classes)
+        self.weight_bits = weight_bits
+        self.feature_exponents = (None if feature_exponents is None
+                                  else np.asarray(feature_exponents, dtype=np.int64))
+        self.feature_bits = feature_bits
+
+    @classmethod
+    def from_float(cls, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray,
+                   shifts: np.ndarray, full_scale: float = 1.0, weight_bits: int = 16) -> 'QuantizedLDA':
+        """
+        Quantizes a float LDA (sklearn `coef_`, `intercept_`, `classes_`) trained on features
+        in input units.
+
+        Args:
+            coef (np.ndarray): (n_rows, n_features) weights.
+            intercept (np.ndarray): (n_rows,) intercepts.
+            classes (np.ndarray): Class labels.
+            shifts (np.ndarray): Per-feature shifts from `feature_shifts`.
+            full_scale (float): Input amplitude mapped to Q15 1.0.
+            weight_bits (int): 16 (firmware `lda_score_q15`) or 8.
+        """
+        coef = np.atleast_2d(np.asarray(coef, dtype=np.float64))
+        intercept = np.atleast_1d(np.asarray(intercept, dtype=np.float64))
+        shifts = np.asarray(shifts, dtype=np.int64)
+        # Weights acting on the shifted integer features g_i instead of the float features
+        effective = coef * (2.0 ** shifts) * (full_scale / 32768.0)
+        weights, intercepts, exponents = _quantize_rows(effective, intercept, 2 ** (weight_bits - 1) - 1, Q15_MAX)
+        return cls(weights, intercepts, exponents, shifts, classes, weight_bits)
+
+    @classmethod
+    def from_float_features(cls, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray,
+                            X_calibration: np.ndarray, weight_bits: int = 16,
+                            feature_bits: int = 16) -> 'QuantizedLDA':
+        """
+        Quantizes a float LDA for float features of arbitrary range (the `write_lda_to_c.py`
+        export), calibrating one power-of-two scale per feature on `X_calibration`.
+
+        Args:
+            coef (np.ndarray): (n_rows, n_features) weights.
+            intercept (np.ndarray): (n_rows,) intercepts.
+            classes (np.ndarray): Class labels.
+            X_calibration (np.ndarray): Features whose range fixes the feature scales.
+            weight_bits (int): 16 or 8.
+            feature_bits (int): 16 or 8.
+        """
+        coef = np.atleast_2d(np.asarray(coef, dtype=np.float64))
+        intercept = np.atleast_1d(np.asarray(intercept, dtype=np.float64))
+        f_exp = feature_exponents(X_calibration, feature_bits)
+        effective = coef * 2.0 ** -f_exp.astype(np.float64)
+        weights, intercepts, exponents = _quantize_rows(effective, intercept, 2 ** (weight_bits - 1) - 1,
+                                                        2 ** (feature_bits - 1))
+        return cls(weights, intercepts, exponents, np.zeros(coef.shape[1], dtype=np.int64), classes,
+                   weight_bits, f_exp, feature_bits)
+
+    def quantize_features(self, X: np.ndarray) -> np.ndarray:
+        """Integer inputs of a `from_float_features` model for float features X."""
+        if self.feature_exponents is None:
+            raise ValueError("Q15 models take the integer features of running_features_q15")
+        return quantize_features(X, self.feature_exponents, self.feature_bits)
+
+    def decision_function(self, features: np.ndarray) -> np.ndarray:
+        """
+        Integer class scores aligned to the smallest exponent.
+
+        Args:
+            features (np.ndarray): Q15 features (n_samples, n_features) from `running_features_q15`,
+                                   or `quantize_features` output for `from_float_features` models.
+
+        Returns:
+            np.ndarray: int64 scores (n_samples, n_rows).
+        """
+        g = np.minimum(np.asarray(features, dtype=np.int64) >> self.shifts, Q15_MAX)
+        scores = self.intercepts + g @ self.weights.T
+        return scores >> (self.exponents - self.exponents.min())
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        scores = self.decision_function(features)
+        if scores.shape[1] == 1:
+            return self.classes[(scores[:, 0] > 0).astype(int)]
+        # argmax keeps the first maximum, like the strict '>' scan in the firmware
+        return self.classes[np.argmax(scores, axis=1)]
+
+    def to_float(self, full_scale: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Dequantized (coef, intercept) in input units, to inspect the quantization error."""
+        scale = 2.0 ** -self.exponents.astype(np.float64)
+        if self.feature_exponents is not None:
+            coef = self.weights * scale[:, None] * (2.0 ** self.feature_exponents)
+        else:
+            coef = self.weights * scale[:, None] / (2.0 ** self.shifts) / (full_scale / 32768.0)
+        return coef, self.intercepts * scale
+
+    def nbytes(self) -> dict:
+        """Bytes of each constant table of the generated kernel."""
+        sizes = {
+            'weights': self.weights.size * self.weight_bits // 8,
+            'intercepts': self.intercepts.size * 4,
+            'score_shifts': self.intercepts.size if self.intercepts.size > 1 else 0,
+            'classes': self.classes.size * 4 if self.intercepts.size > 1 else 0,
+        }
+        if self.feature_exponents is not None:
+            sizes['feature_exponents'] = self.feature_exponents.size
+        return sizes
+
+    def to_cpp(self, prefix: str = "LDA", source: str = "") -> str:
+        """
+        Standalone C++ kernel of a `from_float_features` model: the constant tables,
+        `quantize_<prefix>_features` (float -> int) and `predict_<prefix>` on the integer features.
+
+        Args:
+            prefix (str): Array prefix; functions use its lower-case form.
+            source (str): Model path noted in the header comment.
+        """
+        if self.feature_exponents is None:
+            raise ValueError("Q15 models are scored by lda_score_q15 in embedded/fixed_point.h")
+        name = prefix.lower()
+        n_rows, n_features = self.weights.shape
+        w_type = f"int{self.weight_bits}_t"
+        f_type = f"int{self.feature_bits}_t"
+        f_max = 2 ** (self.feature_bits - 1) - 1
+
+        def join(values):
+            return ", ".join(str(int(v)) for v in values)
+
+        code = [
+            f"// Generated C++ code for Linear Discriminant Analysis ({w_type} weights, {f_type} features,",
+            "// int32 accumulation)",
+        ]
+        if source:
+            code.append(f"// Source Model: {source}")
+        code += [
+            "#include <math.h>",
+            "#include <stdint.h>",
+            "",
+            f"const int {prefix}_N_FEATURES = {n_features};",
+            f"// Feature i enters as saturate(round(x_i * 2^{prefix}_FEATURE_EXPONENTS[i]))",
+            f"const int8_t {prefix}_FEATURE_EXPONENTS[{n_features}] = {{ {join(self.feature_exponents)} }};",
+            f"const {w_type} {prefix}_WEIGHTS_Q[{n_rows * n_features}] = {{ {join(self.weights.ravel())} }};",
+        ]
+        if n_rows == 1:
+            code.append(f"const int32_t {prefix}_INTERCEPT_Q = {int(self.intercepts[0])};")
+        else:
+            shifts = self.exponents - self.exponents.min()
+            code += [
+                f"const int32_t {prefix}_INTERCEPTS_Q[{n_rows}] = {{ {join(self.intercepts)} }};",
+                "// Class scores carry scale 2^exponent; these shifts align them to the smallest exponent",
+                f"const uint8_t {prefix}_SCORE_SHIFTS[{n_rows}] = {{ {join(shifts)} }};",
+                f"const int {prefix}_CLASSES[{n_rows}] = {{ {join(self.classes)} }};",
+            ]
+        code += [
+            "",
+            f"inline void quantize_{name}_features(const float* input_data, {f_type}* features) {{",
+            f"    for (int i = 0; i < {prefix}_N_FEATURES; ++i) {{",
+            f"        float v = ldexpf(input_data[i], {prefix}_FEATURE_EXPONENTS[i]);",
+            f"        if (v > {f_max}.0f) v = {f_max}.0f;",
+            f"        if (v < {-f_max - 1}.0f) v = {-f_max - 1}.0f;",
+            f"        features[i] = ({f_type})lrintf(v);",
+            "    }",
+            "}",
+            "",
+        ]
+        if n_rows == 1:
+            negative, positive = (int(c) for c in self.classes)
+            code += [
+                f"// Returns class {positive} if score > 0, else {negative}",
+                f"int predict_{name}(const {f_type}* features) {{",
+                f"    int32_t score = {prefix}_INTERCEPT_Q;",
+                f"    for (int i = 0; i < {prefix}_N_FEATURES; ++i) {{",
+                f"        score += (int32_t){prefix}_WEIGHTS_Q[i] * features[i];",
+                "    }",
+                f"    return (score > 0) ? {positive} : {negative};",
+                "}",
+            ]
+        else:
+            code += [
+                f"int predict_{name}(const {f_type}* features) {{",
+                "    int best_idx = 0;",
+                "    int32_t max_score = INT32_MIN;",
+                "",
+                f"    for (int c = 0; c < {n_rows}; ++c) {{",
+                f"        int32_t current_score = {prefix}_INTERCEPTS_Q[c];",
+                f"        for (int i = 0; i < {n_features}; ++i) {{",
+                f"            current_score += (int32_t){prefix}_WEIGHTS_Q[c * {n_features} + i] * features[i];",
+                "        }",
+                f"        current_score >>= {prefix}_SCORE_SHIFTS[c];",
+                "        if (current_score > max_score) {",
+                "            max_score = current_score;",
+                "            best_idx = c;",
+                "        }",
+                "    }",
+                f"    return {prefix}_CLASSES[best_idx];",
+                "}",
+            ]
+        return "\n".join(code) + "\n"
@@ -0,0 +1,284 @@
+"""
+Flat array form of sklearn random forests for the firmware, with a Python reference of
+the C++ traversal.
+
+All trees are stored in pre-order in parallel arrays shared by the whole forest, so the
+left child of node i is always i + 1:
+
+    feature[i]    uint8: feature index, or LEAF (0xFF)
+    threshold[i]  float32, or int16 when quantized: go left if x[feature] <= threshold
+    right[i]      uint16: offset from i to the right child; class index at leaves
+
+plus roots[t] (first node of tree t) and the class labels. A prediction is a hard
+majority vote of the trees' leaf classes, ties going to the lowest class index.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+LEAF = 0xFF
+MAX_FEATURES = LEAF           # Feature indices 0..254
+MAX_TREE_NODES = 0xFFFF       # Right-child offsets and leaf classes are uint16
+Q_LIMIT = 16383               # Largest |quantized threshold|: inputs saturate at 32767 beyond it
+
+
+def float32_floor(values: np.ndarray) -> np.ndarray:
+    """
+    Largest float32 <= each float64 value.
+
+    For float32 inputs x, `x <= t` (sklearn: float32 features vs float64 thresholds) is
+    then exactly `x <= float32_floor(t)`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = values.astype(np.float32)
+    above = rounded.astype(np.float64) > values
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def float_literal(value: float) -> str:
+    """C float literal that round-trips a float32 value."""
+    text = f"{float(value):.9g}"
+    if not any(c in text for c in '.en'):
+        text += '.0'
+    return text + 'f'
+
+
+class FlatForest:
+    """
+    Random forest classifier packed into flat arrays (see the module docstring).
+
+    With quantized thresholds, feature f is compared as the int16
+    q = clip(floor(x * 2^exponents[f]), -32768, 32767), with thresholds floored the same
+    way. The power-of-two exponent puts the feature's largest threshold magnitude near
+    Q_LIMIT.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, right: np.ndarray, roots: np.ndarray,
+                 classes: np.ndarray, n_features: int, exponents: Optional[np.ndarray] = None):
+        self.feature = np.asarray(feature, dtype=np.uint8)
+        self.threshold = np.asarray(threshold)
+        self.right = np.asarray(right, dtype=np.uint16)
+        self.roots = np.asarray(roots, dtype=np.uint32)
+        self.classes = np.asarray(classes)
+        self.n_features = n_features
+        self.exponents = None if exponents is None else np.asarray(exponents, dtype=np.int64)
+
+    @property
+    def quantized(self) -> bool:
+        return self.exponents is not None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_sklearn(cls, model, quantize: bool = False) -> 'FlatForest':
+        """
+        Packs a fitted `RandomForestClassifier` (or a single `DecisionTreeClassifier`).
+
+        Args:
+            model: Fitted single-output classifier with integer class labels.
+            quantize (bool): Store int16 thresholds with per-feature power-of-two scales.
+
+        Raises:
+            ValueError: If the model has too many features or a tree too many nodes for
+                        the uint8 / uint16 fields, or non-integer class labels.
+        """
+        estimators = getattr(model, 'estimators_', [model])
+        n_features = model.n_features_in_
+        if n_features > MAX_FEATURES:
+            raise ValueError(f"{n_features} features do not fit the uint8 feature index (max {MAX_FEATURES})")
+        classes = np.asarray(model.classes_)
+        if not np.all(np.equal(np.mod(classes.astype(np.float64), 1), 0)):
+            raise ValueError(f"Class labels must be integers, got {classes}")
+
+        features, thresholds, rights, roots = [], [], [], []
+        offset = 0
+        for estimator in estimators:
+            f, t, r = cls._flatten_tree(estimator.tree_)
+            if len(f) > MAX_TREE_NODES:
+                raise ValueError(f"Tree with {len(f)} nodes does not fit uint16 offsets (max {MAX_TREE_NODES})")
+            roots.append(offset)
+            offset += len(f)
+            features.append(f)
+            thresholds.append(t)
+            rights.append(r)
+
+        feature = np.concatenate(features)
+        threshold = np.concatenate(thresholds)
+        right = np.concatenate(rights)
+        labels = classes.astype(np.int64)
+
+        if not quantize:
+            return cls(feature, float32_floor(threshold), right, roots, labels, n_features)
+
+        exponents = np.zeros(n_features, dtype=np.int64)
+        internal = feature != LEAF
+        for f in range(n_features):
+            used = threshold[internal & (feature == f)]
+            largest = np.max(np.abs(used)) if len(used) else 0.0
+            if largest > 0:
+                exponents[f] = int(np.floor(np.log2(Q_LIMIT / largest)))
+        scale = np.ldexp(1.0, exponents[np.where(internal, feature, 0)])
+        threshold_q = np.where(internal, np.floor(threshold * scale), 0).astype(np.int16)
+        return cls(feature, threshold_q, right, roots, labels, n_features, exponents)
+
+    @staticmethod
+    def _flatten_tree(tree) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pre-order (feature, threshold, right offset / leaf class) arrays of one sklearn tree."""
+        left, right_child = tree.children_left, tree.children_right
+        order = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if left[node] != right_child[node]:
+                stack.append(right_child[node])
+                stack.append(left[node])
+
+        position = np.empty(tree.node_count, dtype=np.int64)
+        position[order] = np.arange(len(order))
+        order = np.asarray(order)
+        is_leaf = left[order] == right_child[order]
+
+        feature = np.where(is_leaf, LEAF, tree.feature[order])
+        threshold = np.where(is_leaf, 0.0, tree.threshold[order])
+        # Leaves keep the class index of their largest value (first one on ties, like np.argmax)
+        leaf_class = np.argmax(tree.value[order, 0, :], axis=1)
+        right_offset = np.where(is_leaf, 0, position[np.maximum(right_child[order], 0)] - np.arange(len(order)))
+        return feature, threshold, np.where(is_leaf, leaf_class, right_offset)
+
+    def quantize_features(self, X: np.ndarray) -> np.ndarray:
+        """int16 features as compared by the quantized traversal (`<prefix>_quantize` in C++)."""
+        scale = np.ldexp(np.float32(1.0), self.exponents).astype(np.float32)
+        scaled = np.floor(np.asarray(X, dtype=np.float32) * scale)
+        return np.clip(scaled, -32768, 32767).astype(np.int16)
+
+    def leaf_classes(self, X: np.ndarray) -> np.ndarray:
+        """Class index chosen by every tree, (n_samples, n_trees)."""
+        X = self.quantize_features(X) if self.quantized else np.asarray(X, dtype=np.float32)
+        n = X.shape[0]
+        rows = np.arange(n)[:, None]
+        nodes = np.broadcast_to(self.roots.astype(np.int64), (n, self.n_trees)).copy()
+        while True:
+            feat = self.feature[nodes]
+            active = feat != LEAF
+            if not active.any():
+                break
+            x = X[rows, np.where(active, feat, 0)]
+            go_left = x <= self.threshold[nodes]
+            step = np.where(go_left, 1, self.right[nodes].astype(np.int64))
+            nodes = np.where(active, nodes + step, nodes)
+        return self.right[nodes].astype(np.int64)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Majority vote, bit-exact with the generated C++."""
+        leaves = self.leaf_classes(X)
+        votes = np.zeros((leaves.shape[0], len(self.classes)), dtype=np.int64)
+        np.add.at(votes, (np.arange(leaves.shape[0])[:, None], leaves), 1)
+        return self.classes[np.argmax(votes, axis=1)]
+
+    def nbytes(self) -> Dict[str, int]:
+        """Flash bytes of each generated array."""
+        sizes = {
+            'feature': self.feature.nbytes,
+            'threshold': self.threshold.nbytes,
+            'right': self.right.nbytes,
+            'roots': self.roots.nbytes,
+            'classes': 2 * len(self.classes),
+        }
+        if self.quantized:
+            sizes['scales'] = 4 * self.n_features
+        return sizes
+
+    def to_cpp(self, prefix: str = "RF", input_type: str = "float") -> str:
+        """
+        C++ arrays, the iterative traversal and `int predict_<prefix>(const <input_type>* x)`.
+
+        Quantized forests also get `<prefix>_quantize` and `predict_<prefix>_q(const int16_t* q)`
+        for callers that already hold scaled int16 features.
+
+        Thresholds are only exact for float32 inputs, so wider inputs (e.g. "double") are
+        rounded to float before each comparison, as sklearn does before predicting.
+        """
+        name = prefix.lower()
+        threshold_type = "int16_t" if self.quantized else "float"
+        n_classes = len(self.classes)
+
+        def array(ctype, ident, values, per_line=16):
+            values = list(values)
+            lines = [", ".join(values[i:i + per_line]) for i in range(0, len(values), per_line)]
+            body = ",\n    ".join(lines)
+            return f"static const {ctype} {ident}[{len(values)}] = {{\n    {body}\n}};\n"
+
+        if self.quantized:
+            thresholds = [str(int(t)) for t in self.threshold]
+        else:
+            thresholds = [float_literal(t) for t in self.threshold]
+
+        code: List[str] = []
+        code.append(f"// Random forest ({self.n_trees} trees, {self.n_nodes} nodes, "
+                    f"{sum(self.nbytes().values())} bytes of arrays), flat pre-order layout:")
+        code.append(f"// left child = node + 1, right child = node + {prefix}_RIGHT[node], "
+                    f"leaf class index in {prefix}_RIGHT.")
+        code.append("#include <stdint.h>")
+        if self.quantized:
+            code.append("#include <math.h>")
+        code.append("")
+        code.append(f"#define {prefix}_N_FEATURES {self.n_features}")
+        code.append(f"#define {prefix}_N_TREES {self.n_trees}")
+        code.append(f"#define {prefix}_N_CLASSES {n_classes}")
+        code.append(f"#define {prefix}_LEAF 0xFF")
+        code.append("")
+        code.append(array("uint8_t", f"{prefix}_FEATURE", [str(int(f)) for f in self.feature], 24))
+        code.append(array(threshold_type, f"{prefix}_THRESHOLD", thresholds, 8 if not self.quantized else 16))
+        code.append(array("uint16_t", f"{prefix}_RIGHT", [str(int(r)) for r in self.right], 20))
+        code.append(array("uint32_t", f"{prefix}_ROOTS", [str(int(r)) for r in self.roots]))
+        code.append(array("int16_t", f"{prefix}_CLASSES", [str(int(c)) for c in self.classes]))
+
+        value_type = "int16_t" if self.quantized else input_type
+        value = "x[f]" if self.quantized or input_type == "float" else "(float)x[f]"
+        suffix = "_q" if self.quantized else ""
+        code.append(f"static inline int {name}_tree(const {value_type}* x, uint32_t node) {{")
+        code.append(f"    uint8_t f;")
+        code.append(f"    while ((f = {prefix}_FEATURE[node]) != {prefix}_LEAF) {{")
+        code.append(f"        node += ({value} <= {prefix}_THRESHOLD[node]) ? 1u : {prefix}_RIGHT[node];")
+        code.append(f"    }}")
+        code.append(f"    return {prefix}_RIGHT[node];")
+        code.append(f"}}")
+        code.append("")
+        code.append(f"// Majority vote of the trees (ties: lowest class index)")
+        code.append(f"static inline int predict_{name}{suffix}(const {value_type}* x) {{")
+        code.append(f"    uint16_t votes[{prefix}_N_CLASSES] = {{0}};")
+        code.append(f"    for (int t = 0; t < {prefix}_N_TREES; t++) votes[{name}_tree(x, {prefix}_ROOTS[t])]++;")
+        code.append(f"    int best = 0;")
+        code.append(f"    for (int c = 1; c < {prefix}_N_CLASSES; c++) {{")
+        code.append(f"        if (votes[c] > votes[best]) best = c;")
+        code.append(f"    }}")
+        code.append(f"    return {prefix}_CLASSES[best];")
+        code.append(f"}}")
+
+        if self.quantized:
+            scales = [float_literal(np.ldexp(1.0, int(e))) for e in self.exponents]
+            code.append("")
+            code.append(array("float", f"{prefix}_SCALE", scales, 8))
+            code.append(f"// q = clip(floor(x * 2^exponent), -32768, 32767) per feature")
+            code.append(f"static inline void {name}_quantize(const {input_type}* x, int16_t* q) {{")
+            code.append(f"    for (int i = 0; i < {prefix}_N_FEATURES; i++) {{")
+            code.append(f"        float v = floorf((float)x[i] * {prefix}_SCALE[i]);")
+            code.append(f"        q[i] = (int16_t)(v > 32767.0f ? 32767.0f : (v < -32768.0f ? -32768.0f : v));")
+            code.append(f"    }}")
+            code.append(f"}}")
+            code.append("")
+            code.append(f"static inline int predict_{name}(const {input_type}* x) {{")
+            code.append(f"    int16_t q[{prefix}_N_FEATURES];")
+            code.append(f"    {name}_quantize(x, q);")
+            code.append(f"    return predict_{name}_q(q);")
+            code.append(f"}}")
+
+        return "\n".join(code) + "\n"
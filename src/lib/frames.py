@@ -0,0 +1,68 @@
+"""
+Packed binary frame files (.ngf) read zero-copy by the simulator (embedded/frame_reader.h).
+
+Layout, all little-endian:
+    header      32 bytes: magic b'NGFR', uint16 version, uint16 n_channels, uint64 n_frames,
+                float32 fs, uint32 data_offset, 8 reserved bytes
+    names       n_channels x 16 bytes, NUL-padded ASCII channel names
+    data        n_frames x n_channels float32, frame-major, starting at data_offset
+                (a multiple of 16)
+"""
+import struct
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b'NGFR'
+VERSION = 1
+HEADER = struct.Struct('<4sHHQfI8x')
+NAME_BYTES = 16
+DATA_ALIGN = 16
+
+
+def write_frames(path: str, data: np.ndarray, channels: Sequence[str], fs: float) -> None:
+    """
+    Writes (n_frames, n_channels) samples as a frame file.
+
+    Args:
+        path (str): Output file.
+        data (np.ndarray): Samples, converted to little-endian float32.
+        channels (list): Channel names (at most 15 ASCII characters each).
+        fs (float): Sampling rate of the frames.
+    """
+    data = np.ascontiguousarray(data, dtype='<f4')
+    if data.ndim != 2 or data.shape[1] != len(channels):
+        raise ValueError(f"Expected data of shape (n, {len(channels)}), got {data.shape}")
+
+    names = b''
+    for name in channels:
+        encoded = name.encode('ascii')
+        if len(encoded) >= NAME_BYTES:
+            raise ValueError(f"Channel name too long for a frame file: {name}")
+        names += encoded.ljust(NAME_BYTES, b'\0')
+
+    data_offset = -(-(HEADER.size + len(names)) // DATA_ALIGN) * DATA_ALIGN
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(channels), data.shape[0], fs, data_offset))
+        f.write(names)
+        f.write(b'\0' * (data_offset - HEADER.size - len(names)))
+        data.tofile(f)
+
+
+def read_frames(path: str) -> Tuple[np.ndarray, List[str], float]:
+    """
+    Opens a frame file without reading its data.
+
+    Returns:
+        Tuple[np.ndarray, list, float]: Read-only memory-mapped (n_frames, n_channels)
+        float32 samples, channel names and sampling rate.
+    """
+    with open(path, 'rb') as f:
+        magic, version, n_channels, n_frames, fs, data_offset = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} frame file")
+        names = f.read(n_channels * NAME_BYTES)
+
+    channels = [names[i:i + NAME_BYTES].rstrip(b'\0').decode('ascii') for i in range(0, len(names), NAME_BYTES)]
+    data = np.memmap(path, dtype='<f4', mode='r', offset=data_offset, shape=(n_frames, n_channels))
+    return data, channels, float(fs)
@@ -0,0 +1,228 @@
+import os
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from functools import partial
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def resolve_workers(n_workers: Optional[int]) -> int:
+    """Maps a worker count setting to a positive int (None or <= 0 -> all cores)."""
+    if n_workers is None or n_workers <= 0:
+        return os.cpu_count() or 1
+    return n_workers
+
+
+def process_map(func: Callable[[T], R], items: Iterable[T], n_workers: Optional[int] = 1) -> List[R]:
+    """
+    Applies `func` to every item in a process pool and returns results in input order.
+
+    Falls back to a plain loop in the calling process when a single worker is requested
+    (or there is at most one item), so serial runs keep their tracebacks and logging.
+
+    Args:
+        func: Picklable callable (module-level function, bound method or functools.partial).
+        items: Inputs to map over.
+        n_workers (int, optional): Number of worker processes. None or <= 0 uses all cores.
+
+    Returns:
+        list: func(item) for each item, in the order of `items`.
+    """
+    items = list(items)
+    n_workers = min(resolve_workers(n_workers), len(items))
+
+    if n_workers <= 1:
+        return [func(item) for item in items]
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        return list(executor.map(func, items))
+
+
+class SharedFrame:
+    """
+    Row block of a numeric DataFrame stored in a `multiprocessing.shared_memory` segment.
+
+    Columns keep their dtype unless `float32` is requested at export. Only the small
+    descriptor (segment name, row count, column layout) is pickled between processes;
+    the data itself never goes through pickle.
+    """
+
+    ALIGN = 8
+
+    def __init__(self, name: str, n_rows: int, columns: List[Tuple[str, str, int]]):
+        self.name = name
+        self.n_rows = n_rows
+        self.columns = columns  # (column, dtype str, byte offset)
+
+    @classmethod
+    def export(cls, df: pd.DataFrame, float32: bool = False) -> 'SharedFrame':
+        """
+        Copies `df` column by column into a new shared segment. The segment outlives this
+        process until the consumer frees it with `copy_into` or `unlink`.
+
+        Args:
+            df (pd.DataFrame): Numeric frame.
+            float32 (bool): Store float columns as float32 (half the copy and memory).
+        """
+        layout, offset = [], 0
+        for col in df.columns:
+            dtype = df[col].dtype
+            dtype = np.dtype(np.float32) if float32 and dtype.kind == 'f' else np.dtype(dtype)
+            layout.append((col, dtype.str, offset))
+            offset += -(-len(df) * dtype.itemsize // cls.ALIGN) * cls.ALIGN
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        try:
+            for col, dtype, start in layout:
+                view = np.ndarray(len(df), dtype=dtype, buffer=shm.buf, offset=start)
+                view[:] = df[col].to_numpy()
+                del view
+        except BaseException:
+            shm.close()
+            shm.unlink()
+            raise
+        # Ownership passes to the consumer: without this, a worker's resource tracker may
+        # unlink the segment when the worker exits, before the parent has read it
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        shm.close()
+        return cls(shm.name, len(df), layout)
+
+    def copy_into(self, columns: Dict[str, np.ndarray], row: int):
+        """Copies this block into `columns[col][row:row + n_rows]` and frees the segment."""
+        shm = shared_memory.SharedMemory(name=self.name)
+        try:
+            for col, dtype, start in self.columns:
+                view = np.ndarray(self.n_rows, dtype=dtype, buffer=shm.buf, offset=start)
+                columns[col][row:row + self.n_rows] = view
+                del view
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def unlink(self):
+        """Frees the segment without reading it (results discarded after an error)."""
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        shm.close()
+        shm.unlink()
+
+
+def _export_result(func: Callable[[T], Optional[pd.DataFrame]], item: T, float32: bool = False) -> Optional[SharedFrame]:
+    df = func(item)
+    if df is None or df.empty:
+        return None
+    return SharedFrame.export(df, float32)
+
+
+def combine_shared_frames(parts: List[SharedFrame]) -> pd.DataFrame:
+    """
+    Concatenates shared blocks row-wise into one DataFrame with a fresh RangeIndex.
+
+    The output columns are allocated once. Float columns share a single 2D block (of
+    their common dtype), so building the DataFrame does not consolidate (copy) them
+    again. Each segment is unlinked as soon as it has been copied, and every segment
+    not copied yet is unlinked if this fails. Columns missing from a block are NaN
+    (those columns are stored as floats).
+    """
+    consumed = 0
+    try:
+        total = sum(part.n_rows for part in parts)
+        dtypes: Dict[str, np.dtype] = {}
+        for part in parts:
+            for col, dtype, _ in part.columns:
+                dtypes[col] = np.dtype(dtype) if col not in dtypes else np.result_type(dtypes[col], dtype)
+        for col in dtypes:
+            if any(col not in {c for c, _, _ in part.columns} for part in parts):
+                dtypes[col] = np.result_type(dtypes[col], np.float32)
+
+        float_cols = [col for col, dtype in dtypes.items() if dtype.kind == 'f']
+        float_dtype = np.result_type(*[dtypes[col] for col in float_cols]) if float_cols else np.float64
+        float_block = np.full((len(float_cols), total), np.nan, dtype=float_dtype)
+        columns = {col: float_block[i] for i, col in enumerate(float_cols)}
+        for col, dtype in dtypes.items():
+            if col not in columns:
+                columns[col] = np.empty(total, dtype=dtype)
+
+        row = 0
+        for part in parts:
+            consumed += 1  # copy_into frees the segment even if the copy fails
+            part.copy_into(columns, row)
+            row += part.n_rows
+    finally:
+        for part in parts[consumed:]:
+            part.unlink()
+
+    df = pd.DataFrame(float_block.T, columns=float_cols, copy=False)
+    for loc, col in enumerate(dtypes):
+        if col not in float_cols:
+            df.insert(loc, col, columns[col])
+    return df
+
+
+def process_map_frames(func: Callable[[T], Optional[pd.DataFrame]], items: Iterable[T],
+                       n_workers: Optional[int] = 1, float32: bool = False) -> Optional[pd.DataFrame]:
+    """
+    Like `process_map` for functions returning DataFrames, concatenated row-wise in input order.
+
+    Each call's result is written to its own shared-memory block (see `SharedFrame`) in the
+    process that produced it. The combined row count is only known once every item has been
+    processed, so workers cannot write into the final frame directly: the parent allocates
+    the combined columns afterwards and copies each block into them once. No DataFrame is
+    pickled back, and each per-item frame can be freed as soon as it is exported, so the
+    parent holds the combined frame plus the not-yet-copied blocks rather than a list of
+    frames plus the `pd.concat` result.
+
+    If any call raises, the blocks of the other calls are unlinked before the error is
+    re-raised, so no segment is left behind in /dev/shm.
+
+    Args:
+        func: Picklable callable returning a numeric DataFrame, or None to skip the item.
+        items: Inputs to map over.
+        n_workers (int, optional): Number of worker processes. None or <= 0 uses all cores.
+        float32 (bool): Store and return float columns as float32. Off by default, so the
+                        result has the dtypes `pd.concat` would give.
+
+    Returns:
+        pd.DataFrame or None: Combined frame, or None if every call returned nothing.
+    """
+    export = partial(_export_result, func, float32=float32)
+    items = list(items)
+    n_workers = min(resolve_workers(n_workers), len(items))
+    parts: List[Optional[SharedFrame]] = []
+    error = None
+
+    if n_workers <= 1:
+        for item in items:
+            try:
+                parts.append(export(item))
+            except BaseException as e:
+                error = e
+                break
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = [executor.submit(export, item) for item in items]
+            for future in futures:
+                if error is not None:
+                    future.cancel()  # Items not started yet are skipped
+                try:
+                    parts.append(future.result())
+                except CancelledError:
+                    pass
+                except BaseException as e:
+                    error = error or e
+
+    parts = [part for part in parts if part is not None]
+    if error is not None:
+        for part in parts:
+            part.unlink()
+        raise error
+    if not parts:
+        return None
+    return combine_shared_frames(parts)
@@ -1,6 +1,35 @@
 import numpy as np
+from functools import lru_cache
 from scipy import signal
-from typing import Tuple
+from typing import Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def design_filter_sos(fs: float, band: Tuple[float, float] = (20.0, 90.0), notch_freq: float = 50.0,
+                      notch_q: float = 30.0) -> np.ndarray:
+    """
+    Designs the fused bandpass + notch cascade as second-order sections.
+
+    The notch (b, a) pair is appended as an extra section with its coefficients
+    unchanged (a[0] == 1), so one `sosfilt` pass replaces the `sosfilt` + `lfilter` pair.
+    Designs are cached per (fs, band, notch); the cached array is read-only, so
+    callers that pass it to `sosfilt` (which needs a writable buffer) take a copy.
+
+    Args:
+        fs (float): Sampling frequency in Hz.
+        band (tuple): Bandpass corner frequencies in Hz (1st-order Butterworth).
+        notch_freq (float): Notch frequency in Hz.
+        notch_q (float): Notch quality factor.
+
+    Returns:
+        np.ndarray: SOS array of shape (n_sections, 6).
+    """
+    sos_bp = signal.butter(1, list(band), btype='bandpass', fs=fs, output='sos')
+    b_notch, a_notch = signal.iirnotch(notch_freq, notch_q, fs)
+    sos = np.vstack([sos_bp, np.concatenate([b_notch, a_notch])[None, :] / a_notch[0]])
+    sos.flags.writeable = False
+    return sos
+
 
 class EMGPreprocessor:
     """
@@ -9,24 +38,71 @@ class EMGPreprocessor:
     """
     
     
-    def __init__(self, fs: float = 200.0):
+    # Rows filtered per block in `apply_filter(..., out=...)`: bounds the temporary
+    # sosfilt output to a few MB regardless of the recording length
+    BLOCK_SAMPLES = 65536
+
+    def __init__(self, fs: float = 200.0, band: Tuple[float, float] = (20.0, 90.0),
+                 notch_freq: float = 50.0, notch_q: float = 30.0):
         self.fs = fs
-        
-    def apply_filter(self, data: np.ndarray) -> np.ndarray:
+        self.sos = design_filter_sos(float(fs), tuple(float(f) for f in band), float(notch_freq), float(notch_q)).copy()
+        self.reset_state()
+
+    def apply_filter(self, data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Applies Bandpass (20-90Hz) and Notch (50Hz) filters.
         CRITICAL: Uses CAUSAL filtering (sosfilt) to match C++ real-time implementation.
+
+        Args:
+            data: Input signal (Samples x Channels).
+            out: Optional destination with the same shape (may be `data` itself for
+                 in-place filtering). Filtering then runs in blocks of `BLOCK_SAMPLES`
+                 rows with the filter state carried across blocks, so no full-length
+                 temporary is allocated.
+
+        Returns:
+            np.ndarray: Filtered signal (`out` when given).
         """
-        sos_bp = signal.butter(1, [20, 90], btype='bandpass', fs=self.fs, output='sos')
-        filtered = signal.sosfilt(sos_bp, data, axis=0)
-        b_notch, a_notch = signal.iirnotch(50, 30, self.fs)
-        filtered = signal.lfilter(b_notch, a_notch, filtered, axis=0)
-        
+        if out is None:
+            return signal.sosfilt(self.sos, data, axis=0)
+
+        if out.shape != data.shape:
+            raise ValueError(f"out has shape {out.shape}, expected {data.shape}")
+
+        zi = np.zeros((self.sos.shape[0], 2) + data.shape[1:])
+        for start in range(0, data.shape[0], self.BLOCK_SAMPLES):
+            stop = start + self.BLOCK_SAMPLES
+            out[start:stop], zi = signal.sosfilt(self.sos, data[start:stop], axis=0, zi=zi)
+        return out
+
+    def reset_state(self):
+        """Clears the streaming filter state. Call before feeding a new recording."""
+        self._zi = None
+
+    def filter_chunk(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Streaming version of `apply_filter` for consecutive chunks of one recording.
+
+        Filter delays are carried across calls, like the per-sample C++ Biquads, so
+        concatenating the outputs is bit-identical to `apply_filter` on the whole array
+        while memory stays proportional to the chunk size.
+
+        Args:
+            chunk: Next block of samples (Samples x Channels), in recording order.
+        """
+        state_shape = chunk.shape[1:]
+
+        if self._zi is None or self._zi.shape[2:] != state_shape:
+            # Zero initial conditions, identical to the sosfilt default
+            self._zi = np.zeros((self.sos.shape[0], 2) + state_shape)
+
+        filtered, self._zi = signal.sosfilt(self.sos, chunk, axis=0, zi=self._zi)
+
         return filtered
 
-    def rectify(self, data: np.ndarray) -> np.ndarray:
-        """Full-wave rectification."""
-        return np.abs(data)
+    def rectify(self, data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Full-wave rectification (in place when `out` is `data`)."""
+        return np.abs(data, out=out)
 
     def compute_features(self, data: np.ndarray, window_size_ms: float = 100.0, step_size_ms: float = 100.0) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -45,24 +121,18 @@ class EMGPreprocessor:
         step_samples = int(step_size_ms * self.fs / 1000)
         
         n_samples, n_channels = data.shape
-        n_windows = (n_samples - window_samples) // step_samples + 1
+        n_windows = max((n_samples - window_samples) // step_samples + 1, 0)
         
-        features = np.zeros((n_windows, n_channels * 2))
+        # Window sums from cumulative sums: one pass instead of one slice per window
+        zeros = np.zeros((1, n_channels))
+        cs_val = np.concatenate((zeros, np.cumsum(data, axis=0)))
+        cs_wl = np.concatenate((zeros, np.cumsum(np.abs(np.diff(data, axis=0)), axis=0)))
         
-        for i in range(n_windows):
-            start = i * step_samples
-            end = start + window_samples
-            window = data[start:end, :]
-            
-            # Features
-            mav = np.mean(window, axis=0)
-            wl = np.sum(np.abs(np.diff(window, axis=0)), axis=0)
-            
-            feats_row = []
-            for ch in range(n_channels):
-                feats_row.append(mav[ch])
-                feats_row.append(wl[ch])
-                
-            features[i, :] = np.array(feats_row)
+        starts = np.arange(n_windows) * step_samples
+        ends = starts + window_samples
+        
+        features = np.zeros((n_windows, n_channels * 2))
+        features[:, 0::2] = (cs_val[ends] - cs_val[starts]) / window_samples  # MAV
+        features[:, 1::2] = cs_wl[ends - 1] - cs_wl[starts]                  # WL
             
         return features
@@ -0,0 +1,158 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class SubjectStore:
+    """
+    Persistent, memory-mapped store of one subject's preprocessed recording.
+
+    Layout of a store directory:
+        signals.npy         float32 (n_samples, n_channels), C-contiguous
+        label_<name>.npy    float32 (n_samples,) per label column (Mode, Phase_Class, ...)
+        segments.npy        int64 (n_segments + 1,) sample offsets of contiguous segments
+        segment_nan.npy     bool (n_segments,) True if the segment has NaN signal samples
+        meta.json           channel names, label names, sampling rate
+
+    Arrays are opened with ``mmap_mode='r'`` so slicing a segment or window returns a
+    view backed by the page cache: windowing a large corpus keeps resident memory bounded
+    by the pages actually touched instead of the corpus size.
+    """
+
+    VERSION = 1
+    SIGNALS_FILE = 'signals.npy'
+    SEGMENTS_FILE = 'segments.npy'
+    SEGMENT_NAN_FILE = 'segment_nan.npy'
+    META_FILE = 'meta.json'
+
+    def __init__(self, path: str):
+        """
+        Opens an existing store.
+
+        Args:
+            path (str): Store directory written by `SubjectStore.write`.
+        """
+        self.path = path
+        with open(os.path.join(path, self.META_FILE), 'r') as f:
+            self.meta = json.load(f)
+
+        if self.meta.get('version') != self.VERSION:
+            raise ValueError(f"Unsupported store version in {path}: {self.meta.get('version')}")
+
+        self.channels: List[str] = self.meta['channels']
+        self.fs: float = self.meta['fs']
+        self.signals = np.load(os.path.join(path, self.SIGNALS_FILE), mmap_mode='r')
+        self.labels: Dict[str, np.ndarray] = {
+            name: np.load(os.path.join(path, self._label_file(name)), mmap_mode='r')
+            for name in self.meta['labels']
+        }
+        self.segment_offsets = np.load(os.path.join(path, self.SEGMENTS_FILE))
+        self.segment_nan = np.load(os.path.join(path, self.SEGMENT_NAN_FILE))
+
+    @staticmethod
+    def _label_file(name: str) -> str:
+        return f"label_{name}.npy"
+
+    def __len__(self):
+        return self.signals.shape[0]
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.segment_offsets) - 1
+
+    def segments(self, label_col: str, channels: Optional[Sequence[str]] = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Returns the valid segments as (X, y) views into the memory-mapped arrays.
+
+        Segments with NaN samples in the selected channels or NaN labels are skipped,
+        matching the filtering done by `MultiModeDataset`.
+
+        Args:
+            label_col (str): Label array to pair with the signals (e.g. 'Mode').
+            channels (list, optional): Subset of channels. Adjacent channels in stored
+                                       order stay views; other subsets make copies.
+        """
+        labels = self.labels[label_col]
+        ch_idx = None
+        if channels is not None and list(channels) != self.channels:
+            ch_idx = [self.channels.index(c) for c in channels]
+            if ch_idx == list(range(ch_idx[0], ch_idx[0] + len(ch_idx))):
+                ch_idx = slice(ch_idx[0], ch_idx[0] + len(ch_idx))  # Adjacent channels: column view
+
+        segments = []
+        for i in range(self.n_segments):
+            start, stop = self.segment_offsets[i], self.segment_offsets[i + 1]
+            y = labels[start:stop]
+            if np.isnan(y).any():
+                continue
+            X = self.signals[start:stop]
+            if ch_idx is not None:
+                X = X[:, ch_idx]
+            # segment_nan covers all stored channels; a subset is only dropped for its own NaNs
+            if self.segment_nan[i] and (ch_idx is None or np.isnan(X).any()):
+                continue
+            segments.append((X, y))
+        return segments
+
+    @classmethod
+    def write(cls, path: str, df: pd.DataFrame, signal_cols: Sequence[str], label_cols: Sequence[str],
+              segment_cols: Sequence[str], fs: float) -> 'SubjectStore':
+        """
+        Writes a subject DataFrame to a store and returns it opened.
+
+        Columns are copied one at a time straight into the memory-mapped output files,
+        so writing never materializes a second full copy of the frame.
+
+        Args:
+            path (str): Output directory (created if missing, files overwritten).
+            df (pd.DataFrame): Preprocessed subject data.
+            signal_cols (list): Signal columns, stored as float32 (e.g. ['TA', 'MG']).
+            label_cols (list): Per-sample label columns to keep (e.g. ['Mode', 'Phase_Class']).
+            segment_cols (list): A new segment starts whenever any of these columns changes
+                                 value (e.g. ['Circuit_ID', 'Mode']).
+            fs (float): Sampling frequency of the stored signals.
+        """
+        os.makedirs(path, exist_ok=True)
+        n_samples = len(df)
+
+        signals = np.lib.format.open_memmap(
+            os.path.join(path, cls.SIGNALS_FILE), mode='w+', dtype=np.float32,
+            shape=(n_samples, len(signal_cols))
+        )
+        for i, col in enumerate(signal_cols):
+            signals[:, i] = df[col].to_numpy()
+        signals.flush()
+
+        for col in label_cols:
+            np.save(os.path.join(path, cls._label_file(col)), df[col].to_numpy(dtype=np.float32))
+
+        # Segment boundaries: first sample plus every sample where a key column changes
+        is_start = np.zeros(n_samples, dtype=bool)
+        if n_samples:
+            is_start[0] = True
+        for col in segment_cols:
+            values = df[col].to_numpy()
+            is_start[1:] |= values[1:] != values[:-1]
+        offsets = np.append(np.flatnonzero(is_start), n_samples).astype(np.int64)
+
+        nan_rows = np.isnan(signals).any(axis=1)
+        nan_counts = np.concatenate(([0], np.cumsum(nan_rows)))
+        segment_nan = (nan_counts[offsets[1:]] - nan_counts[offsets[:-1]]) > 0
+        del signals
+
+        np.save(os.path.join(path, cls.SEGMENTS_FILE), offsets)
+        np.save(os.path.join(path, cls.SEGMENT_NAN_FILE), segment_nan)
+
+        meta = {
+            'version': cls.VERSION,
+            'channels': [str(c) for c in signal_cols],
+            'labels': [str(c) for c in label_cols],
+            'segment_cols': [str(c) for c in segment_cols],
+            'fs': float(fs),
+        }
+        with open(os.path.join(path, cls.META_FILE), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        return cls(path)
@@ -0,0 +1,241 @@
+"""
+Window / step / sample-rate sweeps of the LDA classifiers over shared prefix sums.
+
+Each subject is loaded once at the recording rate. For every sample rate of the grid it is
+decimated, filtered and rectified once, and the cumulative sums of |x|, x^2 and |diff(x)|
+of every segment are written to a `FeatureStore` on disk. Every (window, step) point then
+reads its MAV/RMS/WL features from the memory-mapped sums in O(n_windows), so worker
+processes share one copy of the data through the page cache instead of re-running the
+load / filter / windowing pipeline.
+"""
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+from sklearn.model_selection import train_test_split
+
+from .data_loader import Enabl3sDataLoader
+from .dataset import MultiModeDataset
+from .features import feature_prefix_sums, features_from_prefix_sums
+from .preprocess import EMGPreprocessor, design_filter_sos
+from .utils import resample_df
+
+
+class SweepTask(NamedTuple):
+    """Labels, segmentation and split of one training script."""
+    label_col: str
+    modes: Tuple[int, ...]
+    segment_cols: Optional[Tuple[str, ...]]  # None: segments split on label changes
+    test_size: float
+
+
+# Same data selection and split as train_walking_mode_model.py / train_gait_phase_model.py
+TASKS = {
+    'walking_mode': SweepTask('Mode', (0, 1, 2, 3), None, 0.3),
+    'gait_phase': SweepTask('Phase_Class', (1, 2, 3), ('Circuit_ID', 'Mode'), 0.2),
+}
+
+
+class SweepPoint(NamedTuple):
+    window_ms: float
+    step_ms: float
+    fs: float
+
+
+def sweep_grid(windows_ms: Sequence[float], steps_ms: Sequence[float], rates: Sequence[float]) -> List[SweepPoint]:
+    """All (window, step, fs) combinations with step <= window, grouped by sample rate."""
+    return [SweepPoint(float(w), float(s), float(fs)) for fs in rates for w in windows_ms for s in steps_ms if s <= w]
+
+
+def add_phase_labels(df: pd.DataFrame) -> pd.DataFrame:
+    """Phase_Class as in train_gait_phase_model.py: 0 = stance, 1 = swing, NaN outside level walking."""
+    is_walking = df['Mode'] == 1
+    df['Phase_Class'] = np.nan
+    df.loc[is_walking & (df['Label_Phase'] == 1), 'Phase_Class'] = 0
+    df.loc[is_walking & (df['Label_Phase'] == 0), 'Phase_Class'] = 1
+    return df
+
+
+def preprocess_at_rate(raw: pd.DataFrame, source_fs: float, fs: float, emg_channels: Sequence[str],
+                       task: SweepTask, filter_fs: Optional[float] = None) -> pd.DataFrame:
+    """
+    Decimates a subject's recording-rate frame circuit by circuit (like the loader's
+    `target_fs`), keeps the task's modes, filters and rectifies the EMG and adds the labels.
+
+    Args:
+        raw: Concatenated circuits at `source_fs` with a Circuit_ID column.
+        filter_fs: Sample rate the bandpass/notch is designed for (default: `fs`). The
+                   training scripts use the EMGPreprocessor default (200 Hz).
+    """
+    circuit_ids = raw['Circuit_ID'].to_numpy()
+    bounds = np.concatenate(([0], np.flatnonzero(circuit_ids[1:] != circuit_ids[:-1]) + 1, [len(raw)]))
+    df = pd.concat([resample_df(raw.iloc[a:b], fs, 'Label_Phase', source_fs=source_fs)
+                    for a, b in zip(bounds[:-1], bounds[1:])], ignore_index=True)
+    df = df[df['Mode'].isin(task.modes)]
+
+    preprocessor = EMGPreprocessor(fs=filter_fs or fs)
+    emg = df[list(emg_channels)].to_numpy(dtype=np.float64, copy=True)
+    preprocessor.apply_filter(emg, out=emg)
+    preprocessor.rectify(emg, out=emg)
+    df[list(emg_channels)] = emg
+
+    if task.label_col == 'Phase_Class':
+        df = add_phase_labels(df)
+    return df
+
+
+class FeatureStore:
+    """
+    Per-segment prefix sums of one sample rate on disk (`.npy`, memory-mapped on load).
+
+    sums.npy holds the `feature_prefix_sums` of all segments back to back (n_samples + 1
+    rows each), labels.npy their per-sample labels and segments.npy the (sums row,
+    label row, n_samples) of each segment.
+    """
+
+    def __init__(self, path: str, mmap: bool = True):
+        mode = 'r' if mmap else None
+        self.path = path
+        self.sums = np.load(os.path.join(path, 'sums.npy'), mmap_mode=mode)
+        self.labels = np.load(os.path.join(path, 'labels.npy'), mmap_mode=mode)
+        self.segments = np.load(os.path.join(path, 'segments.npy'))
+
+    @staticmethod
+    def write(path: str, segments: Sequence[Tuple[np.ndarray, np.ndarray]]) -> int:
+        """
+        Stores the prefix sums of (signal, labels) segments.
+
+        Returns:
+            int: Bytes written.
+        """
+        os.makedirs(path, exist_ok=True)
+        lengths = np.array([len(X) for X, _ in segments], dtype=np.int64)
+        n_channels = segments[0][0].shape[1] if segments else 0
+        sums = np.lib.format.open_memmap(os.path.join(path, 'sums.npy'), mode='w+', dtype=np.float64,
+                                         shape=(3, int(np.sum(lengths + 1)), n_channels))
+        label_dtype = np.result_type(*[y.dtype for _, y in segments]) if segments else np.float64
+        labels = np.lib.format.open_memmap(os.path.join(path, 'labels.npy'), mode='w+', dtype=label_dtype,
+                                           shape=(int(np.sum(lengths)),))
+        sum_rows = np.cumsum(lengths + 1) - (lengths + 1)
+        label_rows = np.cumsum(lengths) - lengths
+        for (X, y), s, l, n in zip(segments, sum_rows, label_rows, lengths):
+            sums[:, s:s + n + 1] = feature_prefix_sums(X)
+            labels[l:l + n] = y
+        sums.flush()
+        labels.flush()
+        del sums, labels
+        np.save(os.path.join(path, 'segments.npy'), np.stack((sum_rows, label_rows, lengths), axis=1))
+        return sum(os.path.getsize(os.path.join(path, f)) for f in ('sums.npy', 'labels.npy', 'segments.npy'))
+
+    def features(self, window_samples: int, step_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(X, y) of every window, identical to `SlidingWindowDataset.extract_features` on the segments."""
+        X_parts, y_parts = [], []
+        for s, l, n in self.segments:
+            if n < window_samples:
+                continue
+            X_part = features_from_prefix_sums(self.sums[:, s:s + n + 1], window_samples, step_samples)
+            label_idx = l + np.arange(X_part.shape[0]) * step_samples + window_samples - 1
+            X_parts.append(X_part)
+            y_parts.append(np.asarray(self.labels[label_idx]))
+        if not X_parts:
+            return np.zeros((0, 3 * self.sums.shape[2])), np.zeros(0)
+        return np.concatenate(X_parts), np.concatenate(y_parts)
+
+
+def prepare_subject(subject: str, data_root: str, emg_channels: Sequence[str], rates: Sequence[float],
+                    task_name: str, store_root: str, cache_dir: Optional[str] = None,
+                    filter_fs: Optional[float] = None) -> Optional[Dict[str, float]]:
+    """
+    Sweep worker for one subject: loads it once and writes one `FeatureStore` per sample rate
+    to `store_root/<fs>/<subject>`.
+
+    Returns:
+        dict: Load / preprocess seconds, recording-rate samples and store bytes, or None
+              without usable data.
+    """
+    task = TASKS[task_name]
+    t0 = time.perf_counter()
+    loader = Enabl3sDataLoader(data_root, subject, cache_dir=cache_dir)
+    n_circuits = len([f for f in os.listdir(os.path.join(data_root, subject, 'Raw')) if f.endswith('_raw.csv')])
+    raw = loader.load_dataset_batch(range(1, n_circuits + 1), list(emg_channels) + ['Mode'])
+    load_seconds = time.perf_counter() - t0
+    if raw.empty:
+        return None
+
+    t0 = time.perf_counter()
+    store_bytes = 0
+    for fs in rates:
+        df = preprocess_at_rate(raw, loader.original_fs, fs, emg_channels, task, filter_fs)
+        # Window length only matters for window counts; the segments themselves do not depend on it
+        segments = MultiModeDataset(df, list(emg_channels), task.label_col,
+                                    group_col=list(task.segment_cols) if task.segment_cols else None,
+                                    window_size_ms=0.0, step_size_ms=1000.0, fs=fs).segments
+        store_bytes += FeatureStore.write(os.path.join(store_root, f"{fs:g}", subject), segments)
+    return {'subject': subject, 'load_seconds': load_seconds, 'preprocess_seconds': time.perf_counter() - t0,
+            'raw_samples': len(raw), 'store_bytes': store_bytes}
+
+
+def operations_per_second(point: SweepPoint, n_channels: int, n_rows: int, n_features: int,
+                          filter_fs: Optional[float] = None) -> float:
+    """
+    Rough firmware arithmetic per second of a configuration: biquad MACs and running
+    MAV/RMS/WL updates per sample and channel, plus the LDA MACs of each inference.
+    """
+    filter_macs = 5 * design_filter_sos(float(filter_fs or point.fs)).shape[0]
+    per_sample = n_channels * (filter_macs + 5)
+    return point.fs * per_sample + (1000.0 / point.step_ms) * n_rows * n_features
+
+
+def evaluate_point(point: SweepPoint, store_root: str, subjects: Sequence[str], task_name: str,
+                   filter_fs: Optional[float] = None, seed: int = 42) -> Dict[str, float]:
+    """
+    Features, stratified split, LDA fit and held-out accuracy of one grid point.
+
+    Returns:
+        dict: The point, window counts, accuracy, host seconds and firmware cost estimates.
+    """
+    task = TASKS[task_name]
+    window_samples = int(point.window_ms * point.fs / 1000)
+    step_samples = int(point.step_ms * point.fs / 1000)
+    result = dict(point._asdict(), window_samples=window_samples, step_samples=step_samples)
+    if window_samples <= 0 or step_samples <= 0:
+        return dict(result, windows=0, accuracy=float('nan'), error="window or step shorter than one sample")
+
+    t0 = time.perf_counter()
+    X_parts, y_parts = [], []
+    for subject in subjects:
+        path = os.path.join(store_root, f"{point.fs:g}", subject)
+        if os.path.isdir(path):
+            X, y = FeatureStore(path).features(window_samples, step_samples)
+            if len(y):
+                X_parts.append(X)
+                y_parts.append(y)
+    feature_seconds = time.perf_counter() - t0
+    if not X_parts:
+        return dict(result, windows=0, accuracy=float('nan'), error="no windows")
+    X, y = np.concatenate(X_parts), np.concatenate(y_parts)
+    result['windows'] = len(y)
+
+    try:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=task.test_size, random_state=seed, stratify=y)
+        t0 = time.perf_counter()
+        model = LinearDiscriminantAnalysis().fit(X_train, y_train)
+        train_seconds = time.perf_counter() - t0
+    except ValueError as e:  # e.g. a class with a single window
+        return dict(result, accuracy=float('nan'), error=str(e))
+
+    n_rows = model.coef_.shape[0]
+    result.update(
+        accuracy=float(np.mean(model.predict(X_test) == y_test)),
+        test_windows=len(y_test),
+        feature_seconds=feature_seconds,
+        train_seconds=train_seconds,
+        inferences_per_s=1000.0 / point.step_ms,
+        window_bytes=window_samples * X.shape[1] // 3 * 2,  # int16 ring buffer per channel
+        ops_per_s=operations_per_second(point, X.shape[1] // 3, n_rows, X.shape[1], filter_fs),
+    )
+    return result
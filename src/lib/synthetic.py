@@ -0,0 +1,289 @@
+"""
+Synthetic subjects in the ENABL3S layout, for benchmarks and for running the scripts
+without the dataset.
+
+Each subject gets what `Enabl3sDataLoader` reads:
+
+    <root>/<subject>/<subject>_Metadata.csv
+    <root>/<subject>/Raw/<subject>_Circuit_NNN_raw.csv        1000 Hz EMG, angles, Mode
+    <root>/<subject>/Processed/<subject>_Circuit_NNN_post.csv  heel contact / toe off indices
+
+Circuits loosely follow the ENABL3S protocol (sit, stand, walk, ramp or stair ascent,
+walk, stand, then the way back down). Walking segments are made of gait cycles with
+jittered stride times; EMG is noise shaped by phase-locked activation bursts (TA in
+swing and at loading, MG/SOL at push-off, ...) with mode- and subject-specific gains.
+"""
+import os
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .dataset import MultiModeDataset
+
+FS = 1000.0
+EMG_CHANNELS = ('TA', 'MG', 'SOL', 'RF', 'VL', 'BF', 'ST')
+
+# ENABL3S mode codes
+SITTING, LEVEL_WALKING, RAMP_ASCENT, RAMP_DESCENT, STAIR_ASCENT, STAIR_DESCENT, STANDING = range(7)
+WALKING_MODES = (LEVEL_WALKING, RAMP_ASCENT, RAMP_DESCENT, STAIR_ASCENT, STAIR_DESCENT)
+
+# (mode, fraction of the circuit); ASCENT/DESCENT alternate between ramp and stairs
+ASCENT, DESCENT = -1, -2
+CIRCUIT_PROTOCOL = (
+    (SITTING, 0.08), (STANDING, 0.06), (LEVEL_WALKING, 0.14), (ASCENT, 0.14), (LEVEL_WALKING, 0.08),
+    (STANDING, 0.06), (LEVEL_WALKING, 0.08), (DESCENT, 0.14), (LEVEL_WALKING, 0.10), (STANDING, 0.04),
+    (SITTING, 0.08),
+)
+
+# Stride time (s) and stance fraction of the gait cycle per walking mode
+STRIDE = {
+    LEVEL_WALKING: (1.10, 0.60), RAMP_ASCENT: (1.20, 0.62), RAMP_DESCENT: (1.15, 0.60),
+    STAIR_ASCENT: (1.35, 0.64), STAIR_DESCENT: (1.25, 0.60),
+}
+
+# Activation bursts per muscle: (gait phase of the peak, width, amplitude), phase 0 = heel contact
+BURSTS = {
+    'TA': ((0.05, 0.06, 1.0), (0.78, 0.10, 0.8)),
+    'MG': ((0.45, 0.08, 1.0),),
+    'SOL': ((0.40, 0.10, 0.9),),
+    'RF': ((0.02, 0.06, 0.5), (0.62, 0.06, 0.6)),
+    'VL': ((0.06, 0.08, 1.0),),
+    'BF': ((0.92, 0.07, 0.9),),
+    'ST': ((0.95, 0.07, 0.8),),
+}
+
+# Burst gain per mode and muscle (missing entries: 1.0)
+MODE_GAIN = {
+    RAMP_ASCENT: {'VL': 1.6, 'RF': 1.4, 'SOL': 1.3, 'MG': 1.3},
+    RAMP_DESCENT: {'TA': 1.5, 'VL': 1.4, 'MG': 0.7},
+    STAIR_ASCENT: {'VL': 2.2, 'RF': 1.6, 'SOL': 1.6, 'MG': 1.5, 'BF': 1.3},
+    STAIR_DESCENT: {'TA': 1.8, 'VL': 1.8, 'MG': 0.6, 'SOL': 1.3},
+}
+
+# Tonic activity (fraction of the burst amplitude) while static
+TONE = {SITTING: 0.02, STANDING: 0.08}
+
+EMG_AMPLITUDE = 0.1   # Burst envelope peak (std of the EMG noise)
+NOISE_FLOOR = 0.005
+LINE_NOISE = 0.002    # 50 Hz mains pickup
+
+
+def _segments(n_samples: int, ascent: int, descent: int) -> List[Tuple[int, int, int]]:
+    """(mode, start, stop) of the protocol scaled to `n_samples`."""
+    fractions = np.array([f for _, f in CIRCUIT_PROTOCOL])
+    bounds = np.round(np.concatenate(([0], np.cumsum(fractions) / fractions.sum())) * n_samples).astype(int)
+    modes = [{ASCENT: ascent, DESCENT: descent}.get(m, m) for m, _ in CIRCUIT_PROTOCOL]
+    return [(m, a, b) for m, a, b in zip(modes, bounds[:-1], bounds[1:]) if b > a]
+
+
+def _gait_cycles(start: int, stop: int, mode: int, rng: np.random.Generator, fs: float,
+                 cadence: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Heel contacts, toe offs and stride lengths (samples) covering [start, stop)."""
+    stride_s, stance = STRIDE[mode]
+    mean = stride_s * cadence * fs
+    n = int(np.ceil((stop - start) / (0.8 * mean))) + 1
+    lengths = np.maximum(mean * (1.0 + 0.04 * rng.standard_normal(n)), 0.5 * mean).astype(np.int64)
+    heel = start + np.concatenate(([0], np.cumsum(lengths[:-1])))
+    keep = heel < stop
+    heel, lengths = heel[keep], lengths[keep]
+    toe = heel + np.round(lengths * (stance + 0.01 * rng.standard_normal(len(heel)))).astype(np.int64)
+    return heel, toe[toe < stop], lengths
+
+
+def _bump(phase: np.ndarray, center: float, width: float) -> np.ndarray:
+    """Gaussian bump on the circular gait phase."""
+    d = np.abs(phase - center)
+    d = np.minimum(d, 1.0 - d)
+    return np.exp(-0.5 * (d / width) ** 2)
+
+
+def synthesize_circuit(n_samples: int, rng: np.random.Generator, fs: float = FS, ascent: int = RAMP_ASCENT,
+                       descent: int = RAMP_DESCENT, gains: Dict[str, float] = None,
+                       cadence: float = 1.0) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Generates one circuit.
+
+    Args:
+        n_samples (int): Circuit length in samples.
+        rng (np.random.Generator): Source of randomness.
+        fs (float): Sampling rate in Hz.
+        ascent (int): Mode of the ascending part (RAMP_ASCENT or STAIR_ASCENT).
+        descent (int): Mode of the descending part (RAMP_DESCENT or STAIR_DESCENT).
+        gains (dict, optional): Per-muscle amplitude factor (subject variability).
+        cadence (float): Stride time factor (subject variability).
+
+    Returns:
+        Tuple[pd.DataFrame, np.ndarray, np.ndarray]: Raw columns (ENABL3S names),
+        heel contact and toe off sample indices.
+    """
+    gains = gains or {}
+    mode = np.empty(n_samples, dtype=np.int64)
+    phase = np.full(n_samples, np.nan)
+    heel_parts, toe_parts = [], []
+
+    for m, start, stop in _segments(n_samples, ascent, descent):
+        mode[start:stop] = m
+        if m not in WALKING_MODES:
+            continue
+        heel, toe, lengths = _gait_cycles(start, stop, m, rng, fs, cadence)
+        t = np.arange(start, stop)
+        cycle = np.searchsorted(heel, t, side='right') - 1
+        phase[start:stop] = (t - heel[cycle]) / lengths[cycle]
+        heel_parts.append(heel)
+        toe_parts.append(toe)
+
+    walking = ~np.isnan(phase)
+    gait_phase = np.where(walking, phase, 0.0)
+    t = np.arange(n_samples) / fs
+    columns = {'Header': np.arange(n_samples)}
+
+    for ch in EMG_CHANNELS:
+        envelope = np.zeros(n_samples)
+        for center, width, amplitude in BURSTS[ch]:
+            envelope += amplitude * _bump(gait_phase, center, width)
+        mode_gain = np.ones(n_samples)
+        for m, table in MODE_GAIN.items():
+            mode_gain[mode == m] = table.get(ch, 1.0)
+        envelope = np.where(walking, envelope * mode_gain, 0.0)
+        for m, tone in TONE.items():
+            envelope[mode == m] = tone
+        envelope = NOISE_FLOOR + EMG_AMPLITUDE * gains.get(ch, 1.0) * envelope
+        emg = envelope * rng.standard_normal(n_samples) + LINE_NOISE * np.sin(2 * np.pi * 50.0 * t)
+        columns[f'Right_{ch}'] = emg
+
+    # Joint angles (degrees): swing flexion while walking, flexed knee while sitting
+    knee = 5.0 + 15.0 * _bump(gait_phase, 0.15, 0.06) + 55.0 * _bump(gait_phase, 0.72, 0.08)
+    knee = np.where(walking, knee, np.where(mode == SITTING, 90.0, 3.0))
+    ankle = np.where(walking, 10.0 * _bump(gait_phase, 0.45, 0.1) - 15.0 * _bump(gait_phase, 0.62, 0.05), 0.0)
+    columns['Right_Knee'] = knee + 0.5 * rng.standard_normal(n_samples)
+    columns['Right_Ankle'] = ankle + 0.5 * rng.standard_normal(n_samples)
+    columns['Mode'] = mode
+
+    heel = np.concatenate(heel_parts) if heel_parts else np.zeros(0, dtype=np.int64)
+    toe = np.concatenate(toe_parts) if toe_parts else np.zeros(0, dtype=np.int64)
+    return pd.DataFrame(columns), heel, toe
+
+
+def synthesize_emg(n_samples: int, rng: np.random.Generator, n_channels: int = 2, fs: float = FS) -> np.ndarray:
+    """
+    Raw EMG of one synthetic circuit as a (n_samples, n_channels) array, channels in
+    `EMG_CHANNELS` order (TA, MG, ...). Test signal for the feature and firmware paths.
+    """
+    raw, _, _ = synthesize_circuit(n_samples, rng, fs=fs)
+    return raw[[f'Right_{ch}' for ch in EMG_CHANNELS[:n_channels]]].to_numpy()
+
+
+def mode_features(n_circuits: int, rng: np.random.Generator, n_channels: int = 2, circuit_seconds: float = 60.0,
+                  fs: float = FS, window_ms: float = 200.0, step_ms: float = 50.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Statistical window features and Mode labels of synthetic circuits (rectified EMG,
+    windows within each circuit / mode segment). Test data for the classifier exports.
+
+    Circuits alternate ramp and stair ascents/descents, so all seven modes appear.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (n_windows, 3 * n_channels) features and int labels.
+    """
+    channels = list(EMG_CHANNELS[:n_channels])
+    parts = []
+    for cid in range(n_circuits):
+        ascent, descent = (RAMP_ASCENT, RAMP_DESCENT) if cid % 2 == 0 else (STAIR_ASCENT, STAIR_DESCENT)
+        raw, _, _ = synthesize_circuit(int(circuit_seconds * fs), rng, fs=fs, ascent=ascent, descent=descent)
+        part = pd.DataFrame({ch: np.abs(raw[f'Right_{ch}']) for ch in channels})
+        part['Mode'] = raw['Mode']
+        part['Circuit_ID'] = cid
+        parts.append(part)
+    dataset = MultiModeDataset(pd.concat(parts, ignore_index=True), channels, 'Mode',
+                               group_col=['Circuit_ID', 'Mode'], window_size_ms=window_ms,
+                               step_size_ms=step_ms, fs=fs)
+    X, y = dataset.extract_features()
+    return X, y.astype(np.int64)
+
+
+def write_subject(root: str, subject_id: str, n_circuits: int = 10, circuit_seconds: float = 120.0,
+                  fs: float = FS, seed: int = 0) -> str:
+    """
+    Writes one synthetic subject in the ENABL3S layout.
+
+    The data only depends on (`subject_id`, `seed`) and the sizes, so subjects can be
+    generated one at a time or all at once with the same result.
+
+    Args:
+        root (str): Dataset root (the loader's `root_path`).
+        subject_id (str): Subject identifier (e.g. 'SY001').
+        n_circuits (int): Number of circuits.
+        circuit_seconds (float): Length of each circuit.
+        fs (float): Sampling rate of the raw files.
+        seed (int): Base seed.
+
+    Returns:
+        str: Subject directory.
+    """
+    rng = np.random.default_rng([seed, zlib.crc32(subject_id.encode())])
+    subject_dir = os.path.join(root, subject_id)
+    os.makedirs(os.path.join(subject_dir, 'Raw'), exist_ok=True)
+    os.makedirs(os.path.join(subject_dir, 'Processed'), exist_ok=True)
+
+    gains = {ch: float(g) for ch, g in zip(EMG_CHANNELS, rng.lognormal(0.0, 0.25, len(EMG_CHANNELS)))}
+    cadence = float(rng.uniform(0.9, 1.1))
+    n_samples = int(circuit_seconds * fs)
+
+    metadata = []
+    for cid in range(1, n_circuits + 1):
+        stairs = cid % 2 == 0
+        raw, heel, toe = synthesize_circuit(
+            n_samples, rng, fs,
+            ascent=STAIR_ASCENT if stairs else RAMP_ASCENT,
+            descent=STAIR_DESCENT if stairs else RAMP_DESCENT,
+            gains=gains, cadence=cadence
+        )
+        name = f"{subject_id}_Circuit_{cid:03d}"
+        raw.to_csv(os.path.join(subject_dir, 'Raw', f"{name}_raw.csv"), index=False, float_format='%.6f')
+
+        # Processed files list the event sample indices, NaN-padded to the circuit length
+        post = pd.DataFrame({
+            'Right_Heel_Contact': np.full(n_samples, np.nan),
+            'Right_Toe_Off': np.full(n_samples, np.nan),
+            'Mode': raw['Mode'].to_numpy(),
+        })
+        post.iloc[:len(heel), 0] = heel
+        post.iloc[:len(toe), 1] = toe
+        post.to_csv(os.path.join(subject_dir, 'Processed', f"{name}_post.csv"), index=False)
+
+        metadata.append({
+            'Filename': f" {name}",
+            'R Knee Min': round(float(raw['Right_Knee'].min()), 3),
+            'R Knee Max': round(float(raw['Right_Knee'].max()), 3),
+            'R Ankle Min': round(float(raw['Right_Ankle'].min()), 3),
+            'R Ankle Max': round(float(raw['Right_Ankle'].max()), 3),
+        })
+
+    pd.DataFrame(metadata).to_csv(os.path.join(subject_dir, f"{subject_id}_Metadata.csv"), index=False)
+    return subject_dir
+
+
+def write_dataset(root: str, subject_ids: Sequence[str], n_circuits: int = 10, circuit_seconds: float = 120.0,
+                  fs: float = FS, seed: int = 0, overwrite: bool = False) -> List[str]:
+    """
+    Writes several synthetic subjects (see `write_subject`).
+
+    Args:
+        overwrite (bool): Regenerate subjects whose metadata file already exists.
+
+    Returns:
+        list: Subject directories, in `subject_ids` order.
+    """
+    dirs = []
+    for subject_id in subject_ids:
+        metadata = os.path.join(root, subject_id, f"{subject_id}_Metadata.csv")
+        if overwrite or not os.path.exists(metadata):
+            write_subject(root, subject_id, n_circuits, circuit_seconds, fs, seed)
+        dirs.append(os.path.join(root, subject_id))
+    return dirs
+
+
+def subject_ids(n_subjects: int, prefix: str = 'SY') -> List[str]:
+    """Synthetic subject identifiers: SY001, SY002, ..."""
+    return [f"{prefix}{i:03d}" for i in range(1, n_subjects + 1)]
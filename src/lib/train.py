@@ -1,6 +1,6 @@
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
-from tensorflow import keras
-from tensorflow.keras import layers
+
+from .streaming_lda import LDAStatistics
 
 def train_LDA(X, y):
     """
@@ -13,7 +13,23 @@ def train_LDA(X, y):
     clf.fit(X, y)
     return clf
 
+def train_LDA_streaming(chunks):
+    """
+    Same model as `train_LDA`, trained from per-class statistics instead of a feature matrix.
+
+    Args:
+        chunks: Iterable of (X, y) feature chunks (e.g. `SlidingWindowDataset.iter_features()`),
+                or an `LDAStatistics` already accumulated (e.g. merged from worker processes).
+    """
+    stats = chunks if isinstance(chunks, LDAStatistics) else LDAStatistics.from_chunks(chunks)
+    print(f"\nTraining LDA from streaming statistics of {stats.n_samples} samples.")
+    return stats.to_lda()
+
 def train_tiny_dnn_model(X, y, input_shape, num_output_features=6, hidden_units=16):
+    # TensorFlow is only needed here: LDA training must not pay for (or require) it
+    from tensorflow import keras
+    from tensorflow.keras import layers
+
     # Create model
     model = keras.Sequential([
         layers.Input(shape=input_shape),
@@ -1,6 +1,11 @@
+import warnings
 import numpy as np
+import pandas as pd
+from scipy import signal
 from sklearn.tree import _tree
 
+from .forest import FlatForest
+
 def export_dt_to_cpp(tree, file, func_name="predict_tree"):
     """Recursive function to write C++ if-else tree code."""
     tree_ = tree.tree_
@@ -46,8 +51,21 @@ def export_lda_to_cpp(model, file, prefix="LDA"):
     file.write(f"    return (score > 0) ? 1 : 0;\n")
     file.write("}\n\n")
 
-def export_rf_to_cpp(model, file, prefix="RF"):
-    """Exports Random Forest to C++."""
+def export_rf_to_cpp(model, file, prefix="RF", layout="ifelse"):
+    """
+    Exports Random Forest to C++.
+
+    layout='ifelse' writes one nested if/else function per tree. layout='flat' packs all
+    trees into node arrays walked by a small loop (see lib/forest.py), which is several
+    times smaller in flash for realistic forests. Both keep the `const double*` signature;
+    the flat form rounds each feature to float before comparing it with the float32
+    thresholds, which is how sklearn predicts.
+    """
+    if layout == "flat":
+        file.write(FlatForest.from_sklearn(model).to_cpp(prefix, input_type="double"))
+        file.write("\n")
+        return
+
     # Export individual trees
     for i, estimator in enumerate(model.estimators_):
         export_dt_to_cpp(estimator, file, f"{prefix.lower()}_tree_{i}")
@@ -102,7 +120,7 @@ def export_dnn_to_cpp(model, filename="model_weights.h"):
     
     print(f"Model exported to {filename}")
 
-def generate_cpp_header(models, system_name="Hierarchical", filename="embedded/classifier.h"):
+def generate_cpp_header(models, system_name="Hierarchical", filename="embedded/classifier.h", rf_layout="ifelse"):
     """
     Generates C++ header for one or more models.
     
@@ -110,6 +128,7 @@ def generate_cpp_header(models, system_name="Hierarchical", filename="embedded/c
         models: Dictionary { 'State': model1, 'Phase': model2 } OR single model.
         system_name: Name of the system.
         filename: Output path.
+        rf_layout: 'ifelse' or 'flat' random forest export (see export_rf_to_cpp).
     """
     print(f"Exporting {system_name} system to {filename}...")
     
@@ -131,7 +150,7 @@ def generate_cpp_header(models, system_name="Hierarchical", filename="embedded/c
             if "LinearDiscriminantAnalysis" in model_type:
                 export_lda_to_cpp(model, f, prefix=name.upper())
             elif "RandomForest" in model_type:
-                export_rf_to_cpp(model, f, prefix=name.upper())
+                export_rf_to_cpp(model, f, prefix=name.upper(), layout=rf_layout)
             elif "DecisionTree" in model_type:
                 export_dt_to_cpp(model, f, f"predict_{name.lower()}")
             else:
@@ -170,10 +189,144 @@ def generate_cpp_header(models, system_name="Hierarchical", filename="embedded/c
         f.write(f"#endif // {system_name.upper()}_CLASSIFIER_H\n")
 
 
-def resample_df(df, target_fs, column_name):
-    """Resample DataFrame to target sampling frequency."""
+def _split_blocks(values, factor):
+    """Splits a 1D array into (n_full_blocks, factor) and the trailing partial block."""
+    n_full = len(values) // factor
+    return values[:n_full * factor].reshape(n_full, factor), values[n_full * factor:]
+
+
+def block_mean(values, factor):
+    """
+    Integer-ratio decimation by non-overlapping block means (NaN-aware).
+
+    Equivalent to pandas ``resample(...).mean()`` on a regular index: block i covers
+    samples [i*factor, (i+1)*factor), the last block may be partial and all-NaN blocks
+    give NaN.
+
+    Args:
+        values: 1D numpy array
+        factor: Integer decimation ratio
+    Returns:
+        1D numpy array of length ceil(len(values) / factor)
+    """
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(np.float64)
+    full, tail = _split_blocks(values, factor)
+    blocks = [full, tail[np.newaxis, :]] if len(tail) else [full]
+
+    out = []
+    for block in blocks:
+        nan_mask = np.isnan(block)
+        if not nan_mask.any():
+            out.append(block.mean(axis=1, dtype=np.float64).astype(values.dtype))
+            continue
+        counts = (~nan_mask).sum(axis=1)
+        sums = np.where(nan_mask, 0, block).sum(axis=1, dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out.append(np.where(counts > 0, sums / counts, np.nan).astype(values.dtype))
+    return np.concatenate(out)
+
+
+def block_median(values, factor):
+    """
+    Decimates a label signal by the rounded median of each block (NaN-aware).
+
+    For binary labels this equals the rounded block mean used previously, including
+    the round-half-to-even tie break (a 2/2 split maps to 0).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    full, tail = _split_blocks(values, factor)
+    blocks = [full, tail[np.newaxis, :]] if len(tail) else [full]
+
+    out = []
+    for block in blocks:
+        if np.isnan(block).any():
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN blocks -> NaN
+                out.append(np.nanmedian(block, axis=1))
+        else:
+            ordered = np.sort(block, axis=1)
+            mid = block.shape[1] // 2
+            if block.shape[1] % 2:
+                out.append(ordered[:, mid])
+            else:
+                out.append((ordered[:, mid - 1] + ordered[:, mid]) / 2)
+    return np.round(np.concatenate(out))
+
+
+def polyphase_decimate(values, factor):
+    """
+    Anti-aliased integer decimation with a polyphase FIR (scipy.signal.resample_poly).
+
+    Output length matches `block_mean`. NaNs propagate over the filter length, so
+    columns containing gaps should use `block_mean` instead.
+    """
+    values = np.asarray(values)
+    out = signal.resample_poly(values.astype(np.float64), 1, factor, axis=0)
+    return out.astype(values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64)
+
+
+def _integer_ratio(source_fs, target_fs):
+    """Returns source_fs / target_fs if it is a whole number > 0, else None."""
+    ratio = source_fs / target_fs
+    factor = int(round(ratio))
+    if factor >= 1 and abs(ratio - factor) < 1e-9:
+        return factor
+    return None
+
+
+def resample_df(df, target_fs, column_name, source_fs=None, anti_alias_cols=None):
+    """
+    Resample DataFrame to target sampling frequency.
+
+    Integer ratios (e.g. 1000 -> 250 Hz) run on raw column arrays with block means,
+    with `column_name` (the label) decimated by rounded block median. Other ratios fall
+    back to pandas time-based resampling.
+
+    Args:
+        df: DataFrame sampled at `source_fs`.
+        target_fs: Output sampling frequency in Hz.
+        column_name: Label column, decimated by block median instead of mean.
+        source_fs: Input sampling frequency. If None it is inferred from a regular
+                   TimedeltaIndex.
+        anti_alias_cols: Columns decimated with the polyphase anti-aliasing filter
+                         instead of block means (integer ratios only).
+    """
+    if source_fs is None:
+        if not isinstance(df.index, pd.TimedeltaIndex) or len(df.index) < 2:
+            raise ValueError("source_fs is required unless df has a regular TimedeltaIndex")
+        source_fs = 1.0 / (df.index[1] - df.index[0]).total_seconds()
+
+    factor = _integer_ratio(source_fs, target_fs)
+    if factor is None:
+        return _resample_df_pandas(df, target_fs, column_name, source_fs)
+
+    anti_alias_cols = set(anti_alias_cols or [])
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == column_name:
+            columns[col] = block_median(values, factor)
+        elif col in anti_alias_cols:
+            columns[col] = polyphase_decimate(values, factor)
+        else:
+            columns[col] = block_mean(values, factor)
+
+    out = pd.DataFrame(columns)
+    if isinstance(df.index, pd.TimedeltaIndex):
+        period_ns = int(1_000_000 / target_fs) * 1000
+        out.index = df.index[0] + pd.to_timedelta(np.arange(len(out), dtype=np.int64) * period_ns, unit='ns')
+    return out
+
+
+def _resample_df_pandas(df, target_fs, column_name, source_fs):
+    """Time-based pandas resampling, used for non-integer ratios."""
+    if not isinstance(df.index, pd.TimedeltaIndex):
+        offsets_ns = np.round(np.arange(len(df)) * (1e9 / source_fs)).astype(np.int64)
+        df = df.set_axis(pd.to_timedelta(offsets_ns, unit='ns'))
     period_us = int(1_000_000 / target_fs)
     df = df.resample(f'{period_us}us').mean()
     df[column_name] = df[column_name].resample(f'{period_us}us').median().round()
     
-    return df
\ No newline at end of file
+    return df
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+from sklearn.model_selection import train_test_split
+
+from src.lib.compact import CompactRecording
+from src.lib.dataset import MultiModeDataset, SlidingWindowDataset
+
+# Gait phase configuration (train_gait_phase_model.py)
+FS = 250
+WINDOW_MS = 200
+STEP_MS = 50
+EMG_CHANNELS = ['TA', 'MG']
+N_CIRCUITS = 40
+CIRCUIT_SAMPLES = 6000
+FEATURE_RTOL = 1e-4
+ACCURACY_TOLERANCE = 0.005
+
+
+def make_frame(rng):
+    """Synthetic combined frame: float64 EMG, per-circuit mode runs, stance/swing labels while walking."""
+    parts = []
+    for cid in range(1, N_CIRCUITS + 1):
+        mode = np.repeat(rng.choice([1, 2, 3], size=6), CIRCUIT_SAMPLES // 6).astype(float)
+        phase = (np.arange(CIRCUIT_SAMPLES) // 150 % 2).astype(float)  # 0.6 s stance / swing
+        gain = np.where(phase == 0, 0.3, 0.1)[:, None] * np.array([1.0, 0.6])
+        emg = np.abs(rng.normal(size=(CIRCUIT_SAMPLES, 2)) * gain)
+        phase_class = np.where(mode == 1, phase, np.nan)
+        part = pd.DataFrame(emg, columns=EMG_CHANNELS)
+        part['Mode'] = mode
+        part['Label_Phase'] = 1.0 - phase
+        part['Phase_Class'] = phase_class
+        part['Circuit_ID'] = cid
+        parts.append(part)
+    df = pd.concat(parts, ignore_index=True)
+    df.loc[rng.choice(len(df), 5, replace=False), 'TA'] = np.nan
+    return df
+
+
+def evaluate(X, y):
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
+    model = LinearDiscriminantAnalysis().fit(X_train, y_train)
+    return np.mean(model.predict(X_test) == y_test)
+
+
+def main():
+    df = make_frame(np.random.default_rng(7))
+
+    # Previous representation: float64 frame plus a per-row string group key
+    df['Segment_Group'] = df['Circuit_ID'].astype(str) + '_' + df['Mode'].astype(str)
+    legacy = MultiModeDataset(df, EMG_CHANNELS, 'Phase_Class', group_col='Segment_Group',
+                              window_size_ms=WINDOW_MS, step_size_ms=STEP_MS, fs=FS)
+    X_legacy, y_legacy = legacy.extract_features()
+
+    recording = CompactRecording.from_frame(df, EMG_CHANNELS, ['Circuit_ID', 'Mode', 'Phase_Class'])
+    report = recording.memory_report(df)
+    compact = SlidingWindowDataset.from_recording(recording, 'Phase_Class', ['Circuit_ID', 'Mode'],
+                                                  WINDOW_MS, STEP_MS, FS)
+    X_compact, y_compact = compact.extract_features()
+
+    print(f"Memory: {report['frame_bytes'] / 1e6:.2f} MB -> {report['compact_bytes'] / 1e6:.2f} MB "
+          f"({report['reduction']:.1f}x smaller)")
+    for name, column in recording.columns.items():
+        print(f"  {name:12s}: {column.n_runs} runs, {column.values.dtype}")
+
+    assert X_compact.shape == X_legacy.shape, "Window count differs"
+    assert np.array_equal(y_compact, y_legacy), "Labels differ"
+    error = np.max(np.abs(X_compact - X_legacy) / np.maximum(np.abs(X_legacy), 1e-12))
+    print(f"Windows: {len(X_legacy)}, max rel. feature error (float32): {error:.2e}")
+    assert error < FEATURE_RTOL, "Compact features diverge"
+
+    acc_legacy, acc_compact = evaluate(X_legacy, y_legacy), evaluate(X_compact, y_compact)
+    print(f"LDA accuracy: legacy {100 * acc_legacy:.2f} %, compact {100 * acc_compact:.2f} %")
+    assert abs(acc_legacy - acc_compact) <= ACCURACY_TOLERANCE, "Accuracy parity failed"
+
+    print("Compact dataset verification passed.")
+
+
+if __name__ == "__main__":
+    main()
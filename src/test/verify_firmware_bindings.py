@@ -0,0 +1,78 @@
+import os
+import sys
+
+import numpy as np
+from scipy import signal
+
+from src.lib.firmware import DEFAULT_LIBRARY, FirmwareLibrary
+from src.lib.fixed_point import FIRMWARE_BANDPASS, FIRMWARE_NOTCH, condition_q15, running_features_q15, to_q15
+from src.lib.synthetic import synthesize_emg
+
+# Requires embedded/libneurogait.so and libneurogait_q15.so (make lib in embedded/),
+# or the library paths to check as arguments
+Q15_LIBRARY = os.path.join(os.path.dirname(DEFAULT_LIBRARY), 'libneurogait_q15.so')
+N_SAMPLES = 250 * 120
+PHASE_WINDOW = 50
+FILTER_TOLERANCE = 1e-5  # float32 biquads vs float64 reference
+
+
+def check_q15_reference(firmware, samples, replay):
+    """The Q15 build must match the Python reference in src/lib/fixed_point.py bit for bit."""
+    # Default NEUROGAIT_EMG_FULL_SCALE: Q15 values come back as exact float32 multiples of 2^-15
+    filtered_q15 = to_q15(replay.filtered)
+    assert np.array_equal(filtered_q15.astype(np.float32) / 32768, replay.filtered), "Filter output is not Q15"
+
+    q15 = to_q15(samples)
+    expected = np.stack([condition_q15(q15[:, ch]) for ch in range(firmware.n_channels)], axis=1)
+    assert np.array_equal(filtered_q15, expected), "SignalConditionerQ15 differs from condition_q15"
+
+    for name, features, window in (('context', replay.context_features, firmware.context_window),
+                                   ('phase', replay.phase_features, PHASE_WINDOW)):
+        reference = running_features_q15(expected, window, replay.tick_index)
+        assert np.array_equal(np.rint(features.astype(np.float64) * 32768).astype(np.int64), reference), \
+            f"RunningFeatureExtractorQ15 {name} features differ from running_features_q15"
+    print(f"  Q15 filter output and features identical to the Python reference "
+          f"({len(expected)} samples, {len(replay.tick_index)} ticks)")
+
+
+def check_library(path):
+    firmware = FirmwareLibrary(path)
+    print(f"Library: {firmware.path} ({'Q15' if firmware.fixed_point else 'float'} chain)")
+
+    rng = np.random.default_rng(42)
+    samples = synthesize_emg(N_SAMPLES, rng, firmware.n_channels, fs=250.0).astype(np.float32)
+
+    replay = firmware.replay(samples)
+    expected_ticks = np.arange(firmware.context_window, N_SAMPLES, firmware.inference_period)
+    assert np.array_equal(replay.tick_index, expected_ticks), "Unexpected inference ticks"
+    print(f"  Ticks: {len(replay.tick_index)}, modes {np.unique(replay.mode)}, "
+          f"stimulating {100 * replay.stimulating.mean():.1f} % of ticks")
+
+    assert np.array_equal(firmware.filter(samples), replay.filtered), "ng_filter and ng_replay disagree"
+    if firmware.fixed_point:
+        check_q15_reference(firmware, samples, replay)
+    else:
+        reference = samples.astype(np.float64)
+        for b0, b1, b2, a1, a2 in (FIRMWARE_BANDPASS, FIRMWARE_NOTCH):
+            reference = signal.lfilter([b0, b1, b2], [1.0, a1, a2], reference, axis=0)
+        error = np.max(np.abs(replay.filtered - reference))
+        print(f"  Filter max abs error vs float64 reference: {error:.3e}")
+        assert error < FILTER_TOLERANCE, "Firmware filter diverges from its coefficients"
+
+    # The batch LDA entry points must reproduce the decisions taken inside the replay
+    walking = replay.mode != 0
+    if not firmware.fixed_point:
+        assert np.array_equal(firmware.predict_walking_mode(replay.context_features), replay.mode)
+        assert np.array_equal(firmware.predict_gait_phase(replay.phase_features)[walking], replay.phase[walking])
+    assert np.all(replay.phase[~walking] == 0), "Phase decided while not walking"
+
+
+def main():
+    for path in sys.argv[1:] or [DEFAULT_LIBRARY, Q15_LIBRARY]:
+        check_library(path)
+
+    print("Firmware binding verification passed.")
+
+
+if __name__ == "__main__":
+    main()
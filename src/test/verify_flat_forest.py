@@ -0,0 +1,88 @@
+import tempfile
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from src.lib.cpp_bench import flash_bytes, host_benchmark
+from src.lib.forest import LEAF, FlatForest
+from src.lib.synthetic import mode_features
+
+N_TREES = 25
+
+
+def tree_votes(model, X):
+    """Class index chosen by every sklearn tree, (n_samples, n_trees)."""
+    return np.stack([tree.predict(X) for tree in model.estimators_], axis=1).astype(int)
+
+
+def tie_inputs(flat, X, rng, n_rows=2000):
+    """Rows whose feature equals a node's float32 threshold, or the next float32 above it."""
+    nodes = rng.choice(np.flatnonzero(flat.feature != LEAF), n_rows)
+    rows = X[rng.integers(0, len(X), n_rows)].copy()
+    value = flat.threshold[nodes]
+    value[n_rows // 2:] = np.nextafter(value[n_rows // 2:], np.float32(np.inf))
+    rows[np.arange(n_rows), flat.feature[nodes]] = value
+    return rows
+
+
+def check_cpp(flat, X, input_type):
+    """Generated C++ (compiled on the host) must vote like FlatForest.predict."""
+    source = flat.to_cpp("RF", input_type=input_type)
+    with tempfile.TemporaryDirectory() as workdir:
+        size = flash_bytes(source, "predict_rf", input_type, 'g++', workdir)
+        _, _, pred = host_benchmark(source, "predict_rf", input_type, X, 'g++', workdir, reps=1)
+    if pred is None:
+        print(f"  {input_type} C++ export: no host compiler, skipped")
+        return
+    assert np.array_equal(pred, flat.predict(X)), f"{input_type} C++ export diverges from FlatForest.predict"
+    print(f"  {input_type} C++ export: {size} B, identical predictions")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    X, y = mode_features(6, rng, n_channels=4)
+    X = X.astype(np.float32)
+    n_train = 2 * len(X) // 3  # First four circuits train, last two test
+    model = RandomForestClassifier(N_TREES, max_depth=10, random_state=0).fit(X[:n_train], y[:n_train])
+    X_test = X[n_train:]
+
+    flat = FlatForest.from_sklearn(model)
+    print(f"Flat forest: {flat.n_trees} trees, {flat.n_nodes} nodes, {sum(flat.nbytes().values())} bytes, "
+          f"classes {flat.classes.tolist()}")
+
+    # Every tree must reach the leaf sklearn reaches (float32 thresholds rounded down)
+    votes = tree_votes(model, X_test)
+    assert np.array_equal(flat.leaf_classes(X_test), votes), "Flat traversal diverges from sklearn trees"
+
+    # Features exactly at a threshold go left, the next float32 up goes right
+    X_tie = tie_inputs(flat, X_test, rng)
+    assert np.array_equal(flat.leaf_classes(X_tie), tree_votes(model, X_tie)), "Threshold ties resolved differently"
+    print(f"Leaves identical to sklearn on {len(X_test)} windows and {len(X_tie)} threshold ties")
+
+    # Hard majority vote, ties to the lowest class index
+    counts = np.stack([(votes == c).sum(axis=1) for c in range(len(model.classes_))], axis=1)
+    assert np.array_equal(flat.predict(X_test), model.classes_[np.argmax(counts, axis=1)])
+    print(f"Agreement with sklearn (probability averaging): {100 * np.mean(flat.predict(X_test) == model.predict(X_test)):.2f} %")
+
+    # Trees that are a single leaf (no split reduces the impurity enough)
+    stumps = RandomForestClassifier(5, min_impurity_decrease=1.0, random_state=0).fit(X[:n_train], y[:n_train])
+    leaf_only = FlatForest.from_sklearn(stumps)
+    assert leaf_only.n_nodes == leaf_only.n_trees and np.all(leaf_only.feature == LEAF)
+    assert np.array_equal(leaf_only.leaf_classes(X_test), tree_votes(stumps, X_test))
+    print(f"Leaf-only forest: {leaf_only.n_trees} trees, predicts {np.unique(leaf_only.predict(X_test)).tolist()}")
+
+    # The C++ thresholds are exact for float inputs; double inputs are rounded to float first
+    check_cpp(flat, np.concatenate([X_test, X_tie]), "float")
+    check_cpp(flat, np.concatenate([X_test, X_tie]), "double")
+    check_cpp(leaf_only, X_test, "float")
+
+    quantized = FlatForest.from_sklearn(model, quantize=True)
+    agreement = np.mean(quantized.predict(X_test) == flat.predict(X_test))
+    print(f"int16 thresholds: {sum(quantized.nbytes().values())} bytes, {100 * agreement:.2f} % agreement with float")
+    assert agreement > 0.99, "Threshold quantization changes too many decisions"
+
+    print("Flat forest verification passed.")
+
+
+if __name__ == "__main__":
+    main()
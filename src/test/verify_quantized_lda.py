@@ -0,0 +1,72 @@
+import numpy as np
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+
+from src.lib.fixed_point import INT32_MAX, QuantizedLDA
+from src.lib.synthetic import WALKING_MODES, mode_features
+
+
+def check_saturation(model, X_train, X_test):
+    """Features beyond the calibrated range clip to the int8 limits without overflowing the accumulator."""
+    q = QuantizedLDA.from_float_features(model.coef_, model.intercept_, model.classes_, X_train, 8, 8)
+    # Every feature pushed 4x past its calibration maximum, in both directions
+    largest = np.abs(X_train).max(axis=0)
+    for sign, limit in ((1, 127), (-1, -128)):
+        extreme = np.vstack([X_test, sign * 4 * np.broadcast_to(largest, X_test.shape)])
+        features = q.quantize_features(extreme)
+        assert np.all(features[len(X_test):] == limit), f"Features do not saturate at {limit}"
+        assert features.min() >= -128 and features.max() <= 127
+        scores = q.decision_function(features)
+        assert np.all(np.abs(scores) <= INT32_MAX), "Saturated features overflow the int32 scores"
+        assert np.array_equal(q.predict(features)[:len(X_test)], q.predict(q.quantize_features(X_test)))
+    # Calibration values themselves keep the headroom bit: none of them saturates
+    assert np.all(np.abs(q.quantize_features(X_train)) < 127), "Calibration features saturate"
+    print("  int8 features saturate at -128 / 127 beyond the calibrated range, scores stay within int32")
+
+
+def main():
+    X, y = mode_features(6, np.random.default_rng(0), n_channels=2)
+    n_train = 2 * len(X) // 3  # First four circuits train, last two test
+    X_train, y_train, X_test, y_test = X[:n_train], y[:n_train], X[n_train:], y[n_train:]
+    # MAV/RMS (~0.1) next to WL (~20): per-feature scales are needed
+    print(f"Feature ranges: {np.abs(X_train).max(axis=0).round(4).tolist()}")
+
+    # int8 features keep ~6 bits below each feature's largest value: the weak sitting / standing
+    # windows lose most of their resolution, which costs the 7-mode task far more than walking / static
+    tasks = (
+        ("walking modes", y_train, y_test, 0.8),
+        ("walking vs static", np.isin(y_train, WALKING_MODES), np.isin(y_test, WALKING_MODES), 0.95),
+    )
+    for name, labels_train, labels_test, int8_agreement in tasks:
+        model = LinearDiscriminantAnalysis().fit(X_train, labels_train)
+        reference = model.predict(X_test)
+        print(f"{name}: {len(model.classes_)} classes, float accuracy {100 * np.mean(reference == labels_test):.2f} %")
+
+        for weight_bits, feature_bits, min_agreement in ((16, 16, 0.995), (8, 16, 0.97), (8, 8, int8_agreement)):
+            q = QuantizedLDA.from_float_features(model.coef_, model.intercept_, model.classes_, X_train,
+                                                 weight_bits, feature_bits)
+            features = q.quantize_features(X_test)
+            assert np.all(np.abs(q.weights) < 2 ** (weight_bits - 1))
+            assert np.all(np.abs(features) <= 2 ** (feature_bits - 1))
+            headroom = np.abs(q.intercepts) + 2 ** (feature_bits - 1) * np.abs(q.weights).sum(axis=1)
+            assert np.all(headroom <= INT32_MAX), "Accumulator can overflow int32"
+
+            pred = q.predict(features)
+            agreement = np.mean(pred == reference)
+            print(f"  int{weight_bits} weights / int{feature_bits} features: "
+                  f"{100 * agreement:.2f} % agreement, accuracy {100 * np.mean(pred == labels_test):.2f} %")
+            assert agreement >= min_agreement, "Quantization changes too many decisions"
+
+            coef, intercept = q.to_float()
+            if weight_bits == 16:
+                assert np.allclose(coef, np.atleast_2d(model.coef_), rtol=0, atol=1e-3 * np.abs(model.coef_).max())
+
+            source = q.to_cpp("LDA")
+            assert f"int{weight_bits}_t LDA_WEIGHTS_Q[{q.weights.size}]" in source
+
+        check_saturation(model, X_train, X_test)
+
+    print("Quantized LDA verification passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+from src.lib.data_loader import Enabl3sDataLoader
+from src.lib.synthetic import synthesize_circuit
+from src.lib.utils import polyphase_decimate, resample_df
+
+SOURCE_FS = 1000.0
+N_SAMPLES = 30 * 1000 + 3  # Trailing partial block at 250 Hz
+LABEL = 'Label_Phase'
+
+
+def pandas_resample(df, target_fs, column_name):
+    """The time-based pandas resampling `resample_df` replaced for integer ratios."""
+    period_us = int(1_000_000 / target_fs)
+    df = df.resample(f'{period_us}us').mean()
+    df[column_name] = df[column_name].resample(f'{period_us}us').median().round()
+    return df
+
+
+def make_circuit(rng):
+    """One synthetic circuit as the loader produces it: EMG, Mode, Label_Phase and a gap in MG."""
+    raw, heel, toe = synthesize_circuit(N_SAMPLES, rng)
+    df = raw[['Right_TA', 'Right_MG', 'Mode']].copy()
+    df[LABEL] = Enabl3sDataLoader.events_to_labels_batch([len(df)], [heel], [toe])[0]
+    df.loc[1000:1010, 'Right_MG'] = np.nan  # Partial and all-NaN blocks
+    offsets = pd.to_timedelta(np.arange(len(df), dtype=np.int64) * 1_000_000, unit='ns')
+    return df.set_axis(offsets)
+
+
+def check_integer_ratio(df):
+    reference = pandas_resample(df.copy(), 250, LABEL)
+    for name, frame in (("TimedeltaIndex", df), ("RangeIndex", df.reset_index(drop=True))):
+        out = resample_df(frame, 250, LABEL, source_fs=SOURCE_FS)
+        assert list(out.columns) == list(reference.columns) and len(out) == len(reference)
+        assert np.array_equal(out[LABEL].to_numpy(), reference[LABEL].to_numpy()), f"{name}: labels differ"
+        for col in ('Right_TA', 'Right_MG', 'Mode'):
+            assert np.allclose(out[col], reference[col], rtol=1e-12, atol=1e-15, equal_nan=True), \
+                f"{name}: {col} differs from pandas"
+        assert np.array_equal(np.isnan(out['Right_MG']), np.isnan(reference['Right_MG']))
+        if name == "TimedeltaIndex":
+            assert out.index.equals(reference.index), "Index differs from pandas"
+    print(f"1000 -> 250 Hz: {len(reference)} rows match pandas (block means, median labels, NaN gap, partial block)")
+
+
+def check_non_integer_ratio(df):
+    reference = pandas_resample(df.copy(), 300, LABEL)
+    for frame in (df, df.reset_index(drop=True)):
+        out = resample_df(frame, 300, LABEL, source_fs=SOURCE_FS)
+        pd.testing.assert_frame_equal(out, reference)
+    print(f"1000 -> 300 Hz: falls back to pandas ({len(reference)} rows, identical)")
+
+
+def check_anti_alias(df):
+    out = resample_df(df, 250, LABEL, source_fs=SOURCE_FS, anti_alias_cols=['Right_TA'])
+    plain = resample_df(df, 250, LABEL, source_fs=SOURCE_FS)
+    assert np.array_equal(out['Right_TA'], polyphase_decimate(df['Right_TA'].to_numpy(), 4))
+    for col in ('Right_MG', 'Mode', LABEL):
+        assert np.array_equal(out[col], plain[col], equal_nan=True), f"anti_alias_cols changed {col}"
+
+    # 200 Hz folds onto 50 Hz after block means; the polyphase filter removes it, 20 Hz passes
+    t = np.arange(N_SAMPLES) / SOURCE_FS
+    tones = pd.DataFrame({'low': np.sin(2 * np.pi * 20 * t), 'high': np.sin(2 * np.pi * 200 * t), LABEL: 0.0})
+    filtered = resample_df(tones, 250, LABEL, source_fs=SOURCE_FS, anti_alias_cols=['low', 'high'])
+    averaged = resample_df(tones, 250, LABEL, source_fs=SOURCE_FS)
+    rms = lambda x: np.sqrt(np.mean(np.asarray(x)[50:-50] ** 2))
+    assert abs(rms(filtered['low']) - rms(tones['low'])) < 0.01, "Polyphase filter attenuates the passband"
+    assert rms(filtered['high']) < 0.01 < 0.1 < rms(averaged['high']), "200 Hz aliases through the filter"
+    print(f"anti_alias_cols: 200 Hz tone RMS {rms(averaged['high']):.3f} with block means, "
+          f"{rms(filtered['high']):.1e} with the polyphase filter")
+
+
+def main():
+    df = make_circuit(np.random.default_rng(0))
+    check_integer_ratio(df)
+    check_non_integer_ratio(df)
+    check_anti_alias(df)
+    print("Resampling verification passed.")
+
+
+if __name__ == "__main__":
+    main()
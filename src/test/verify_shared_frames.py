@@ -0,0 +1,60 @@
+import glob
+
+import numpy as np
+import pandas as pd
+
+from src.lib.parallel import process_map_frames
+
+N_ROWS = 5000
+
+
+def make_part(i):
+    """Subject-like frame: float signals and labels, integer circuit ids; item 2 has no Phase_Class."""
+    if i < 0:
+        raise RuntimeError(f"Failed to load item {i}")
+    rng = np.random.default_rng(i)
+    df = pd.DataFrame({
+        'TA': rng.standard_normal(N_ROWS),
+        'MG': rng.standard_normal(N_ROWS),
+        'Mode': rng.integers(1, 4, N_ROWS).astype(float),
+        'Circuit_ID': np.full(N_ROWS, i, dtype=np.int64),
+    })
+    if i != 2:
+        df['Phase_Class'] = rng.integers(0, 2, N_ROWS).astype(float)
+    return df if i != 3 else None
+
+
+def shared_segments():
+    return set(glob.glob('/dev/shm/psm_*'))
+
+
+def main():
+    items = [0, 1, 2, 3, 4]
+    expected = pd.concat([make_part(i) for i in items], ignore_index=True)
+    before = shared_segments()
+
+    for n_workers in (1, 3):
+        combined = process_map_frames(make_part, items, n_workers)
+        pd.testing.assert_frame_equal(combined, expected)
+
+        combined = process_map_frames(make_part, items, n_workers, float32=True)
+        pd.testing.assert_frame_equal(combined, expected.astype({
+            col: np.float32 for col in expected.columns if expected[col].dtype.kind == 'f'}))
+        print(f"{n_workers} worker(s): combined frame equals pd.concat (float64 and float32)")
+
+        # A failing item must not leave the other items' segments behind
+        try:
+            process_map_frames(make_part, [0, 1, -1, 4], n_workers)
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("The worker error was not raised")
+        assert shared_segments() == before, "Shared-memory segments leaked after a worker error"
+        print(f"{n_workers} worker(s): worker error re-raised, no segment left in /dev/shm")
+
+    assert process_map_frames(make_part, [3], 1) is None
+    print("Shared frame verification passed.")
+
+
+if __name__ == "__main__":
+    main()
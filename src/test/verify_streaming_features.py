@@ -0,0 +1,42 @@
+import numpy as np
+
+from src.lib.features import StreamingFeatureExtractor, extract_statistical_features
+from src.lib.synthetic import synthesize_emg
+
+# Firmware configuration: 2 channels, 500-sample context and 50-sample phase windows
+N_CHANNELS = 2
+WINDOW_LENGTHS = [500, 50]
+N_SAMPLES = 3000
+CHECK_EVERY = 25  # Inference tick (100 ms at 250 Hz)
+TOLERANCE = 1e-9
+
+
+def main():
+    rng = np.random.default_rng(42)
+    signal = np.abs(synthesize_emg(N_SAMPLES, rng, N_CHANNELS, fs=250.0))
+
+    extractor = StreamingFeatureExtractor(N_CHANNELS, WINDOW_LENGTHS)
+    max_error = {length: 0.0 for length in WINDOW_LENGTHS}
+    n_checks = 0
+
+    for t, sample in enumerate(signal):
+        extractor.push(sample)
+        if t % CHECK_EVERY != 0:
+            continue
+
+        for length in WINDOW_LENGTHS:
+            start = max(0, t + 1 - length)
+            expected = extract_statistical_features(signal[start:t + 1])
+            error = np.max(np.abs(extractor.features(length) - expected))
+            max_error[length] = max(max_error[length], error)
+        n_checks += 1
+
+    for length, error in max_error.items():
+        print(f"Window {length:4d} samples: max abs error {error:.3e} over {n_checks} ticks")
+        assert error < TOLERANCE, f"Streaming features diverge for window {length}"
+
+    print("Streaming feature verification passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import contextlib
+import io
+import logging
+import shutil
+import tempfile
+
+import numpy as np
+from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
+
+from src.lib.dataset import SlidingWindowDataset
+from src.lib.parallel import process_map
+from src.lib.streaming_lda import LDAStatistics, map_statistics
+from src.lib.synthetic import WALKING_MODES, mode_features, synthesize_emg, write_dataset
+from src import train_walking_mode_model
+
+N_WORKERS = 2
+CHANNELS = ['TA', 'MG']
+
+
+def chunk_statistics(chunk):
+    X, y = chunk
+    return LDAStatistics().update(X, y) if len(y) else None
+
+
+def max_rel_error(a, b):
+    return np.max(np.abs(a - b)) / np.max(np.abs(b))
+
+
+def check(stats, X, y, **params):
+    reference = LinearDiscriminantAnalysis(**params).fit(X, y)
+    model = stats.to_lda(**params)
+    coef_err = max_rel_error(model.coef_, reference.coef_)
+    intercept_err = max_rel_error(model.intercept_, reference.intercept_)
+    print(f"  {len(reference.classes_)} classes {params}: coef_ {coef_err:.1e}, intercept_ {intercept_err:.1e}")
+    assert coef_err < 1e-9 and intercept_err < 1e-9, "Streaming LDA diverges from LinearDiscriminantAnalysis.fit"
+    assert np.array_equal(model.classes_, reference.classes_)
+    assert np.allclose(model.means_, reference.means_, rtol=1e-12, atol=0)
+    assert np.array_equal(model.predict(X), reference.predict(X))
+    assert np.allclose(model.predict_proba(X), reference.predict_proba(X), atol=1e-9)
+    # Discriminant axes are only defined up to sign
+    assert np.allclose(np.abs(model.transform(X)), np.abs(reference.transform(X)), rtol=1e-8, atol=1e-10)
+    if params.get('store_covariance'):
+        assert np.allclose(model.covariance_, reference.covariance_, rtol=1e-10, atol=0)
+
+
+def assert_same_statistics(a, b):
+    assert a.counts == b.counts and a.n_features == b.n_features
+    for label in a.counts:
+        assert np.array_equal(a.means[label], b.means[label]) and np.array_equal(a.scatter[label], b.scatter[label])
+
+
+def check_empty(stats, n_features):
+    """Empty chunks and empty partial statistics leave the statistics unchanged."""
+    empty = LDAStatistics().merge(LDAStatistics())
+    assert empty.n_samples == 0 and empty.n_features is None and len(empty.classes) == 0
+
+    copy = LDAStatistics().merge(stats)
+    assert_same_statistics(copy, stats)
+    assert_same_statistics(copy.merge(LDAStatistics()), stats)
+    assert_same_statistics(copy.update(np.zeros((0, n_features)), np.zeros(0)), stats)
+    # An empty window dataset still has its feature width
+    X_none, y_none = SlidingWindowDataset([], 200, 50, 250, n_channels=n_features // 3).extract_features()
+    assert_same_statistics(copy.update(X_none, y_none), stats)
+    assert LDAStatistics().update(X_none, y_none).n_samples == 0
+    print("  Empty chunks and empty partial statistics merge as no-ops")
+
+
+def check_train_streaming():
+    """train_streaming scores the held-out windows per subject into counts equal to predicting them at once."""
+    # Stratifying needs two windows per mode; a singleton mode falls back to a plain split
+    y = np.array([1] * 8 + [2] * 5 + [3])
+    X_train, X_test, _, _ = train_walking_mode_model.split_holdout(np.zeros((len(y), 6)), y)
+    assert len(X_train) + len(X_test) == len(y)
+
+    root = tempfile.mkdtemp(prefix='neurogait_verify_streaming_')
+    subjects = ['SY001', 'SY002']
+    try:
+        write_dataset(root, subjects, n_circuits=2, circuit_seconds=60, seed=1)
+        args = (root, subjects, CHANNELS, CHANNELS + ['Mode'], train_walking_mode_model.MODE_NAMES, 250, 1000, 100)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model, counts = train_walking_mode_model.train_streaming(*args, n_workers=N_WORKERS)
+            # The same per-subject windows and split, held in memory
+            held_out = []
+            for subject in subjects:
+                df = train_walking_mode_model.preprocess_subject(subject, root, *args[2:6])
+                X, y = train_walking_mode_model.create_windowed_features(df, CHANNELS, 1000, 100, 250)
+                held_out.append(train_walking_mode_model.split_holdout(X, y)[1::2])
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    X_test = np.concatenate([X for X, _ in held_out])
+    y_test = np.concatenate([y for _, y in held_out])
+    y_pred = model.predict(X_test)
+    pairs, n = np.unique(np.stack([y_test, y_pred], axis=1), axis=0, return_counts=True)
+    assert counts == dict(zip(map(tuple, pairs.tolist()), n.tolist())), "Held-out counts differ"
+    accuracy = sum(c for (t, p), c in counts.items() if t == p) / sum(counts.values())
+    print(f"  train_streaming: {sum(counts.values())} held-out windows scored per subject, "
+          f"accuracy {100 * accuracy:.2f} %")
+
+
+def main():
+    logging.getLogger('src.lib.data_loader').setLevel(logging.WARNING)
+    rng = np.random.default_rng(0)
+    # Windowed MAV/RMS/WL features of synthetic circuits: scales differ by ~100x
+    X, y = mode_features(6, rng, n_channels=2)
+
+    # Uneven chunks (one empty), some missing classes, accumulated in one process
+    bounds = [0, 7, 1000, 1000, 1003, 3000, 5000, len(y)]
+    order = np.argsort(y, kind='stable')  # Class-sorted stream: most chunks hold one class
+    chunks = [(X[order[a:b]], y[order[a:b]]) for a, b in zip(bounds[:-1], bounds[1:])]
+    stats = LDAStatistics.from_chunks(chunks)
+    assert stats.n_samples == len(y)
+    print(f"Serial: {len(chunks)} chunks, {stats.n_samples} samples")
+    check(stats, X, y)
+    priors = np.arange(1.0, len(stats.classes) + 1)
+    check(stats, X, y, priors=(priors / priors.sum()).round(3).tolist(), store_covariance=True)
+    check(stats, X, y, n_components=2)
+    check_empty(stats, X.shape[1])
+
+    # Worker statistics merged in a different grouping give the same model; empty items give None
+    items = [(X[i::5], y[i::5]) for i in range(5)] + [(X[:0], y[:0])]
+    parts = process_map(chunk_statistics, items, N_WORKERS)
+    merged = LDAStatistics()
+    for part in parts:
+        if part is not None:
+            merged.merge(part)
+    print(f"Merged from {len(parts)} worker results")
+    check(merged, X, y)
+    check(map_statistics(chunk_statistics, items, N_WORKERS), X, y)
+
+    # Binary case (single coef_ row): walking vs sitting / standing
+    walking = np.isin(y, WALKING_MODES)
+    check(LDAStatistics.from_chunks([(X[:2000], walking[:2000]), (X[2000:], walking[2000:])]), X, walking)
+
+    # Windows streamed from a dataset, one segment at a time
+    segments = [(np.abs(synthesize_emg(n, rng, 2, fs=250.0)) * (1 + label), np.full(n, label)) for n, label in
+                ((900, 0), (1200, 1), (700, 0), (1500, 2), (800, 1))]
+    dataset = SlidingWindowDataset(segments, window_size_ms=200, step_size_ms=50, fs=250)
+    X_windows, y_windows = dataset.extract_features()
+    print(f"Dataset: {len(y_windows)} windows")
+    check(LDAStatistics.from_chunks(dataset.iter_features()), X_windows, y_windows)
+
+    check_train_streaming()
+
+    print("Streaming LDA verification passed.")
+
+
+if __name__ == "__main__":
+    main()
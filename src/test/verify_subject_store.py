@@ -0,0 +1,96 @@
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from src.lib.data_loader import Enabl3sDataLoader
+from src.lib.dataset import MultiModeDataset, SlidingWindowDataset
+from src.lib.subject_store import SubjectStore
+from src.lib.synthetic import LEVEL_WALKING, STAIR_ASCENT, STAIR_DESCENT, synthesize_circuit
+
+FS = 1000.0
+CHANNELS = ['TA', 'MG', 'SOL']
+SEGMENT_COLS = ['Circuit_ID', 'Mode']
+WINDOW_MS = 200
+STEP_MS = 50
+
+
+def make_frame(rng, n_circuits=3, circuit_seconds=20):
+    """Synthetic circuits with Phase_Class labels (NaN outside level walking) and a few NaN samples."""
+    parts = []
+    for cid in range(1, n_circuits + 1):
+        raw, heel, toe = synthesize_circuit(int(circuit_seconds * FS), rng, ascent=STAIR_ASCENT,
+                                            descent=STAIR_DESCENT)
+        stance = Enabl3sDataLoader.events_to_labels_batch([len(raw)], [heel], [toe])[0]
+        part = pd.DataFrame({ch: raw[f'Right_{ch}'] for ch in CHANNELS})
+        part['Mode'] = raw['Mode']
+        part['Circuit_ID'] = cid
+        part['Phase_Class'] = np.where(raw['Mode'] == LEVEL_WALKING, 1.0 - stance, np.nan)
+        parts.append(part)
+    df = pd.concat(parts, ignore_index=True)
+    # One NaN sample inside a walking segment: the whole segment must be dropped
+    walking = np.flatnonzero(df['Mode'].to_numpy() == LEVEL_WALKING)
+    df.loc[walking[len(walking) // 2], 'MG'] = np.nan
+    return df
+
+
+def expected_offsets(df):
+    keys = df[SEGMENT_COLS].to_numpy()
+    changed = np.any(keys[1:] != keys[:-1], axis=1)
+    return np.concatenate(([0], np.flatnonzero(changed) + 1, [len(df)]))
+
+
+def assert_same_segments(store, store_segments, frame_segments, views):
+    assert len(store_segments) == len(frame_segments), "Segment count differs"
+    for (X_s, y_s), (X_f, y_f) in zip(store_segments, frame_segments):
+        assert np.shares_memory(X_s, store.signals) == views, "Unexpected copy / view of the store"
+        assert np.array_equal(X_s, X_f.astype(np.float32)), "Signals differ"
+        assert np.array_equal(y_s, y_f.astype(np.float32)), "Labels differ"
+
+
+def main():
+    df = make_frame(np.random.default_rng(3))
+    path = tempfile.mkdtemp(prefix='neurogait_store_')
+    try:
+        SubjectStore.write(path, df, CHANNELS, ['Mode', 'Phase_Class'], SEGMENT_COLS, FS)
+        store = SubjectStore(path)
+        assert len(store) == len(df) and store.channels == CHANNELS and store.fs == FS
+        assert store.signals.dtype == np.float32 and isinstance(store.signals, np.memmap)
+
+        # A new segment wherever Circuit_ID or Mode changes
+        assert np.array_equal(store.segment_offsets, expected_offsets(df)), "Segment boundaries differ"
+        print(f"Store: {len(store)} samples, {store.n_segments} segments, "
+              f"{int(store.segment_nan.sum())} with NaN signals")
+        assert store.segment_nan.sum() == 1
+
+        # Valid segments (no NaN signal or label) match MultiModeDataset on the frame
+        for label_col in ('Mode', 'Phase_Class'):
+            for channels in (None, ['MG'], ['MG', 'SOL'], ['SOL', 'TA'], ['TA', 'SOL']):
+                feature_cols = CHANNELS if channels is None else channels
+                reference = MultiModeDataset(df, feature_cols, label_col, group_col=SEGMENT_COLS,
+                                             window_size_ms=0.0, step_size_ms=1000.0, fs=FS)
+                # Adjacent channels in stored order stay views of the memory map, other subsets are copies
+                idx = [CHANNELS.index(c) for c in feature_cols]
+                views = idx == list(range(idx[0], idx[0] + len(idx)))
+                assert_same_segments(store, store.segments(label_col, channels), reference.segments, views)
+        print("Segments match MultiModeDataset for all label / channel combinations")
+
+        # Windowed dataset over two stores (same data twice)
+        dataset = SlidingWindowDataset.from_store([path, path], 'Phase_Class', WINDOW_MS, STEP_MS, channels=['MG'])
+        reference = MultiModeDataset(df, ['MG'], 'Phase_Class', group_col=SEGMENT_COLS,
+                                     window_size_ms=WINDOW_MS, step_size_ms=STEP_MS, fs=FS)
+        assert len(dataset) == 2 * len(reference)
+        X, y = dataset.extract_features()
+        X_ref, y_ref = reference.extract_features()
+        assert np.array_equal(y, np.concatenate([y_ref, y_ref]))
+        assert np.allclose(X, np.concatenate([X_ref, X_ref]), rtol=1e-5, atol=1e-8)
+        print(f"from_store: {len(dataset)} windows, features match the frame to float32 precision")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    print("Subject store verification passed.")
+
+
+if __name__ == "__main__":
+    main()
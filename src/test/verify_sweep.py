@@ -0,0 +1,60 @@
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from src.lib.preprocess import EMGPreprocessor
+from src.lib.sweep import FeatureStore, SweepPoint, evaluate_point, prepare_subject
+from src.lib.synthetic import write_dataset
+from src import train_gait_phase_model, train_walking_mode_model
+
+CHANNELS = ['TA', 'MG']
+FS = 250.0
+
+
+def main():
+    logging.getLogger('src.lib.data_loader').setLevel(logging.WARNING)
+    root = tempfile.mkdtemp(prefix='neurogait_verify_sweep_')
+    try:
+        data_root = os.path.join(root, 'data')
+        write_dataset(data_root, ['SY001'], n_circuits=2, circuit_seconds=90, seed=3)
+
+        # The training scripts filter with the EMGPreprocessor default design
+        filter_fs = EMGPreprocessor().fs
+        cases = (
+            ('walking_mode', train_walking_mode_model, [(2000, 100), (300, 50)],
+             lambda: train_walking_mode_model.preprocess_subject(
+                 'SY001', data_root, CHANNELS, CHANNELS + ['Mode'], list(train_walking_mode_model.MODE_NAMES), FS)),
+            ('gait_phase', train_gait_phase_model, [(200, 50), (500, 100)],
+             lambda: train_gait_phase_model.preprocess_subject(
+                 'SY001', data_root, CHANNELS, CHANNELS + ['Mode'], FS)),
+        )
+        for task, script, grid, preprocess in cases:
+            store_root = os.path.join(root, task)
+            prepare_subject('SY001', data_root, CHANNELS, [FS], task, store_root, filter_fs=filter_fs)
+            store = FeatureStore(os.path.join(store_root, f"{FS:g}", 'SY001'))
+            df = preprocess()
+            for window_ms, step_ms in grid:
+                X, y = script.create_windowed_features(df, CHANNELS, window_ms, step_ms, FS)
+                X_sweep, y_sweep = store.features(int(window_ms * FS / 1000), int(step_ms * FS / 1000))
+                assert np.array_equal(X, X_sweep) and np.array_equal(y, y_sweep), \
+                    f"{task} {window_ms}/{step_ms} ms: prefix-sum features differ from the training script"
+                result = evaluate_point(SweepPoint(window_ms, step_ms, FS), store_root, ['SY001'], task, filter_fs)
+                print(f"{task} {window_ms}/{step_ms} ms: {len(y)} windows identical, "
+                      f"accuracy {100 * result['accuracy']:.2f} %")
+                assert 0.0 <= result['accuracy'] <= 1.0
+
+            # Windows longer than every segment: no rows, but still one column per feature
+            X_empty, y_empty = store.features(int(store.segments[:, 2].max()) + 1, 1)
+            X, _ = script.create_windowed_features(df, CHANNELS, 1000.0 * (len(df) + 1) / FS, 100, FS)
+            assert X_empty.shape == X.shape == (0, 3 * len(CHANNELS)) and len(y_empty) == 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print("Sweep verification passed.")
+
+
+if __name__ == "__main__":
+    main()
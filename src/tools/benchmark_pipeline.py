@@ -0,0 +1,185 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import scipy
+import sklearn
+
+from src.lib.data_loader import Enabl3sDataLoader
+from src.lib.dataset import MultiModeDataset
+from src.lib.preprocess import EMGPreprocessor
+from src.lib.synthetic import FS, subject_ids, write_dataset
+from src.lib.train import train_LDA
+from src.lib.utils import resample_df
+
+EMG_CHANNELS = ['TA', 'MG']
+MODES = [0, 1, 2, 3]
+
+
+class StageTimer:
+    """Wall time and traced peak memory (tracemalloc, above the level at entry) per stage."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def __call__(self, name):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] - base
+        self.stages[name] = {'seconds': seconds, 'peak_mb': peak / 1e6}
+
+
+def run_scale(data_root, subjects, n_circuits, target_fs, window_size_ms, step_size_ms):
+    """
+    Runs the walking mode training pipeline on `subjects`, one timed stage at a time.
+
+    Returns:
+        dict: Per-stage seconds / peak MB, sample and window counts.
+    """
+    timer = StageTimer()
+    load_channels = EMG_CHANNELS + ['Mode']
+
+    with timer('load_dataset_batch'):
+        frames = [Enabl3sDataLoader(data_root, s).load_dataset_batch(range(1, n_circuits + 1), load_channels)
+                  for s in subjects]
+    raw_samples = sum(len(df) for df in frames)
+
+    with timer('resample_df'):
+        frames = [resample_df(df, target_fs, 'Label_Phase', source_fs=FS) for df in frames]
+
+    df = pd.concat(frames, ignore_index=True)
+    del frames
+    df = df[df['Mode'].isin(MODES)]
+
+    with timer('apply_filter'):
+        preprocessor = EMGPreprocessor()
+        emg = df[EMG_CHANNELS].to_numpy(dtype=np.float64, copy=True)
+        preprocessor.apply_filter(emg, out=emg)
+        preprocessor.rectify(emg, out=emg)
+    df[EMG_CHANNELS] = emg
+    del emg
+
+    with timer('MultiModeDataset'):
+        dataset = MultiModeDataset(df, EMG_CHANNELS, 'Mode', window_size_ms=window_size_ms,
+                                   step_size_ms=step_size_ms, fs=target_fs)
+
+    with timer('extract_features'):
+        X, y = dataset.extract_features()
+
+    with timer('train_LDA'), contextlib.redirect_stdout(io.StringIO()):
+        train_LDA(X, y)
+
+    return {
+        'subjects': len(subjects),
+        'raw_samples': raw_samples,
+        'samples': len(df),
+        'windows': len(y),
+        'stages': timer.stages,
+        'total_seconds': sum(s['seconds'] for s in timer.stages.values()),
+    }
+
+
+def environment():
+    """Versions and host details stored with the results."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'scipy': scipy.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def print_table(result):
+    print(f"\n{result['subjects']} subjects: {result['raw_samples']} raw samples, "
+          f"{result['samples']} at target rate, {result['windows']} windows")
+    print(f"  {'Stage':20s} {'seconds':>9s} {'peak MB':>9s}")
+    for name, stage in result['stages'].items():
+        print(f"  {name:20s} {stage['seconds']:9.3f} {stage['peak_mb']:9.1f}")
+    print(f"  {'total':20s} {result['total_seconds']:9.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Times and memory-profiles the training pipeline on synthetic ENABL3S subjects.")
+    parser.add_argument('--subjects', type=int, nargs='+', default=[1, 5, 10, 25, 50],
+                        help="Subject counts to benchmark")
+    parser.add_argument('--circuits', type=int, default=2, help="Circuits per subject")
+    parser.add_argument('--circuit-seconds', type=float, default=60.0)
+    parser.add_argument('--data-root', default=None,
+                        help="Keep the synthetic subjects here and reuse them across runs (default: temporary)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--target-fs', type=float, default=250.0)
+    parser.add_argument('--window-ms', type=float, default=2000.0)
+    parser.add_argument('--step-ms', type=float, default=100.0)
+    parser.add_argument('--output', default='benchmark_pipeline.json')
+    args = parser.parse_args()
+
+    logging.getLogger('src.lib.data_loader').setLevel(logging.WARNING)
+    data_root = args.data_root or tempfile.mkdtemp(prefix='neurogait_bench_')
+    ids = subject_ids(max(args.subjects))
+
+    try:
+        print(f"Generating {len(ids)} synthetic subjects in {data_root} ...")
+        t0 = time.perf_counter()
+        write_dataset(data_root, ids, args.circuits, args.circuit_seconds, seed=args.seed)
+        print(f"  done in {time.perf_counter() - t0:.1f} s")
+
+        results = []
+        tracemalloc.start()
+        for n in sorted(args.subjects):
+            result = run_scale(data_root, ids[:n], args.circuits, args.target_fs, args.window_ms, args.step_ms)
+            print_table(result)
+            results.append(result)
+        tracemalloc.stop()
+    finally:
+        if args.data_root is None:
+            shutil.rmtree(data_root, ignore_errors=True)
+
+    report = {
+        'benchmark': 'pipeline',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': environment(),
+        'config': {
+            'circuits': args.circuits,
+            'circuit_seconds': args.circuit_seconds,
+            'seed': args.seed,
+            'target_fs': args.target_fs,
+            'window_ms': args.window_ms,
+            'step_ms': args.step_ms,
+            'channels': EMG_CHANNELS,
+        },
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
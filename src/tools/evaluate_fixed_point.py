@@ -0,0 +1,137 @@
+import argparse
+import joblib
+import numpy as np
+from scipy import signal
+
+from src.lib.data_loader import Enabl3sDataLoader
+from src.lib.fixed_point import (FIRMWARE_BANDPASS, FIRMWARE_NOTCH, QuantizedLDA, condition_q15,
+                                 feature_shifts, from_q15, running_features_q15, to_q15)
+
+# Firmware configuration (embedded/main.cpp, feature_extraction.h)
+DECIMATION = 4       # 1000 Hz -> 250 Hz, every 4th raw row
+TICK = 25            # Inference every 100 ms
+CONTEXT_WINDOW = 500
+PHASE_WINDOW = 50
+CHANNELS = ['TA', 'MG']
+
+
+def running_features_float(samples, window_len, ticks):
+    """Float counterpart of `running_features_q15` (same windows and WL convention)."""
+    rect = np.abs(samples.astype(np.float64))
+    prev = np.vstack([np.zeros((1, rect.shape[1])), rect[:-1]])
+    zero = np.zeros((1, rect.shape[1]))
+    cs_abs = np.vstack([zero, np.cumsum(rect, axis=0)])
+    cs_sq = np.vstack([zero, np.cumsum(rect * rect, axis=0)])
+    cs_wl = np.vstack([zero, np.cumsum(np.abs(rect - prev), axis=0)])
+
+    stop = ticks + 1
+    start = np.maximum(stop - window_len, 0)
+    n = (stop - start)[:, None]
+    mav = (cs_abs[stop] - cs_abs[start]) / n
+    rms = np.sqrt(np.maximum(cs_sq[stop] - cs_sq[start], 0) / n)
+    wl = cs_wl[stop] - cs_wl[start]
+    return np.stack([mav, rms, wl], axis=2).reshape(len(ticks), -1)
+
+
+def replay_circuit(raw, walking_model, phase_model, walking_q15, phase_q15, full_scale):
+    """
+    Replays one decimated circuit through the float and the Q15 chains.
+
+    Returns:
+        dict: Per-tick predictions of both chains, ground-truth mode and feature errors.
+    """
+    n = len(raw)
+    ticks = np.arange(0, n, TICK)
+    ticks = ticks[ticks >= CONTEXT_WINDOW]
+    if len(ticks) == 0:
+        return None
+
+    # Float firmware chain (SignalConditioner, RunningFeatureExtractor)
+    emg = raw[CHANNELS].to_numpy(dtype=np.float32)
+    filtered = emg.astype(np.float64)
+    for b0, b1, b2, a1, a2 in (FIRMWARE_BANDPASS, FIRMWARE_NOTCH):
+        filtered = signal.lfilter([b0, b1, b2], [1.0, a1, a2], filtered, axis=0)
+    ctx = running_features_float(filtered, CONTEXT_WINDOW, ticks)
+    phs = running_features_float(filtered, PHASE_WINDOW, ticks)
+
+    # Q15 firmware chain (SignalConditionerQ15, RunningFeatureExtractorQ15)
+    q15 = to_q15(emg, full_scale)
+    filtered_q15 = np.stack([condition_q15(q15[:, ch]) for ch in range(q15.shape[1])], axis=1)
+    ctx_q15 = running_features_q15(filtered_q15, CONTEXT_WINDOW, ticks)
+    phs_q15 = running_features_q15(filtered_q15, PHASE_WINDOW, ticks)
+
+    ctx_error = np.abs(from_q15(ctx_q15, full_scale) - ctx) / np.maximum(np.abs(ctx), 1e-12)
+    return {
+        'mode_true': raw['Mode'].to_numpy()[ticks] if 'Mode' in raw.columns else None,
+        'mode_float': walking_model.predict(ctx),
+        'mode_q15': walking_q15.predict(ctx_q15),
+        'phase_float': phase_model.predict(phs),
+        'phase_q15': phase_q15.predict(phs_q15),
+        'saturated': int(np.sum((q15 == 32767) | (q15 == -32768))),
+        'samples': q15.size,
+        'ctx_rel_error': np.median(ctx_error, axis=0),
+    }
+
+
+def print_report(name, results):
+    mode_float = np.concatenate([r['mode_float'] for r in results])
+    mode_q15 = np.concatenate([r['mode_q15'] for r in results])
+    phase_float = np.concatenate([r['phase_float'] for r in results])
+    phase_q15 = np.concatenate([r['phase_q15'] for r in results])
+    saturated = sum(r['saturated'] for r in results) / sum(r['samples'] for r in results)
+    rel_error = np.median(np.stack([r['ctx_rel_error'] for r in results]), axis=0)
+
+    print(f"\n{name}: {len(mode_float)} ticks")
+    print(f"  Input saturation:       {100 * saturated:.3f} % of samples")
+    print(f"  Mode agreement:         {100 * np.mean(mode_float == mode_q15):.2f} %")
+    print(f"  Phase agreement:        {100 * np.mean(phase_float == phase_q15):.2f} %")
+    if all(r['mode_true'] is not None for r in results):
+        mode_true = np.concatenate([r['mode_true'] for r in results])
+        print(f"  Mode accuracy (float):  {100 * np.mean(mode_float == mode_true):.2f} %")
+        print(f"  Mode accuracy (Q15):    {100 * np.mean(mode_q15 == mode_true):.2f} %")
+    names = [f"{ch}_{feat}" for ch in CHANNELS for feat in ('MAV', 'RMS', 'WL')]
+    print("  Median rel. feature error (context): " +
+          ", ".join(f"{n}={e:.1e}" for n, e in zip(names, rel_error)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Accuracy loss of the Q15 firmware chain against the float chain on ENABL3S.")
+    parser.add_argument('--data-root', default='data')
+    parser.add_argument('--subjects', nargs='+', default=['AB156'])
+    parser.add_argument('--circuits', type=int, default=50, help="Circuits 1..N per subject")
+    parser.add_argument('--walking-model', default='models/state_classifier.pkl')
+    parser.add_argument('--phase-model', default='models/gait_phase/gait_phase_classifier.pkl')
+    parser.add_argument('--full-scale', type=float, default=1.0,
+                        help="Input amplitude mapped to Q15 1.0 (NEUROGAIT_EMG_FULL_SCALE)")
+    args = parser.parse_args()
+
+    walking_model = joblib.load(args.walking_model)
+    phase_model = joblib.load(args.phase_model)
+    walking_q15 = QuantizedLDA.from_float(walking_model.coef_, walking_model.intercept_, walking_model.classes_,
+                                          feature_shifts(CONTEXT_WINDOW, len(CHANNELS)), args.full_scale)
+    phase_q15 = QuantizedLDA.from_float(phase_model.coef_, phase_model.intercept_, phase_model.classes_,
+                                        feature_shifts(PHASE_WINDOW, len(CHANNELS)), args.full_scale)
+
+    all_results = []
+    for subject in args.subjects:
+        loader = Enabl3sDataLoader(args.data_root, subject)
+        results = []
+        for cid in range(1, args.circuits + 1):
+            raw = loader.load_circuit(cid, CHANNELS + ['Mode'])
+            if raw.empty or not all(ch in raw.columns for ch in CHANNELS):
+                continue
+            result = replay_circuit(raw.iloc[::DECIMATION], walking_model, phase_model,
+                                    walking_q15, phase_q15, args.full_scale)
+            if result is not None:
+                results.append(result)
+        if results:
+            print_report(subject, results)
+            all_results.extend(results)
+
+    if len(args.subjects) > 1 and all_results:
+        print_report("ALL SUBJECTS", all_results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import argparse
+import os
+import numpy as np
+
+from src.lib.data_loader import Enabl3sDataLoader
+from src.lib.frames import write_frames
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Exports ENABL3S raw circuits as binary frame files (.ngf) for neurogait_sim.")
+    parser.add_argument('--data-root', default='data')
+    parser.add_argument('--subjects', nargs='+', default=['AB156'])
+    parser.add_argument('--circuits', type=int, default=50, help="Circuits 1..N per subject")
+    parser.add_argument('--channels', nargs='+', default=['TA', 'MG', 'Mode'],
+                        help="Loader channel names to export (the simulator reads TA, MG and Mode)")
+    parser.add_argument('--decimation', type=int, default=4,
+                        help="Keep every Nth raw row (4: 1000 Hz -> 250 Hz, the firmware rate)")
+    parser.add_argument('--output', default=os.path.join('data', 'frames'))
+    args = parser.parse_args()
+
+    n_files = 0
+    for subject in args.subjects:
+        loader = Enabl3sDataLoader(args.data_root, subject)
+        out_dir = os.path.join(args.output, subject)
+        os.makedirs(out_dir, exist_ok=True)
+
+        for cid in range(1, args.circuits + 1):
+            raw = loader.load_circuit(cid, args.channels)
+            if raw.empty or not all(ch in raw.columns for ch in args.channels):
+                continue
+            data = raw[args.channels].to_numpy(dtype=np.float32)[::args.decimation]
+            path = os.path.join(out_dir, f"{subject}_Circuit_{cid:03d}.ngf")
+            write_frames(path, data, args.channels, loader.original_fs / args.decimation)
+            n_files += 1
+        print(f"{subject}: frames written to {out_dir}")
+
+    print(f"Exported {n_files} circuits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import argparse
+import os
+
+from src.lib.synthetic import write_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Writes synthetic subjects in the ENABL3S layout (Raw, Processed, Metadata), "
+                    "e.g. to run the training and test scripts without the dataset.")
+    parser.add_argument('--data-root', default='data')
+    parser.add_argument('--subjects', nargs='+', default=['SY001'],
+                        help="Subject IDs to generate (e.g. AB156 to stand in for the scripts' default subject)")
+    parser.add_argument('--circuits', type=int, default=10)
+    parser.add_argument('--circuit-seconds', type=float, default=120.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--overwrite', action='store_true', help="Regenerate existing subjects")
+    args = parser.parse_args()
+
+    for subject in args.subjects:
+        if os.path.exists(os.path.join(args.data_root, subject, 'Raw')) and not args.overwrite:
+            print(f"{subject}: already present, skipped (--overwrite to regenerate)")
+            continue
+        write_dataset(args.data_root, [subject], args.circuits, args.circuit_seconds,
+                      seed=args.seed, overwrite=True)
+        print(f"{subject}: {args.circuits} circuits x {args.circuit_seconds:.0f} s written to "
+              f"{os.path.join(args.data_root, subject)}")
+
+
+if __name__ == "__main__":
+    main()
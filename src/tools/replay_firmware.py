@@ -0,0 +1,125 @@
+import argparse
+import time
+import joblib
+import numpy as np
+from scipy import signal
+
+from src.lib.data_loader import Enabl3sDataLoader
+from src.lib.firmware import FirmwareLibrary
+from src.lib.fixed_point import FIRMWARE_BANDPASS, FIRMWARE_NOTCH
+from src.tools.evaluate_fixed_point import (CHANNELS, CONTEXT_WINDOW, DECIMATION, PHASE_WINDOW,
+                                            running_features_float)
+
+
+def compare_circuit(firmware, raw, walking_model, phase_model):
+    """
+    Replays one decimated circuit through the firmware library and compares every stage
+    with the Python implementation.
+
+    Returns:
+        dict: Per-stage errors and per-tick decisions, or None if the circuit is too short.
+    """
+    emg = raw[CHANNELS].to_numpy(dtype=np.float32)
+    t0 = time.perf_counter()
+    replay = firmware.replay(emg)
+    elapsed = time.perf_counter() - t0
+    if len(replay.tick_index) == 0:
+        return None
+
+    # Stage 1: conditioning (float64 reference of the firmware biquads)
+    filtered = emg.astype(np.float64)
+    for b0, b1, b2, a1, a2 in (FIRMWARE_BANDPASS, FIRMWARE_NOTCH):
+        filtered = signal.lfilter([b0, b1, b2], [1.0, a1, a2], filtered, axis=0)
+    filter_error = np.max(np.abs(replay.filtered - filtered))
+
+    # Stage 2: features at the firmware's ticks
+    ticks = replay.tick_index
+    ctx = running_features_float(filtered, CONTEXT_WINDOW, ticks)
+    phs = running_features_float(filtered, PHASE_WINDOW, ticks)
+    ctx_error = np.abs(replay.context_features - ctx) / np.maximum(np.abs(ctx), 1e-12)
+    phs_error = np.abs(replay.phase_features - phs) / np.maximum(np.abs(phs), 1e-12)
+
+    # Stage 3: decisions of the Python models on the firmware's own features
+    walking = replay.mode != 0
+    return {
+        'samples': len(emg),
+        'seconds': elapsed,
+        'filter_max_error': filter_error,
+        'ctx_rel_error': np.median(ctx_error, axis=0),
+        'phs_rel_error': np.median(phs_error, axis=0),
+        'mode_true': raw['Mode'].to_numpy()[ticks] if 'Mode' in raw.columns else None,
+        'mode_fw': replay.mode,
+        'mode_py': walking_model.predict(replay.context_features) if walking_model else None,
+        'phase_fw': replay.phase[walking],
+        'phase_py': phase_model.predict(replay.phase_features[walking]) if phase_model else None,
+        'stimulating': replay.stimulating,
+    }
+
+
+def print_report(name, results):
+    samples = sum(r['samples'] for r in results)
+    seconds = sum(r['seconds'] for r in results)
+    mode_fw = np.concatenate([r['mode_fw'] for r in results])
+    stim = np.concatenate([r['stimulating'] for r in results])
+    names = [f"{ch}_{feat}" for ch in CHANNELS for feat in ('MAV', 'RMS', 'WL')]
+
+    print(f"\n{name}: {len(results)} circuits, {samples} samples, {len(mode_fw)} ticks")
+    print(f"  Replay speed:            {samples / seconds / 1e6:.1f} M samples/s "
+          f"({samples / 250.0 / seconds:.0f}x real time)")
+    print(f"  Filter max abs error:    {max(r['filter_max_error'] for r in results):.2e}")
+    for key, label in (('ctx_rel_error', 'context'), ('phs_rel_error', 'phase')):
+        error = np.median(np.stack([r[key] for r in results]), axis=0)
+        print(f"  Median rel. error ({label:7s}): " + ", ".join(f"{n}={e:.1e}" for n, e in zip(names, error)))
+    if all(r['mode_py'] is not None for r in results):
+        mode_py = np.concatenate([r['mode_py'] for r in results])
+        print(f"  Mode agreement (Python): {100 * np.mean(mode_fw == mode_py):.2f} %")
+    if all(r['phase_py'] is not None for r in results):
+        phase_fw = np.concatenate([r['phase_fw'] for r in results])
+        phase_py = np.concatenate([r['phase_py'] for r in results])
+        if len(phase_fw):
+            print(f"  Phase agreement (Python, walking ticks): {100 * np.mean(phase_fw == phase_py):.2f} %")
+    if all(r['mode_true'] is not None for r in results):
+        mode_true = np.concatenate([r['mode_true'] for r in results])
+        print(f"  Mode accuracy (firmware): {100 * np.mean(mode_fw == mode_true):.2f} %")
+    print(f"  Stimulation duty cycle:  {100 * np.mean(stim):.1f} % of ticks")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replays ENABL3S circuits through the firmware library and compares it stage by stage with Python.")
+    parser.add_argument('--data-root', default='data')
+    parser.add_argument('--subjects', nargs='+', default=['AB156'])
+    parser.add_argument('--circuits', type=int, default=50, help="Circuits 1..N per subject")
+    parser.add_argument('--library', default=None, help="Path of libneurogait.so (default: embedded/)")
+    parser.add_argument('--walking-model', default='models/state_classifier.pkl',
+                        help="Python model to compare decisions with ('' to skip)")
+    parser.add_argument('--phase-model', default='models/gait_phase/gait_phase_classifier.pkl',
+                        help="Python model to compare decisions with ('' to skip)")
+    args = parser.parse_args()
+
+    firmware = FirmwareLibrary(args.library)
+    print(f"Firmware library: {firmware.path} ({'Q15' if firmware.fixed_point else 'float'} chain)")
+    walking_model = joblib.load(args.walking_model) if args.walking_model else None
+    phase_model = joblib.load(args.phase_model) if args.phase_model else None
+
+    all_results = []
+    for subject in args.subjects:
+        loader = Enabl3sDataLoader(args.data_root, subject)
+        results = []
+        for cid in range(1, args.circuits + 1):
+            raw = loader.load_circuit(cid, CHANNELS + ['Mode'])
+            if raw.empty or not all(ch in raw.columns for ch in CHANNELS):
+                continue
+            result = compare_circuit(firmware, raw.iloc[::DECIMATION], walking_model, phase_model)
+            if result is not None:
+                results.append(result)
+        if results:
+            print_report(subject, results)
+            all_results.extend(results)
+
+    if len(args.subjects) > 1 and all_results:
+        print_report("ALL SUBJECTS", all_results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import argparse
+import json
+import logging
+import shutil
+import tempfile
+import time
+from functools import partial
+
+import numpy as np
+
+from src.lib.parallel import process_map
+from src.lib.sweep import TASKS, evaluate_point, prepare_subject, sweep_grid
+from src.lib.synthetic import subject_ids, write_dataset
+
+EMG_CHANNELS = ['TA', 'MG']
+
+
+def pareto_front(results):
+    """Indices of points no other point beats on both accuracy and firmware ops/s."""
+    valid = [i for i, r in enumerate(results) if not np.isnan(r['accuracy'])]
+    front = set()
+    for i in valid:
+        a, c = results[i]['accuracy'], results[i]['ops_per_s']
+        if not any(results[j]['accuracy'] >= a and results[j]['ops_per_s'] <= c and
+                   (results[j]['accuracy'] > a or results[j]['ops_per_s'] < c) for j in valid):
+            front.add(i)
+    return front
+
+
+def print_table(results):
+    front = pareto_front(results)
+    print(f"\n  {'fs':>6s} {'win ms':>7s} {'step ms':>7s} {'windows':>8s} {'accuracy':>9s} "
+          f"{'inf/s':>6s} {'ops/s':>9s} {'win B':>6s} {'host s':>7s}")
+    for i, r in enumerate(results):
+        if np.isnan(r['accuracy']):
+            print(f"  {r['fs']:6g} {r['window_ms']:7g} {r['step_ms']:7g} {r.get('windows', 0):8d}   "
+                  f"skipped: {r.get('error', '')}")
+            continue
+        seconds = r['feature_seconds'] + r['train_seconds']
+        mark = '*' if i in front else ' '
+        print(f"{mark} {r['fs']:6g} {r['window_ms']:7g} {r['step_ms']:7g} {r['windows']:8d} "
+              f"{100 * r['accuracy']:8.2f}% {r['inferences_per_s']:6.1f} {r['ops_per_s']:9.0f} "
+              f"{r['window_bytes']:6d} {seconds:7.3f}")
+    print("  (* = Pareto front of accuracy vs estimated firmware ops/s; win B = int16 window buffers)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Window / step / sample-rate sweep of the LDA classifiers. Each subject is loaded and "
+                    "filtered once per rate; all grid points read their features from shared prefix sums.")
+    parser.add_argument('--task', choices=sorted(TASKS), default='walking_mode')
+    parser.add_argument('--data-root', default='data')
+    parser.add_argument('--subjects', nargs='+', default=['AB156'])
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help="Sweep N synthetic subjects generated in a temporary directory instead")
+    parser.add_argument('--windows', type=float, nargs='+', default=[100, 200, 300, 500, 1000, 2000],
+                        help="Window lengths in ms")
+    parser.add_argument('--steps', type=float, nargs='+', default=[25, 50, 100, 200],
+                        help="Steps in ms (points with step > window are skipped)")
+    parser.add_argument('--rates', type=float, nargs='+', default=[250.0, 500.0],
+                        help="Sample rates in Hz (divisors of the 1000 Hz recordings)")
+    parser.add_argument('--filter-fs', type=float, default=None,
+                        help="Design the bandpass/notch for this rate instead of each sweep rate "
+                             "(200 reproduces the training scripts' EMGPreprocessor default)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--cache-dir', default=None, help="Circuit cache of the loader")
+    parser.add_argument('--store', default=None,
+                        help="Keep the prefix-sum stores here (default: temporary directory)")
+    parser.add_argument('--output', default='sweep_windows.json')
+    args = parser.parse_args()
+
+    logging.getLogger('src.lib.data_loader').setLevel(logging.WARNING)
+    temp_dirs = []
+    data_root, subjects = args.data_root, args.subjects
+    if args.synthetic:
+        data_root = tempfile.mkdtemp(prefix='neurogait_sweep_data_')
+        temp_dirs.append(data_root)
+        subjects = subject_ids(args.synthetic)
+        print(f"Generating {len(subjects)} synthetic subjects in {data_root} ...")
+        write_dataset(data_root, subjects, n_circuits=2, circuit_seconds=120)
+    store_root = args.store or tempfile.mkdtemp(prefix='neurogait_sweep_')
+    if args.store is None:
+        temp_dirs.append(store_root)
+
+    points = sweep_grid(args.windows, args.steps, args.rates)
+    try:
+        print(f"Preparing {len(subjects)} subjects at {len(args.rates)} rates ...")
+        t_start = time.perf_counter()
+        prepared = process_map(partial(prepare_subject, data_root=data_root, emg_channels=EMG_CHANNELS,
+                                       rates=args.rates, task_name=args.task, store_root=store_root,
+                                       cache_dir=args.cache_dir, filter_fs=args.filter_fs),
+                               subjects, args.workers)
+        prepared = [p for p in prepared if p is not None]
+        if not prepared:
+            raise ValueError("No data loaded from any subject!")
+        prepare_seconds = time.perf_counter() - t_start
+        store_mb = sum(p['store_bytes'] for p in prepared) / 1e6
+        print(f"  done in {prepare_seconds:.1f} s ({store_mb:.1f} MB of prefix sums)")
+
+        print(f"Evaluating {len(points)} grid points ...")
+        t0 = time.perf_counter()
+        results = process_map(partial(evaluate_point, store_root=store_root,
+                                      subjects=[p['subject'] for p in prepared], task_name=args.task,
+                                      filter_fs=args.filter_fs),
+                              points, args.workers)
+        sweep_seconds = time.perf_counter() - t0
+    finally:
+        for path in temp_dirs:
+            shutil.rmtree(path, ignore_errors=True)
+
+    print_table(results)
+
+    # Serial cost of one load -> filter -> window -> train run, which every point would otherwise repeat
+    load_seconds = sum(p['load_seconds'] for p in prepared)
+    preprocess_per_rate = sum(p['preprocess_seconds'] for p in prepared) / len(args.rates)
+    point_seconds = [r['feature_seconds'] + r['train_seconds'] for r in results if not np.isnan(r['accuracy'])]
+    single_run = load_seconds + preprocess_per_rate + (np.mean(point_seconds) if point_seconds else 0.0)
+    total = prepare_seconds + sweep_seconds
+    print(f"\nShared load + filter: {prepare_seconds:.1f} s, {len(points)} points: {sweep_seconds:.1f} s "
+          f"(features + training {sum(point_seconds):.1f} s of worker time)")
+    print(f"Sweep total {total:.1f} s = {total / single_run:.1f} single pipeline runs of ~{single_run:.1f} s "
+          f"(rerunning the pipeline per point: ~{len(points) * single_run:.0f} s)")
+
+    report = {
+        'sweep': 'windows',
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'config': {
+            'task': args.task,
+            'subjects': [p['subject'] for p in prepared],
+            'synthetic': bool(args.synthetic),
+            'channels': EMG_CHANNELS,
+            'windows_ms': args.windows,
+            'steps_ms': args.steps,
+            'rates': args.rates,
+            'filter_fs': args.filter_fs,
+        },
+        'prepare_seconds': prepare_seconds,
+        'sweep_seconds': sweep_seconds,
+        'single_run_seconds': single_run,
+        'subjects': prepared,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
+import argparse
 import sys
+import tempfile
 import joblib
 import numpy as np
 from sklearn.discriminant_analysis import LinearDiscriminantAnalysis
@@ -8,7 +10,7 @@ FLOAT_TYPE = "float"
 FUNC_NAME = "predict_lda"
 
 
-def generate_lda_cpp(model_path, output_path):
+def load_lda(model_path):
     print(f"Loading LDA model from {model_path}...")
     try:
         clf = joblib.load(model_path)
@@ -18,7 +20,11 @@ def generate_lda_cpp(model_path, output_path):
     if not hasattr(clf, 'coef_') or not hasattr(clf, 'intercept_'):
         print("Error: El modelo no tiene los atributos 'coef_' o 'intercept_'. Asegúrate de que está entrenado.")
         sys.exit(1)
+    return clf
 
+
+def float_lda_cpp(clf, model_path):
+    """Source of the float kernel `predict_lda(float*)`."""
     coef = clf.coef_
     intercept = clf.intercept_
     classes = clf.classes_
@@ -32,8 +38,6 @@ def generate_lda_cpp(model_path, output_path):
     cpp_code.append("")
 
     if n_rows == 1:
-        print("Detected Binary Classification.")
-        
         bias = intercept[0]
         weights = coef[0]
         
@@ -54,7 +58,6 @@ def generate_lda_cpp(model_path, output_path):
         cpp_code.append(f"}}")
 
     else:
-        print(f"Detected Multiclass Classification ({n_rows} classes).")
         n_classes = n_rows
         
         intercepts_str = ", ".join([f"{b:.8f}" for b in intercept])
@@ -83,15 +86,131 @@ def generate_lda_cpp(model_path, output_path):
         cpp_code.append(f"    return LDA_CLASSES[best_idx];")
         cpp_code.append(f"}}")
 
+    return "\n".join(cpp_code)
+
+
+def write_cpp(cpp_code, output_path):
     try:
         with open(output_path, "w") as f:
-            f.write("\n".join(cpp_code))
+            f.write(cpp_code)
         print(f"Success! C++ code written to {output_path}")
     except Exception as e:
         print(f"Error writing to file: {e}")
 
-if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python write_lda_to_c.py <model_pkl_path> <output_cpp_path>")
+
+def generate_lda_cpp(model_path, output_path, clf=None):
+    if clf is None:
+        clf = load_lda(model_path)
+    n_rows = clf.coef_.shape[0]
+    if n_rows == 1:
+        print("Detected Binary Classification.")
     else:
-        generate_lda_cpp(sys.argv[1], sys.argv[2])
\ No newline at end of file
+        print(f"Detected Multiclass Classification ({n_rows} classes).")
+    write_cpp(float_lda_cpp(clf, model_path), output_path)
+
+
+# Harness PREPARE step of the integer kernel: quantize the float features once, outside the timing
+QUANTIZE = "for (int i = 0; i < n; i++) quantize_lda_features(&x[(size_t)i * d], &input[(size_t)i * d]);"
+
+
+def print_report(clf, quantized, float_source, quantized_source, X, y, cxx, calibration):
+    """Accuracy on held-out windows, flash bytes and host cycles/call of the float and integer kernels."""
+    from src.lib.cpp_bench import COPY_FEATURES, flash_bytes, host_benchmark
+
+    reference = clf.predict(X)
+    expected = quantized.predict(quantized.quantize_features(X))
+    w_type, f_type = f"int{quantized.weight_bits}_t", f"int{quantized.feature_bits}_t"
+
+    n_rows, n_features = np.atleast_2d(quantized.weights).shape
+    print(f"\nLDA: {len(quantized.classes)} classes, {n_features} features, {len(X)} held-out windows")
+    tables = quantized.nbytes()
+    print(f"  Quantized tables: " + ", ".join(f"{k} {v} B" for k, v in tables.items())
+          + f" = {sum(tables.values())} B (float: {4 * (n_rows * n_features + n_rows)} B of weights/intercepts)")
+    print(f"  Class exponents: {quantized.exponents.tolist()}, "
+          f"feature exponents: {quantized.feature_exponents.tolist()}")
+    limit = 2 ** (quantized.feature_bits - 1) - 1
+    saturated = np.mean(np.abs(quantized.quantize_features(X)) >= limit)
+    print(f"  Feature scales calibrated on {calibration}; "
+          f"{100 * saturated:.2f} % of held-out feature values saturate")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        rows = []
+        for label, source, input_type, prepare in (
+                ("float", float_source, "float", COPY_FEATURES),
+                (f"{w_type[:-2]}/{f_type[:-2]}", quantized_source, f_type, QUANTIZE)):
+            size = flash_bytes(source, FUNC_NAME, input_type, cxx, workdir)
+            cycles, ns, pred = host_benchmark(source, FUNC_NAME, input_type, X, cxx, workdir, prepare, reps=200)
+            rows.append((label, size, cycles, ns, pred))
+
+    score_name = "accuracy" if y is not None else "vs sklearn"
+    print(f"  {'Kernel':12s} {'flash B':>8s} {'cycles':>8s} {'ns/call':>8s} {score_name:>11s}")
+    for label, size, cycles, ns, pred in rows:
+        if pred is None:
+            pred = reference if label == "float" else expected
+        score = np.mean(pred == (y if y is not None else reference))
+        size_str = f"{size:8d}" if size is not None else f"{'n/a':>8s}"
+        cycles_str = f"{cycles:8.1f}" if cycles is not None else f"{'n/a':>8s}"
+        ns_str = f"{ns:8.1f}" if ns is not None else f"{'n/a':>8s}"
+        print(f"  {label:12s} {size_str} {cycles_str} {ns_str} {100 * score:10.2f}%")
+
+    if y is not None:
+        delta = np.mean(expected == y) - np.mean(reference == y)
+        print(f"  Accuracy delta (quantized - sklearn float64): {100 * delta:+.2f} points")
+    print(f"  Quantized vs float agreement: {100 * np.mean(expected == reference):.2f} %")
+    quantized_pred = rows[1][4]
+    if quantized_pred is not None:
+        status = "exact" if np.array_equal(quantized_pred, expected) else "MISMATCH"
+        print(f"  Quantized C++ vs Python reference (QuantizedLDA.predict): {status}")
+    print("  (cycles: host TSC reference cycles; an FPU-less MCU pays a soft-float call per float multiply-add)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Exports a sklearn LDA to C++.",
+        epilog="--quantize and --report use the repo package: run them from the repo root as "
+               "python -m src.tools.write_lda_to_c")
+    parser.add_argument('model', help="Pickled LinearDiscriminantAnalysis")
+    parser.add_argument('output', help="Output C++ file")
+    parser.add_argument('--quantize', choices=['int16', 'int8'], default=None,
+                        help="Integer weights with per-class power-of-two scales and int32 accumulation")
+    parser.add_argument('--feature-bits', type=int, choices=[16, 8], default=16,
+                        help="--quantize: width of the scaled input features")
+    parser.add_argument('--calibration', default=None,
+                        help="--quantize (required): training features (.npy, n x n_features) fixing the "
+                             "feature scales")
+    parser.add_argument('--features', default=None, help="Held-out features (.npy, n x n_features)")
+    parser.add_argument('--labels', default=None, help="Held-out labels (.npy) for the accuracy delta")
+    parser.add_argument('--report', action='store_true',
+                        help="--quantize: accuracy, flash bytes and host cycles/call vs the float kernel")
+    parser.add_argument('--cxx', default='g++', help="Compiler for the report")
+    args = parser.parse_args()
+
+    clf = load_lda(args.model)
+    if args.quantize is None:
+        generate_lda_cpp(args.model, args.output, clf)
+        return
+
+    # Only the integer export needs the repo package; the float export runs as a plain script
+    from src.lib.fixed_point import QuantizedLDA
+
+    # Scales fitted to the held-out windows would hide their saturation from the report
+    if args.calibration is None:
+        parser.error("--quantize needs --calibration (the training features) to fix the feature scales")
+    if args.report and args.features is None:
+        parser.error("--report needs --features")
+    X_calibration = np.load(args.calibration)
+    quantized = QuantizedLDA.from_float_features(clf.coef_, clf.intercept_, clf.classes_, X_calibration,
+                                                 weight_bits=int(args.quantize[3:]), feature_bits=args.feature_bits)
+    quantized_source = quantized.to_cpp("LDA", source=args.model)
+    write_cpp(quantized_source, args.output)
+    calibration = f"{args.calibration} ({len(X_calibration)} windows)"
+    print(f"Feature scales calibrated on {calibration}")
+
+    if args.report:
+        X = np.load(args.features)
+        y = np.load(args.labels) if args.labels else None
+        print_report(clf, quantized, float_lda_cpp(clf, args.model), quantized_source, X, y, args.cxx, calibration)
+
+
+if __name__ == "__main__":
+    main()
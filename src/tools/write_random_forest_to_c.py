@@ -1,4 +1,6 @@
-import sys
+import argparse
+import io
+import tempfile
 import joblib
 import numpy as np
 
@@ -109,18 +111,106 @@ def generate_forest_code(model):
 
     return "\n".join(code_segments)
 
-if __name__ == "__main__":
-    MODEL_PATH = sys.argv[1]
-    OUTPUT_FILE = sys.argv[2]
-    print(f"Loading {MODEL_PATH}...")
-    try:
-        model = load_model(MODEL_PATH)
+def benchmark_features(model, flat, n_samples, seed=0):
+    """Random features spanning each feature's threshold range (every branch gets exercised)."""
+    rng = np.random.default_rng(seed)
+    low = np.full(flat.n_features, -1.0)
+    high = np.full(flat.n_features, 1.0)
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        for f in range(flat.n_features):
+            used = tree.threshold[tree.feature == f]
+            if len(used):
+                low[f] = min(low[f], used.min())
+                high[f] = max(high[f], used.max())
+    span = high - low
+    return (low - 0.1 * span + rng.random((n_samples, flat.n_features)) * 1.2 * span).astype(np.float32)
+
+
+def print_report(model, flat, X, cxx):
+    """Flash bytes and host ns/prediction of the flat arrays vs the nested if/else export."""
+    from src.lib.cpp_bench import flash_bytes, host_benchmark
+    from src.lib.utils import export_rf_to_cpp
+
+    ifelse = io.StringIO()
+    ifelse.write("#include <cmath>\n")
+    export_rf_to_cpp(model, ifelse, prefix="RF")
+    flat_source = flat.to_cpp("RF")
+    reference = model.predict(X)
+    expected = flat.predict(X)
+
+    print(f"\nForest: {flat.n_trees} trees, {flat.n_nodes} nodes, {len(flat.classes)} classes, "
+          f"{flat.n_features} features")
+    arrays = flat.nbytes()
+    print("  Flat arrays: " + ", ".join(f"{k} {v} B" for k, v in arrays.items())
+          + f" = {sum(arrays.values())} B")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        rows = []
+        for label, source, input_type in (("if/else", ifelse.getvalue(), "double"),
+                                          ("flat " + ("int16" if flat.quantized else "float"), flat_source, "float")):
+            size = flash_bytes(source, "predict_rf", input_type, cxx, workdir)
+            _, ns, pred = host_benchmark(source, "predict_rf", input_type, X, cxx, workdir)
+            if pred is not None and label == "if/else":
+                pred = flat.classes[pred]  # export_rf_to_cpp returns class indices
+            rows.append((label, size, ns, pred))
+
+    print(f"  {'Form':12s} {'flash B':>10s} {'ns/pred':>9s} {'vs sklearn':>11s}")
+    for label, size, ns, pred in rows:
+        size_str = f"{size:10d}" if size is not None else f"{'n/a':>10s}"
+        ns_str = f"{ns:9.1f}" if ns is not None else f"{'n/a':>9s}"
+        agree = f"{100 * np.mean(pred == reference):10.2f}%" if pred is not None else f"{'n/a':>11s}"
+        print(f"  {label:12s} {size_str} {ns_str} {agree}")
+    flat_pred = rows[1][3]
+    if flat_pred is not None:
+        status = "exact" if np.array_equal(flat_pred, expected) else "MISMATCH"
+        print(f"  Flat C++ vs Python reference (FlatForest.predict): {status}")
+    print("  (sklearn averages class probabilities; the exports take a hard majority vote)")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Exports a sklearn random forest to C++.",
+        epilog="--format flat uses the repo package: run it from the repo root as "
+               "python -m src.tools.write_random_forest_to_c")
+    parser.add_argument('model', help="Pickled RandomForestClassifier")
+    parser.add_argument('output', help="Output C++ file")
+    parser.add_argument('--format', choices=['ifelse', 'flat'], default='ifelse',
+                        help="ifelse: one nested function per tree; flat: packed node arrays + traversal loop")
+    parser.add_argument('--quantize', action='store_true', help="flat: int16 thresholds (per-feature scales)")
+    parser.add_argument('--prefix', default='RF', help="flat: array / function name prefix")
+    parser.add_argument('--report', action='store_true',
+                        help="flat: compare flash bytes and host ns/prediction with the if/else form")
+    parser.add_argument('--features', default=None,
+                        help="Report inputs (.npy, n x n_features); default: random within the thresholds' ranges")
+    parser.add_argument('--cxx', default='g++', help="Compiler for the report")
+    args = parser.parse_args()
+
+    print(f"Loading {args.model}...")
+    model = load_model(args.model)
+
+    if args.format == 'ifelse':
         c_code = generate_forest_code(model)
-        
         if c_code:
-            with open(OUTPUT_FILE, "w") as f:
+            with open(args.output, "w") as f:
                 f.write(c_code)
-            print(f"Success! Model written to {OUTPUT_FILE}")
+            print(f"Success! Model written to {args.output}")
             print(f"Generated C++ size: {len(c_code)/1024:.2f} KB")
-    except Exception as e:
-        print(f"An error occurred: {e}")
\ No newline at end of file
+        return
+
+    # Only the flat export needs the repo package; the nested export runs as a plain script
+    from src.lib.forest import FlatForest
+
+    flat = FlatForest.from_sklearn(model, quantize=args.quantize)
+    c_code = flat.to_cpp(args.prefix)
+    with open(args.output, "w") as f:
+        f.write(c_code)
+    print(f"Success! Flat model written to {args.output} ({sum(flat.nbytes().values())} bytes of arrays)")
+
+    if args.report:
+        X = np.load(args.features) if args.features else benchmark_features(model, flat, 20000)
+        print_report(model, flat, X, args.cxx)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,16 @@
 import os
+from functools import partial
 import numpy as np
-import pandas as pd
 import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 from .lib.data_loader import Enabl3sDataLoader
 from .lib.preprocess import EMGPreprocessor
-from .lib.dataset import MultiModeDataset
+from .lib.dataset import MultiModeDataset, SlidingWindowDataset
+from .lib.compact import CompactRecording
+from .lib.subject_store import SubjectStore
 from .lib.train import train_LDA
+from .lib.parallel import process_map_frames, resolve_workers
 
 # Defines the mapping for the 3 classes
 PHASE_NAMES = {
@@ -17,104 +20,128 @@ PHASE_NAMES = {
 
 DYNAMIC_MODES = [1, 2, 3]
 
-def extract_features_from_window(window):
-    """Extract MAV, RMS, and WL features from each EMG channel."""
-    features = []
-    for ch in range(window.shape[1]):
-        channel_data = window[:, ch]
-        mav = np.mean(np.abs(channel_data))
-        rms = np.sqrt(np.mean(channel_data ** 2))
-        wl = np.sum(np.abs(np.diff(channel_data)))
-        features.extend([mav, rms, wl])
-    return np.array(features)
-
-def load_and_preprocess_subjects(data_root, subjects, emg_channels, load_channels, target_fs):
-    """Load and preprocess data from multiple subjects."""
+# Segments never span circuits or modes
+SEGMENT_COLS = ['Circuit_ID', 'Mode']
+
+def preprocess_subject(subject, data_root, emg_channels, load_channels, target_fs, cache_dir=None, circuit_workers=1):
+    """Load and preprocess a single subject. Returns None if no usable data."""
     preprocessor = EMGPreprocessor()
-    all_data = []
-    
-    for subject in subjects:
-        print(f"\nLoading subject: {subject}")
-        print("-" * 60)
-        
-        loader = Enabl3sDataLoader(data_root, subject, target_fs=target_fs)
-        raw_dir = os.path.join(data_root, subject, 'Raw')
-        circuit_files = [f for f in os.listdir(raw_dir) if f.endswith('_raw.csv')]
-        num_circuits = len(circuit_files)
-        
-        circuits_to_load = range(1, num_circuits + 1)
-        print(f"  Loading {num_circuits} circuits")
-        
-        # Load batch
-        dataset_df = loader.load_dataset_batch(circuits_to_load, load_channels)
-        
-        if dataset_df.empty:
-            print(f"  Warning: No data loaded for {subject}")
-            continue
-
-        # Filter for relevant modes
-        dataset_df = dataset_df[dataset_df['Mode'].isin(DYNAMIC_MODES)]
-        
-        if dataset_df.empty:
-            print(f"  Warning: No valid mode data for {subject}")
-            continue
-        
-        print(f"  Preprocessing EMG signals...")
-        dataset_df[emg_channels] = preprocessor.apply_filter(dataset_df[emg_channels].values)
-        dataset_df[emg_channels] = preprocessor.rectify(dataset_df[emg_channels].values)
-
-        # Only use Walking (Mode 1) for Stance/Swing labels
-        is_walking = dataset_df['Mode'] == 1
-        
-        # Stance (Loader=1) -> Class 0
-        dataset_df.loc[is_walking & (dataset_df['Label_Phase'] == 1), 'Phase_Class'] = 0
-        
-        # Swing (Loader=0) -> Class 1
-        dataset_df.loc[is_walking & (dataset_df['Label_Phase'] == 0), 'Phase_Class'] = 1
-        
-        unique_classes = sorted(dataset_df['Phase_Class'].unique())
-        print(f"  Classes present: {unique_classes}")
-        all_data.append(dataset_df)
-    
-    if not all_data:
+
+    print(f"\nLoading subject: {subject}")
+    print("-" * 60)
+    
+    loader = Enabl3sDataLoader(data_root, subject, target_fs=target_fs, cache_dir=cache_dir)
+    raw_dir = os.path.join(data_root, subject, 'Raw')
+    circuit_files = [f for f in os.listdir(raw_dir) if f.endswith('_raw.csv')]
+    num_circuits = len(circuit_files)
+    
+    circuits_to_load = range(1, num_circuits + 1)
+    print(f"  Loading {num_circuits} circuits")
+    
+    # Load batch
+    dataset_df = loader.load_dataset_batch(circuits_to_load, load_channels, n_workers=circuit_workers)
+    
+    if dataset_df.empty:
+        print(f"  Warning: No data loaded for {subject}")
+        return None
+
+    # Filter for relevant modes
+    dataset_df = dataset_df[dataset_df['Mode'].isin(DYNAMIC_MODES)]
+    
+    if dataset_df.empty:
+        print(f"  Warning: No valid mode data for {subject}")
+        return None
+    
+    print(f"  Preprocessing EMG signals...")
+    # One full-size working array: filter and rectify in place
+    emg = dataset_df[emg_channels].to_numpy(dtype=np.float64, copy=True)
+    preprocessor.apply_filter(emg, out=emg)
+    preprocessor.rectify(emg, out=emg)
+    dataset_df[emg_channels] = emg
+
+    # Only use Walking (Mode 1) for Stance/Swing labels
+    is_walking = dataset_df['Mode'] == 1
+    
+    # Stance (Loader=1) -> Class 0
+    dataset_df.loc[is_walking & (dataset_df['Label_Phase'] == 1), 'Phase_Class'] = 0
+    
+    # Swing (Loader=0) -> Class 1
+    dataset_df.loc[is_walking & (dataset_df['Label_Phase'] == 0), 'Phase_Class'] = 1
+    
+    unique_classes = sorted(dataset_df['Phase_Class'].unique())
+    print(f"  Classes present: {unique_classes}")
+    return dataset_df
+
+
+def load_and_preprocess_subjects(data_root, subjects, emg_channels, load_channels, target_fs, cache_dir=None, n_workers=1, float32=False):
+    """Load and preprocess data from multiple subjects.
+
+    Subjects are loaded, filtered and rectified in parallel worker processes; leftover
+    workers go to per-circuit loading (e.g. a single subject with n_workers=8 loads 8
+    circuits at once). Workers hand their results back through shared memory, and the
+    combined frame is assembled without pickling or pd.concat. Columns keep the dtypes
+    `pd.concat` would give unless `float32=True`, which stores the float signal and label
+    columns as float32 (half the memory, single-precision features).
+    """
+    n_workers = resolve_workers(n_workers)
+    subject_workers = min(n_workers, len(subjects))
+    circuit_workers = max(1, n_workers // max(1, subject_workers))
+
+    worker = partial(
+        preprocess_subject, data_root=data_root, emg_channels=emg_channels,
+        load_channels=load_channels, target_fs=target_fs,
+        cache_dir=cache_dir, circuit_workers=circuit_workers
+    )
+    combined_df = process_map_frames(worker, subjects, subject_workers, float32=float32)
+    
+    if combined_df is None:
         raise ValueError("No data loaded from any subject!")
     
-    combined_df = pd.concat(all_data, ignore_index=True)
     print(f"\nCombined dataset: {len(combined_df)} samples")
     return combined_df
 
 
-def create_windowed_features(df, emg_channels, window_size_ms, step_size_ms, target_fs):
-    """Create windowed dataset and extract features."""
+def compact_dataset(df, emg_channels):
+    """Convert the combined frame to a CompactRecording and print the memory saved."""
+    recording = CompactRecording.from_frame(df, emg_channels, SEGMENT_COLS + ['Phase_Class'])
+    report = recording.memory_report(df)
+    print(f"\nCompact dataset: {report['frame_bytes'] / 1e6:.1f} MB -> "
+          f"{report['compact_bytes'] / 1e6:.1f} MB ({report['reduction']:.1f}x smaller)")
+    return recording
+
+
+def store_dataset(df, emg_channels, target_fs, store_dir):
+    """Write the combined frame to a memory-mapped SubjectStore and return it opened."""
+    store = SubjectStore.write(store_dir, df, emg_channels, ['Phase_Class'], SEGMENT_COLS, target_fs)
+    print(f"\nSubject store: {store.n_segments} segments in {store_dir}")
+    return store
+
+
+def create_windowed_features(data, emg_channels, window_size_ms, step_size_ms, target_fs):
+    """Create windowed dataset and extract features (data: DataFrame, CompactRecording or SubjectStore)."""
     print(f"\nCreating windowed dataset...")
     
-    # Create segment group to prevent merging disparate circuits/modes
-    df['Segment_Group'] = df['Circuit_ID'].astype(str) + '_' + df['Mode'].astype(str)
-
-    dataset = MultiModeDataset(
-        df=df,
-        feature_cols=emg_channels,
-        label_col='Phase_Class',
-        group_col='Segment_Group',
-        window_size_ms=window_size_ms,
-        step_size_ms=step_size_ms,
-        fs=target_fs
-    )
+    if isinstance(data, SubjectStore):
+        dataset = SlidingWindowDataset.from_store(data.path, 'Phase_Class', window_size_ms, step_size_ms)
+    elif isinstance(data, CompactRecording):
+        dataset = SlidingWindowDataset.from_recording(
+            data, 'Phase_Class', SEGMENT_COLS, window_size_ms, step_size_ms, target_fs
+        )
+    else:
+        # Split on circuit/mode changes to prevent merging disparate circuits/modes
+        dataset = MultiModeDataset(
+            df=data,
+            feature_cols=emg_channels,
+            label_col='Phase_Class',
+            group_col=SEGMENT_COLS,
+            window_size_ms=window_size_ms,
+            step_size_ms=step_size_ms,
+            fs=target_fs
+        )
     print(f"  Total windows: {len(dataset)}")
     
     print(f"Extracting features...")
-    X_windows, y_labels = [], []
-    for i, (window, label) in enumerate(dataset):
-        if i % 1000 == 0:
-            print(f"  {i}/{len(dataset)}", end='\r')
-        
-        features = extract_features_from_window(window)
-        X_windows.append(features)
-        y_labels.append(label)
-    
-    print(f"  {len(dataset)}/{len(dataset)} - Done!")
-    X = np.array(X_windows)
-    y = np.array(y_labels)
+    X, y = dataset.extract_features()
     print(f"Feature matrix: {X.shape}, Labels: {y.shape}\n")
     return X, y
 
@@ -188,6 +215,11 @@ def main():
     target_fs = 250
     window_size_ms = 200 
     step_size_ms = 50    
+    use_cache = False  # Reuse parsed circuits from <data_root>/.cache across runs
+    cache_dir = os.path.join(data_root, ".cache") if use_cache else None
+    n_workers = 1  # Loader processes (1 = serial; opt in with e.g. 4, or None for all cores)
+    compact = False  # float32 signals + run-length labels instead of the full DataFrame
+    store_dir = None  # Window from a memory-mapped SubjectStore written here instead of the frame
     
     print("="*60)
     print("Gait Phase Detection (Stance/Swing/None) - Training Pipeline")
@@ -200,8 +232,13 @@ def main():
     
     combined_df = load_and_preprocess_subjects(
         data_root, subjects, emg_channels, 
-        load_channels, target_fs
+        load_channels, target_fs, cache_dir=cache_dir, n_workers=n_workers
     )
+    if compact:
+        # Keep only the compact copy alive from here on
+        combined_df = compact_dataset(combined_df, emg_channels)
+    elif store_dir:
+        combined_df = store_dataset(combined_df, emg_channels, target_fs, store_dir)
     
     X, y = create_windowed_features(
         combined_df, emg_channels, 
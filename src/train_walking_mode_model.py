@@ -1,13 +1,18 @@
 import os
+import shutil
+import tempfile
+from functools import partial
 import numpy as np
-import pandas as pd
 import joblib
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 from .lib.data_loader import Enabl3sDataLoader
 from .lib.preprocess import EMGPreprocessor
-from .lib.dataset import MultiModeDataset
-from .lib.train import train_LDA  
+from .lib.dataset import MultiModeDataset, SlidingWindowDataset
+from .lib.compact import CompactRecording
+from .lib.train import train_LDA, train_LDA_streaming
+from .lib.parallel import process_map, process_map_frames, resolve_workers
+from .lib.streaming_lda import LDAStatistics
 
 
 MODE_NAMES = {
@@ -18,85 +23,184 @@ MODE_NAMES = {
 }
 
 
-def extract_features_from_window(window):
-    """Extract MAV, RMS, and WL features from each EMG channel."""
-    features = []
-    for ch in range(window.shape[1]):
-        channel_data = window[:, ch]
-        mav = np.mean(np.abs(channel_data))
-        rms = np.sqrt(np.mean(channel_data ** 2))
-        wl = np.sum(np.abs(np.diff(channel_data)))
-        features.extend([mav, rms, wl])
-    return np.array(features)
+def preprocess_subject(subject, data_root, emg_channels, load_channels, modes, target_fs, cache_dir=None, circuit_workers=1):
+    """Load and preprocess a single subject. Returns None if no usable data."""
+    preprocessor = EMGPreprocessor()
 
+    print(f"\nLoading subject: {subject}")
+    print("-" * 60)
+    
+    loader = Enabl3sDataLoader(data_root, subject, target_fs=target_fs, cache_dir=cache_dir)
+    raw_dir = os.path.join(data_root, subject, 'Raw')
+    circuit_files = [f for f in os.listdir(raw_dir) if f.endswith('_raw.csv')]
+    num_circuits = len(circuit_files)
+    
+    circuits_to_load = range(1, num_circuits + 1)
+    print(f"  Loading {num_circuits} circuits")
+    
+    dataset_df = loader.load_dataset_batch(circuits_to_load, load_channels, n_workers=circuit_workers)
+    dataset_df = dataset_df[dataset_df['Mode'].isin(modes)]
+    if dataset_df.empty:
+        print(f"  Warning: No data loaded, skipping...")
+        return None
+    
+    print(f"  Preprocessing EMG signals...")
+    # One full-size working array: filter and rectify in place
+    emg = dataset_df[emg_channels].to_numpy(dtype=np.float64, copy=True)
+    preprocessor.apply_filter(emg, out=emg)
+    preprocessor.rectify(emg, out=emg)
+    dataset_df[emg_channels] = emg
+    
+    unique_modes = sorted(dataset_df['Mode'].unique())
+    print(f"  Modes present: {unique_modes}")
+    return dataset_df
 
-def load_and_preprocess_subjects(data_root, subjects, emg_channels, load_channels, modes, target_fs):
-    """Load and preprocess data from multiple subjects."""
-    preprocessor = EMGPreprocessor()
-    all_data = []
-    
-    for subject in subjects:
-        print(f"\nLoading subject: {subject}")
-        print("-" * 60)
-        
-        loader = Enabl3sDataLoader(data_root, subject, target_fs=target_fs)
-        raw_dir = os.path.join(data_root, subject, 'Raw')
-        circuit_files = [f for f in os.listdir(raw_dir) if f.endswith('_raw.csv')]
-        num_circuits = len(circuit_files)
-        
-        circuits_to_load = range(1, num_circuits + 1)
-        print(f"  Loading {num_circuits} circuits")
-        
-        dataset_df = loader.load_dataset_batch(circuits_to_load, load_channels)
-        dataset_df = dataset_df[dataset_df['Mode'].isin(modes)]
-        if dataset_df.empty:
-            print(f"  Warning: No data loaded, skipping...")
-            continue
-        
-        print(f"  Preprocessing EMG signals...")
-        dataset_df[emg_channels] = preprocessor.apply_filter(dataset_df[emg_channels].values)
-        dataset_df[emg_channels] = preprocessor.rectify(dataset_df[emg_channels].values)
-        
-        unique_modes = sorted(dataset_df['Mode'].unique())
-        print(f"  Modes present: {unique_modes}")
-        all_data.append(dataset_df)
-    
-    if not all_data:
+
+def load_and_preprocess_subjects(data_root, subjects, emg_channels, load_channels, modes, target_fs, cache_dir=None, n_workers=1, float32=False):
+    """Load and preprocess data from multiple subjects.
+
+    Subjects are loaded, filtered and rectified in parallel worker processes; leftover
+    workers go to per-circuit loading (e.g. a single subject with n_workers=8 loads 8
+    circuits at once). Workers hand their results back through shared memory, and the
+    combined frame is assembled without pickling or pd.concat. Columns keep the dtypes
+    `pd.concat` would give unless `float32=True`, which stores the float signal and label
+    columns as float32 (half the memory, single-precision features).
+    """
+    n_workers = resolve_workers(n_workers)
+    subject_workers = min(n_workers, len(subjects))
+    circuit_workers = max(1, n_workers // max(1, subject_workers))
+
+    worker = partial(
+        preprocess_subject, data_root=data_root, emg_channels=emg_channels,
+        load_channels=load_channels, modes=list(modes), target_fs=target_fs,
+        cache_dir=cache_dir, circuit_workers=circuit_workers
+    )
+    combined_df = process_map_frames(worker, subjects, subject_workers, float32=float32)
+    
+    if combined_df is None:
         raise ValueError("No data loaded from any subject!")
     
-    combined_df = pd.concat(all_data, ignore_index=True) if len(all_data) > 1 else all_data[0]
     print(f"\nCombined dataset: {len(combined_df)} samples, modes: {sorted(combined_df['Mode'].unique())}")
     return combined_df
 
 
-def create_windowed_features(df, emg_channels, window_size_ms, step_size_ms, target_fs):
-    """Create windowed dataset and extract features."""
+def compact_dataset(df, emg_channels):
+    """Convert the combined frame to a CompactRecording and print the memory saved."""
+    recording = CompactRecording.from_frame(df, emg_channels, ['Mode'])
+    report = recording.memory_report(df)
+    print(f"\nCompact dataset: {report['frame_bytes'] / 1e6:.1f} MB -> "
+          f"{report['compact_bytes'] / 1e6:.1f} MB ({report['reduction']:.1f}x smaller)")
+    return recording
+
+
+def create_windowed_features(data, emg_channels, window_size_ms, step_size_ms, target_fs):
+    """Create windowed dataset and extract features (data: DataFrame or CompactRecording)."""
     print(f"\nCreating windowed dataset...")
-    dataset = MultiModeDataset(
-        df=df,
-        feature_cols=emg_channels,
-        label_col='Mode',
-        window_size_ms=window_size_ms,
-        step_size_ms=step_size_ms,
-        fs=target_fs
-    )
+    if isinstance(data, CompactRecording):
+        dataset = SlidingWindowDataset.from_recording(
+            data, 'Mode', ['Mode'], window_size_ms, step_size_ms, target_fs
+        )
+    else:
+        dataset = MultiModeDataset(
+            df=data,
+            feature_cols=emg_channels,
+            label_col='Mode',
+            window_size_ms=window_size_ms,
+            step_size_ms=step_size_ms,
+            fs=target_fs
+        )
     print(f"  Total windows: {len(dataset)}")
     
     print(f"Extracting features...")
-    X_windows, y_labels = [], []
-    for i, (window, label) in enumerate(dataset):
-        if i % 1000 == 0:
-            print(f"  {i}/{len(dataset)}", end='\r')
-        X_windows.append(extract_features_from_window(window))
-        y_labels.append(label)
-    
-    print(f"  {len(dataset)}/{len(dataset)} - Done!")
-    X = np.array(X_windows)
-    y = np.array(y_labels)
+    X, y = dataset.extract_features()
     print(f"Feature matrix: {X.shape}, Labels: {y.shape}\n")
     return X, y
 
 
+def split_holdout(X, y, test_size=0.3):
+    """Train/test split stratified by mode, or unstratified if a mode has a single window."""
+    try:
+        return train_test_split(X, y, test_size=test_size, random_state=42, stratify=y)
+    except ValueError:
+        # Stratifying needs two windows per mode (a short subject may have only one)
+        return train_test_split(X, y, test_size=test_size, random_state=42)
+
+
+def subject_statistics(subject, data_root, emg_channels, load_channels, modes, target_fs,
+                       window_size_ms, step_size_ms, holdout_dir, cache_dir=None):
+    """
+    Streaming worker: loads and featurizes one subject, splits its windows 70/30, writes the
+    held-out windows to `holdout_dir` and returns (LDA statistics of the training windows,
+    held-out file), or None.
+    """
+    dataset_df = preprocess_subject(subject, data_root, emg_channels, load_channels, modes, target_fs, cache_dir)
+    if dataset_df is None:
+        return None
+    X, y = create_windowed_features(dataset_df, emg_channels, window_size_ms, step_size_ms, target_fs)
+    del dataset_df
+    X_train, X_test, y_train, y_test = split_holdout(X, y)
+    holdout_path = os.path.join(holdout_dir, f"{subject}.npz")
+    np.savez(holdout_path, X=X_test, y=y_test)
+    return LDAStatistics().update(X_train, y_train), holdout_path
+
+
+def score_holdout(model, holdout_paths):
+    """
+    Scores the held-out windows one subject file at a time.
+
+    Returns:
+        dict: {(true label, predicted label): number of windows}.
+    """
+    counts = {}
+    for path in holdout_paths:
+        with np.load(path) as holdout:
+            y_true, y_pred = holdout['y'], model.predict(holdout['X'])
+        pairs, n = np.unique(np.stack([y_true, y_pred], axis=1), axis=0, return_counts=True)
+        for pair, count in zip(map(tuple, pairs.tolist()), n.tolist()):
+            counts[pair] = counts.get(pair, 0) + count
+    return counts
+
+
+def train_streaming(data_root, subjects, emg_channels, load_channels, modes, target_fs,
+                    window_size_ms, step_size_ms, cache_dir=None, n_workers=1):
+    """
+    Trains and evaluates the LDA without a combined DataFrame or feature matrix: each worker
+    holds one subject at a time and returns only its per-class statistics (merged here). The
+    held-out windows go to a scratch directory and are scored one subject at a time once the
+    model is fitted, keeping only prediction counts. The split is stratified per subject
+    rather than over the pooled windows.
+
+    Returns:
+        (model, counts): the fitted LDA and `score_holdout` counts of the held-out windows.
+    """
+    holdout_dir = tempfile.mkdtemp(prefix='neurogait_holdout_')
+    try:
+        worker = partial(
+            subject_statistics, data_root=data_root, emg_channels=emg_channels,
+            load_channels=load_channels, modes=list(modes), target_fs=target_fs,
+            window_size_ms=window_size_ms, step_size_ms=step_size_ms, holdout_dir=holdout_dir,
+            cache_dir=cache_dir
+        )
+        results = [r for r in process_map(worker, subjects, n_workers) if r is not None]
+        if not results:
+            raise ValueError("No data loaded from any subject!")
+
+        stats = LDAStatistics()
+        for subject_stats, _ in results:
+            stats.merge(subject_stats)
+
+        print("="*60)
+        print("Training State Classifier")
+        print("="*60)
+        model = train_LDA_streaming(stats)
+        counts = score_holdout(model, [path for _, path in results])
+    finally:
+        shutil.rmtree(holdout_dir, ignore_errors=True)
+
+    print(f"\nTrain: {stats.n_samples} windows (statistics only), Test: {sum(counts.values())} windows")
+    return model, counts
+
+
 def print_class_distribution(y):
     """Print the distribution of classes in the dataset."""
     unique_labels, counts = np.unique(y, return_counts=True)
@@ -110,11 +214,23 @@ def print_class_distribution(y):
 
 def evaluate_and_report(model, X_test, y_test):
     """Evaluate model and print detailed metrics."""
+    report_predictions(y_test, model.predict(X_test))
+
+
+def report_counts(counts):
+    """Print the metrics of `score_holdout` counts, as `evaluate_and_report` does."""
+    pairs = np.array(list(counts.keys()))
+    n = np.array(list(counts.values()))
+    # Label pairs only (no features): as many as held-out windows, two numbers each
+    report_predictions(np.repeat(pairs[:, 0], n), np.repeat(pairs[:, 1], n))
+
+
+def report_predictions(y_test, y_pred):
+    """Print accuracy, classification report and confusion matrix."""
     print("\n" + "="*60)
     print("Model Evaluation")
     print("="*60)
     
-    y_pred = model.predict(X_test)
     accuracy = np.mean(y_pred == y_test)
     print(f"\nAccuracy: {accuracy * 100:.2f}%\n")
     
@@ -158,6 +274,11 @@ def main():
     target_fs = 250
     window_size_ms = 2000
     step_size_ms = 100
+    use_cache = False  # Reuse parsed circuits from <data_root>/.cache across runs
+    cache_dir = os.path.join(data_root, ".cache") if use_cache else None
+    n_workers = 1  # Loader processes (1 = serial; opt in with e.g. 4, or None for all cores)
+    compact = False  # float32 signals + run-length labels instead of the full DataFrame
+    streaming = False  # Per-subject LDA statistics: no combined DataFrame or feature matrix
     
     print("="*60)
     print("Multi-Mode Walking Detection - Training Pipeline")
@@ -167,12 +288,24 @@ def main():
     print(f"Sampling Rate: {target_fs} Hz")
     print(f"Window: {window_size_ms} ms, Step: {step_size_ms} ms")
     print("="*60)
+
+    if streaming:
+        model, counts = train_streaming(
+            data_root, subjects, emg_channels, emg_channels + ['Mode'], MODE_NAMES, target_fs,
+            window_size_ms, step_size_ms, cache_dir=cache_dir, n_workers=n_workers
+        )
+        report_counts(counts)
+        save_model_and_config(model, emg_channels, target_fs, window_size_ms, step_size_ms)
+        return
     
     # Load and preprocess data
     combined_df = load_and_preprocess_subjects(
         data_root, subjects, emg_channels, 
-        emg_channels + ['Mode'], MODE_NAMES, target_fs
+        emg_channels + ['Mode'], MODE_NAMES, target_fs, cache_dir=cache_dir, n_workers=n_workers
     )
+    if compact:
+        # Keep only the compact copy alive from here on
+        combined_df = compact_dataset(combined_df, emg_channels)
     
     # Create features
     X, y = create_windowed_features(